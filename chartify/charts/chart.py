@@ -6,7 +6,7 @@ from chartify.charts.chart_functions import (
 )
 from chartify.charts.chart_settings import get_layout, style, config
 from chartify.charts.trace import Axis
-from chartify.utils.tiny_profiler import profile
+from chartify.utils.instrumentation import instrument
 
 
 class Chart:
@@ -88,7 +88,7 @@ class Chart:
 
         return m if m >= self.TOP_MARGIN else self.TOP_MARGIN
 
-    @profile
+    @instrument
     def generate_layout_axes(self, chart_type, axes_map, line_color, grid_color):
         """ Generate chart layout properties. """
         x_axes, y_axes = {}, {}
@@ -116,7 +116,7 @@ class Chart:
 
         return {**x_axes, **y_axes}, annotations
 
-    @profile
+    @instrument
     def as_plotly(
         self,
         traces,
@@ -125,8 +125,17 @@ class Chart:
         line_color,
         grid_color,
         background_color,
+        include_data=True,
+        cached_traces=None,
     ):
-        """ Create 'plotly' like chart. """
+        """ Create 'plotly' like chart.
+
+        'data' is omitted for 2D charts if not included, values of
+        traces listed in 'cached_traces' are omitted as these are
+        already held by the web view.
+
+        """
+        cached_traces = cached_traces or set()
         # assign priority to set an appearance for each trace
         self.set_trace_priority(traces)
 
@@ -176,11 +185,17 @@ class Chart:
                 shared_x_gap=shared_x_gap,
                 shared_y_gap=shared_y_gap,
             )
-            data = [trace.as_plotly() for trace in traces]
+            if include_data:
+                data = [
+                    trace.as_plotly(include_values=trace.trace_id not in cached_traces)
+                    for trace in traces
+                ]
+            else:
+                data = None
             axes, annotations = self.generate_layout_axes(
                 self.type_, axes_map, line_color, grid_color
             )
-        return {
+        plot = {
             "componentType": "chart",
             "showCustomLegend": self.show_custom_legend,
             "sharedX": self.shared_x,
@@ -195,3 +210,6 @@ class Chart:
             "config": config,
             "useResizeHandler": True,
         }
+        if data is None:
+            del plot["data"]
+        return plot
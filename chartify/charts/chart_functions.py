@@ -4,9 +4,9 @@ from collections import defaultdict
 from functools import partial
 from typing import Tuple, List, Dict, Union, Generator, Any
 
-from esofile_reader.processing.eplus import *
 from chartify.charts.chart_settings import get_pie_trace_appearance, get_axis_appearance
 from chartify.charts.trace import Axis, Trace2D, TraceData, Trace1D
+from chartify.utils.instrumentation import instrument
 
 
 def combine_traces(traces: List[Trace1D]) -> Dict[str, Union[str, List]]:
@@ -22,6 +22,7 @@ def combine_traces(traces: List[Trace1D]) -> Dict[str, Union[str, List]]:
     return combined
 
 
+@instrument
 def pie_chart(
     traces: List[Trace1D],
     background_color: str,
@@ -93,6 +94,7 @@ def domain_gen(n: int, gap: float, start: float = 0, end: float = 1) -> List[flo
         start = end + gap
 
 
+@instrument
 def gen_domains(
     n: int, v_gap: float = 0.05, h_gap: float = 0.05, max_columns: int = 3, square: bool = True
 ) -> Tuple[List[List[float]], List[List[float]]]:
@@ -157,6 +159,7 @@ def set_shared_y_positions(yaxis: Axis, x_domain: List[float], increment: float)
     return [round(x_left, 3), round(x_right, 3)]
 
 
+@instrument
 def set_axes_position(
     axes_map: List[Tuple[Axis, Axis]],
     shared_x: bool,
@@ -282,6 +285,8 @@ def shared_interval_axis(
     traces: List[Trace2D], axes_gen: Generator, axes: Dict[str, str]
 ) -> Axis:
     """ Assign trace interval reference and create parent axis. """
+    from esofile_reader.processing.eplus import TS, H, D, M, A, RP
+
     intervals = get_intervals(traces)
 
     p = {TS: 0, H: 1, D: 2, M: 3, A: 4, RP: 5}
@@ -321,6 +326,7 @@ def assign_trace_axes(
             trace.yaxis = yaxes[trace.y_type]
 
 
+@instrument
 def create_2d_axis_map(
     traces: List[Trace2D], group_datetime: bool = True, shared_x: bool = True
 ) -> List[Tuple[Axis, Axis]]:
@@ -383,6 +389,7 @@ def create_2d_axis_map(
     return axes_map
 
 
+@instrument
 def transform_trace(trace: Union[Trace1D, Trace2D], type_: str):
     """ Reassign reference for a specific chart. """
     ref = trace.ref
@@ -1,5 +1,3 @@
-from esofile_reader.processing.eplus import *
-
 from chartify.ui.css_theme import parse_color
 from chartify.ui.icon_painter import combine_colors
 
@@ -21,6 +19,8 @@ def get_pie_trace_appearance(priorities, colors, background_color):
 
 
 def get_2d_trace_appearance(type_, color, interval, priority="normal"):
+    from esofile_reader.processing.eplus import TS, H, D, M, A, RP
+
     weights = {
         "low": {"markerSize": 2, "lineWidth": 1, "opacity": 0.3},
         "normal": {"markerSize": 3, "lineWidth": 2, "opacity": 0.7},
@@ -1,6 +1,13 @@
 from chartify.charts.chart_settings import *
 
 
+def to_js_timestamps(timestamps):
+    """ Convert POSIX timestamps into a list of js (millisecond) timestamps. """
+    import numpy as np
+
+    return np.multiply(timestamps, 1000, dtype=np.float64).tolist()
+
+
 class Axis:
     X_SHIFT = 30
     Y_SHIFT = 30
@@ -66,6 +73,8 @@ class Axis:
 
     @property
     def type(self):
+        from esofile_reader.processing.eplus import TS, H, D, M, A, RP
+
         return "date" if self.title in [TS, H, D, M, A, RP, "datetime"] else "linear"
 
     @anchor.setter
@@ -171,6 +180,22 @@ class Axis:
 
 
 class TraceData:
+    """ Trace source values.
+
+    Values can be either passed directly or held in 'store',
+    in which case they are read only when requested.
+
+    Attributes & Parameters
+    -----------------------
+    ref : dict, optional
+        Source results column label and units settings.
+    store : ValuesStore, optional
+        Storage holding values under 'trace_data_id'.
+    n_values : int
+        Number of values, available before values are fetched.
+
+    """
+
     def __init__(
         self,
         item_id,
@@ -181,19 +206,54 @@ class TraceData:
         units,
         timestamps=None,
         interval=None,
+        ref=None,
+        store=None,
     ):
         self.item_id = item_id
         self.trace_data_id = trace_data_id
         self.name = name
-        self.values = values
         self.total_value = total_value
         self.units = units
         self.timestamps = timestamps
         self.interval = interval
+        self.ref = ref
+        self.store = store
+        self._values = values
+        self._n_values = None
+
+    @property
+    def in_store(self):
+        return self.store is not None and self.trace_data_id in self.store
+
+    @property
+    def hydrated(self):
+        return self._values is not None or self.in_store
+
+    @property
+    def values(self):
+        if self._values is None and self.in_store:
+            return self.store.get_values(self.trace_data_id)
+        return self._values
+
+    @values.setter
+    def values(self, values):
+        self._values = values
+
+    @property
+    def n_values(self):
+        if self._values is not None:
+            return len(self._values)
+        elif self.in_store:
+            return len(self.store.get_array(self.trace_data_id))
+        return self._n_values
+
+    @n_values.setter
+    def n_values(self, n_values):
+        self._n_values = n_values
 
     @property
     def js_timestamps(self):
-        return [ts * 1000 for ts in self.timestamps]
+        return to_js_timestamps(self.timestamps)
 
 
 class Trace:
@@ -272,7 +332,7 @@ class Trace2D(Trace):
         if isinstance(ref, str) or ref is None:
             valid = True
         elif isinstance(ref, TraceData):
-            num_check = not self._num_values or len(ref.values) == self._num_values
+            num_check = not self._num_values or ref.n_values == self._num_values
             int_check = not self._interval or not ref.interval or ref.interval == self._interval
             valid = num_check and int_check
         else:
@@ -286,10 +346,10 @@ class Trace2D(Trace):
             # assign number of values, interval or timestamps for
             # cases where any of those hasn't been assigned already
             if not self._num_values:
-                self._num_values = len(ref.values)
+                self._num_values = ref.n_values
             if not self._interval and ref.interval:
                 self._interval = ref.interval
-            if not self._timestamps and ref.timestamps:
+            if self._timestamps is None and ref.timestamps is not None:
                 self._timestamps = ref.timestamps
 
         return valid
@@ -329,8 +389,8 @@ class Trace2D(Trace):
 
     @property
     def js_timestamps(self):
-        if self._timestamps:
-            return [ts * 1000 for ts in self._timestamps]
+        if self._timestamps is not None:
+            return to_js_timestamps(self._timestamps)
 
     @property
     def interval(self):
@@ -349,19 +409,34 @@ class Trace2D(Trace):
         trace.ref = self.ref
         return trace
 
-    def as_plotly(self):
-        return {
+    @staticmethod
+    def _get_ref_key(ref):
+        """ Get identifier of data for a given reference. """
+        if isinstance(ref, TraceData):
+            return ref.trace_data_id, ref.hydrated
+        return ref
+
+    @property
+    def data_key(self):
+        """ Identifier which changes whenever 'x' or 'y' values change. """
+        return self._get_ref_key(self.x_ref), self._get_ref_key(self.y_ref)
+
+    def as_plotly(self, include_values=True):
+        """ Create 'plotly' trace, 'x' and 'y' are omitted when values are excluded. """
+        trace = {
             "itemId": self.item_id,
             "traceId": self.trace_id,
             "name": self.name,
             "color": self.color,
             "selected": self.selected,
-            "x": self._get_ref_values(self.x_ref),
-            "y": self._get_ref_values(self.y_ref),
             "xaxis": self.xaxis,
             "yaxis": self.yaxis,
             **get_2d_trace_appearance(self.type_, self.color, self.interval, self.priority),
         }
+        if include_values:
+            trace["x"] = self._get_ref_values(self.x_ref)
+            trace["y"] = self._get_ref_values(self.y_ref)
+        return trace
 
 
 class Trace3D(Trace2D):
@@ -1,22 +1,27 @@
 import os
 import shutil
-from multiprocessing import Manager
+from concurrent.futures import Executor
+from multiprocessing import Manager, Lock, Queue
+from multiprocessing.managers import SyncManager
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Callable, Any, TYPE_CHECKING
 
 from PySide2.QtCore import QThreadPool
-from esofile_reader.pqt.parquet_file import ParquetFile
 
-from chartify.controller.file_processing import load_file
 from chartify.controller.wv_controller import WVController
 from chartify.model.model import AppModel
 from chartify.settings import Settings
 from chartify.ui.main_window import MainWindow
-from chartify.ui.widgets.treeview_model import ViewModel, VV
 from chartify.controller.process_utils import create_pool, kill_child_processes
-from chartify.controller.progress_logging import ProgressThread, UiLogger
-from chartify.controller.threads import FileWatcher, suspend_watcher
+from chartify.controller.threads import FileWatcher, Worker
 from chartify.utils.utils import get_str_identifier
+from chartify.utils.instrumentation import instrument
+
+if TYPE_CHECKING:
+    from esofile_reader.pqt.parquet_file import ParquetFile
+    from chartify.controller.batch_processing import BatchJob
+    from chartify.controller.progress_logging import ProgressThread
+    from chartify.ui.widgets.treeview_model import ViewModel, VV
 
 
 class AppController:
@@ -44,37 +49,106 @@ class AppController:
         self.wvc = wv_controller
 
         # ~~~~ Queues ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        self.manager = Manager()
-        self.lock = self.manager.Lock()
-        self.ids = self.manager.list([])
-        self.progress_queue = self.manager.Queue()
-        self.file_queue = self.manager.Queue()
+        # manager process, queues, monitoring threads and process pool
+        # are created on first use to speed up application startup
+        self._manager = None
+        self._lock = None
+        self._ids = None
+        self._progress_queue = None
+        self._file_queue = None
 
         # ~~~~ Monitoring threads ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        self.watcher = FileWatcher(self.file_queue)
-        self.watcher.file_loaded.connect(self.on_file_loaded)
-        self.watcher.start()
-
-        self.progress_thread = ProgressThread(self.progress_queue)
-        self.progress_thread.start()
+        self._watcher = None
+        self._progress_thread = None
 
         # ~~~~ Thread executor ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         self.thread_pool = QThreadPool()
 
         # ~~~~ Process executor ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        self.pool = create_pool()
+        self._pool = None
+
+        # ~~~~ Source file locks ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # view modifies current file on GUI thread, others are batch processed
+        self.v.file_lock_factory = self.m.get_file_lock
 
         # ~~~~ Connect signals ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         self.connect_view_signals()
-        self.connect_progress_signals()
+
+    @property
+    def manager(self) -> SyncManager:
+        if self._manager is None:
+            self._manager = Manager()
+        return self._manager
+
+    @property
+    def lock(self) -> Lock:
+        if self._lock is None:
+            self._lock = self.manager.Lock()
+        return self._lock
+
+    @property
+    def ids(self) -> List[int]:
+        if self._ids is None:
+            self._ids = self.manager.list([])
+        return self._ids
+
+    @property
+    def progress_queue(self) -> Queue:
+        if self._progress_queue is None:
+            from chartify.controller.progress_logging import ProgressThread
+
+            self._progress_queue = self.manager.Queue()
+            self._progress_thread = ProgressThread(self._progress_queue)
+            self.connect_progress_signals()
+            self._progress_thread.start()
+        return self._progress_queue
+
+    @property
+    def progress_thread(self) -> "ProgressThread":
+        if self._progress_thread is None:
+            _ = self.progress_queue
+        return self._progress_thread
+
+    @property
+    def file_queue(self) -> Queue:
+        if self._file_queue is None:
+            self._file_queue = self.manager.Queue()
+            self._watcher = FileWatcher(self._file_queue)
+            self._watcher.file_loaded.connect(self.on_file_loaded)
+            self._watcher.start()
+        return self._file_queue
+
+    @property
+    def watcher(self) -> FileWatcher:
+        if self._watcher is None:
+            _ = self.file_queue
+        return self._watcher
+
+    @watcher.setter
+    def watcher(self, watcher: FileWatcher) -> None:
+        self._watcher = watcher
+
+    @property
+    def pool(self) -> Executor:
+        if self._pool is None:
+            self._pool = create_pool()
+        return self._pool
+
+    @pool.setter
+    def pool(self, pool: Executor) -> None:
+        self._pool = pool
 
     def tear_down(self) -> None:
         """ Clean up application resources. """
         shutil.rmtree(Settings.APP_TEMP_DIR, ignore_errors=True)
 
-        self.watcher.terminate()
-        self.progress_thread.terminate()
-        self.manager.shutdown()
+        if self._watcher is not None:
+            self._watcher.terminate()
+        if self._progress_thread is not None:
+            self._progress_thread.terminate()
+        if self._manager is not None:
+            self._manager.shutdown()
+        self.wvc.stop_data_server()
 
         kill_child_processes(os.getpid())
 
@@ -83,7 +157,7 @@ class AppController:
 
     def connect_view_signals(self) -> None:
         """ Connect view signals. """
-        self.v.paletteUpdated.connect(self.wvc.refresh_layout)
+        self.v.paletteUpdated.connect(self.wvc.restyle_layout)
         self.v.selectionChanged.connect(self.on_selection_change)
         self.v.fileProcessingRequested.connect(self.on_file_processing_requested)
         self.v.syncFileProcessingRequested.connect(self.on_sync_file_processing_requested)
@@ -107,20 +181,26 @@ class AppController:
         self.progress_thread.status_changed.connect(self.v.progress_container.set_status)
         self.progress_thread.done.connect(self.v.progress_container.remove_file)
 
-    def on_selection_change(self, view_variables: List[VV]) -> None:
+    @instrument
+    def on_selection_change(self, view_variables: List["VV"]) -> None:
         """ Handle selection update. """
         out_str = [" | ".join([v for v in var if v is not None]) for var in view_variables]
         if out_str:
             print("Selected Variables:\n\t{}".format("\n\t".join(out_str)))
 
     def save_project(self, path: Path) -> None:
-        with suspend_watcher(self, self.watcher):
-            logger = UiLogger(path.stem, path, self.progress_queue)
-            with logger.log_task(f"save file {path.stem}"):
-                self.m.save_to_zip(path, logger)
+        """ Save currently loaded files in background. """
+        from chartify.controller.progress_logging import UiLogger
+        from chartify.model.dashboard import dump_dashboard
+
+        logger = UiLogger(path.stem, path, self.progress_queue)
+        # files loaded while saving are not included
+        files = self.m.get_all_files()
+        dashboard = dump_dashboard(self.m.wv_database)
+        self.thread_pool.start(Worker(self.m.save_to_zip, files, path, logger, dashboard))
 
     def on_save(self) -> None:
-        if not self.m.storage.path:
+        if not self.m.path:
             self.on_save_as()
         else:
             self.save_project(self.m.path)
@@ -131,9 +211,38 @@ class AppController:
             self.m.path = path
             self.save_project(path)
 
+    def open_project(self, path: Path) -> None:
+        """ Show saved project files, data is loaded on demand. """
+        from chartify.model.dashboard import load_dashboard, read_project_dashboard
+        from chartify.model.lazy_file import read_project_files
+
+        files = read_project_files(path, self.m.workdir)
+        # saved files are not written again on the next save
+        self.m.saver.add_saved_files(files)
+        for file in files:
+            with self.lock:
+                if file.id_ in self.ids:
+                    file.id_ = max(self.ids) + 1
+                self.ids.append(file.id_)
+            self.on_file_loaded(file)
+        if self.m.path is None:
+            self.m.path = path
+        dashboard = read_project_dashboard(path)
+        if dashboard and not self.m.wv_database["components"]:
+            self.m.wv_database = load_dashboard(dashboard, self.m.values_store)
+            self.wvc.refresh_layout()
+            # charts are displayed empty until values get fetched
+            models = self.v.get_view_models_by_name()
+            self.wvc.hydrate_traces(models)
+
     def on_file_processing_requested(self, paths: List[Path]) -> None:
         """ Load new files. """
+        from chartify.controller.file_processing import load_file
+
         for path in paths:
+            if path.suffix == Settings.PROJECT_EXTENSION:
+                self.open_project(path)
+                continue
             self.pool.submit(
                 load_file,
                 path,
@@ -146,12 +255,18 @@ class AppController:
 
     def on_sync_file_processing_requested(self, paths: List[Path]) -> None:
         """ Load new files. """
+        from chartify.controller.file_processing import load_file
+
         for path in paths:
+            if path.suffix == Settings.PROJECT_EXTENSION:
+                self.open_project(path)
+                continue
             load_file(
                 path, self.m.workdir, self.progress_queue, self.file_queue, self.ids, self.lock,
             )
 
-    def on_file_loaded(self, file: ParquetFile) -> None:
+    @instrument
+    def on_file_loaded(self, file: "ParquetFile") -> None:
         """ Add results file into 'tab' widget. """
         names = self.m.get_all_file_names()
         name = get_str_identifier(file.file_name, names)
@@ -161,33 +276,75 @@ class AppController:
 
     def on_file_rename_requested(self, id_: int, name: str) -> None:
         """ Update file name. """
+        from chartify.ui.widgets.treeview_model import ViewModel
+
         self.m.rename_file(id_, name)
+        # file name is included in results column labels
+        ViewModel.invalidate_results(id_)
 
     def on_file_remove_requested(self, id_: int) -> None:
         """ Delete file from the database. """
+        from chartify.ui.widgets.treeview_model import ViewModel
+
         with self.lock:
-            self.m.delete_file(id_)
+            traces_dropped = self.m.delete_file(id_)
             self.ids.remove(id_)
+        ViewModel.invalidate_results(id_)
+        if traces_dropped:
+            self.wvc.refresh_layout()
+
+    def start_batch_job(
+        self,
+        name: str,
+        models: List["ViewModel"],
+        file_func: Callable[["ViewModel"], Any],
+        model_func: Callable[["ViewModel", Any], None],
+    ) -> "BatchJob":
+        """ Process models in background, models get updated on GUI thread. """
+        from chartify.controller.batch_processing import BatchJob
+        from chartify.controller.progress_logging import UiLogger
+
+        def locked_file_func(model: "ViewModel") -> Any:
+            # files cannot be modified while being saved
+            with self.m.get_file_lock(model.file_id):
+                return file_func(model)
+
+        logger = UiLogger(name, Path(name), self.progress_queue)
+        job = BatchJob(name, models, locked_file_func, model_func, logger, parent=self.v)
+        self.thread_pool.start(job)
+        return job
 
     def on_variable_rename_requested(
-        self, models: List[ViewModel], old_view_variable: VV, new_view_variable: VV,
+        self, models: List["ViewModel"], old_view_variable: "VV", new_view_variable: "VV",
     ) -> None:
-        for model in models:
-            model.update_variable_if_exists(old_view_variable, new_view_variable)
+        self.start_batch_job(
+            "rename variable",
+            models,
+            lambda m: m.update_variable_in_file_if_exists(old_view_variable, new_view_variable),
+            lambda m, res: m.update_variable_in_model_if_initialized(old_view_variable, res),
+        )
 
     def on_variable_remove_requested(
-        self, models: List[ViewModel], view_variables: List[VV],
+        self, models: List["ViewModel"], view_variables: List["VV"],
     ):
-        for model in models:
-            model.delete_variables(view_variables)
+        self.start_batch_job(
+            "remove variables",
+            models,
+            lambda m: m.delete_variables_from_file(view_variables),
+            lambda m, _: m.delete_rows_from_model_if_initialized(view_variables),
+        )
 
     def on_aggregation_requested(
         self,
-        models: List[ViewModel],
+        models: List["ViewModel"],
         func: str,
-        view_variables: List[VV],
+        view_variables: List["VV"],
         new_key: str,
         new_type: Optional[str],
     ):
-        for model in models:
-            model.aggregate_variables(view_variables, func, new_key, new_type)
+        self.start_batch_job(
+            f"aggregate variables ({func})",
+            models,
+            lambda m: m.aggregate_variables_in_file(view_variables, func, new_key, new_type),
+            lambda m, res: m.add_row_to_model_if_initialized(res),
+        )
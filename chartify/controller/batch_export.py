@@ -0,0 +1,391 @@
+import argparse
+import json
+import logging
+import queue
+import re
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from collections import namedtuple
+from concurrent.futures import as_completed
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow.parquet as pq
+from esofile_reader.df.level_names import KEY_LEVEL, TYPE_LEVEL, UNITS_LEVEL
+from esofile_reader.pqt.parquet_file import ParquetFile
+
+from chartify.charts.chart import Chart
+from chartify.charts.chart_functions import transform_trace
+from chartify.charts.chart_settings import color_generator
+from chartify.charts.trace import Trace1D, TraceData
+from chartify.controller.file_processing import load_file
+from chartify.controller.process_utils import create_pool
+from chartify.controller.progress_logging import ERROR
+from chartify.model.arrow_store import ArrowStore, table_to_arrow
+from chartify.settings import Settings
+from chartify.ui.css_theme import Palette
+from chartify.ui.widgets.treeview_model import ViewModel, VV
+from chartify.ui.widgets.view_variable import stringify_view_variable
+from chartify.utils.instrumentation import instrument
+from chartify.utils.utils import calculate_timestamps, calculate_totals, get_str_identifier
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ["json", "html", "csv", "parquet"]
+CHART_TYPES = ["scatter", "line", "bar", "histogram", "box", "pie"]
+EXTENSIONS = [".eso", ".sql", ".xlsx", ".csv"]
+MANIFEST_NAME = "manifest.jsonl"
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+</head>
+<body style="margin: 0; background: {background}">
+<div id="{div_id}" style="width: 100vw; height: 100vh;"></div>
+<script>
+const plot = {plot};
+Plotly.newPlot(plot.divId, plot.data, plot.layout, plot.config);
+</script>
+</body>
+</html>
+"""
+
+ExportOptions = namedtuple(
+    "ExportOptions",
+    "patterns tables formats chart_type units_system energy_units rate_units "
+    "rate_to_energy palette_name",
+)
+
+ExportResult = namedtuple("ExportResult", "path n_variables outputs duration error")
+
+
+def sanitize_name(name: str) -> str:
+    """ Replace characters which cannot be used in file names. """
+    return re.sub(r'[<>:"/\\|?*]', "_", name).strip()
+
+
+def collect_paths(paths: Sequence[Path]) -> List[Path]:
+    """ Expand directories into contained results files. """
+    collected = []
+    for path in paths:
+        if path.is_dir():
+            collected.extend(sorted(p for p in path.iterdir() if p.suffix in EXTENSIONS))
+        else:
+            collected.append(path)
+    return collected
+
+
+def create_output_names(paths: Sequence[Path]) -> List[str]:
+    """ Create unique output directory name for each input file. """
+    names = []
+    for path in paths:
+        names.append(get_str_identifier(sanitize_name(path.stem), names))
+    return names
+
+
+def match_pattern(text: str, patterns: Sequence[str]) -> bool:
+    """ Check if text matches any of given case insensitive wildcard patterns. """
+    text = text.lower()
+    return any(fnmatchcase(text, pattern.lower()) for pattern in patterns)
+
+
+def match_view_variables(model: ViewModel, patterns: Sequence[str]) -> List[VV]:
+    """ Get table variables matching any of given patterns, all if there are none.
+
+    Patterns are matched against 'key | type | units' text.
+
+    """
+    header_df = model.header_df
+    types = [None] * len(header_df) if model.is_simple else header_df[TYPE_LEVEL]
+    view_variables = [
+        VV(*v) for v in zip(header_df[KEY_LEVEL], types, header_df[UNITS_LEVEL])
+    ]
+    if not patterns:
+        return view_variables
+    return [v for v in view_variables if match_pattern(stringify_view_variable(v), patterns)]
+
+
+def read_results_files(path: Path, workdir: Path) -> List[ParquetFile]:
+    """ Process and store results file in the current process. """
+    progress_queue = queue.Queue()
+    file_queue = queue.Queue()
+    load_file(path, workdir, progress_queue, file_queue, [], threading.Lock())
+    errors = [args[0] for _, identifier, args in progress_queue.queue if identifier == ERROR]
+    if errors:
+        raise RuntimeError("\n".join(errors))
+    return list(file_queue.queue)
+
+
+def create_traces(df: pd.DataFrame, chart_type: str) -> List[Trace1D]:
+    """ Create chart traces from results table columns. """
+    item_id = "item-0"
+    colors = color_generator()
+    totals = calculate_totals(df)
+    timestamps = calculate_timestamps(df)
+    traces = []
+    for col_ix, values in df.iteritems():
+        name = " | ".join(col_ix)  # file_name | interval | key | variable | units
+        trace_dt = TraceData(
+            item_id,
+            str(uuid.uuid1()),
+            name,
+            values.tolist(),
+            float(totals.loc[col_ix]),
+            col_ix[-1],
+            timestamps=timestamps,
+            interval=col_ix[1],
+        )
+        trace = Trace1D(name, item_id, str(uuid.uuid1()), next(colors), chart_type)
+        trace.ref = trace_dt
+        traces.append(trace if chart_type == "pie" else transform_trace(trace, chart_type))
+    return traces
+
+
+def create_chart(df: pd.DataFrame, chart_type: str, palette: Palette) -> dict:
+    """ Create 'plotly' chart from results table. """
+    chart = Chart("item-0", f"chart-{uuid.uuid1()}", chart_type)
+    return chart.as_plotly(
+        create_traces(df, chart_type),
+        modebar_active_color=palette.get_color("PRIMARY_TEXT_COLOR", opacity=0.5),
+        modebar_color=palette.get_color("PRIMARY_TEXT_COLOR"),
+        line_color=palette.get_color("PRIMARY_TEXT_COLOR"),
+        grid_color=palette.get_color("PRIMARY_TEXT_COLOR", opacity=0.5),
+        background_color=palette.get_color("BACKGROUND_COLOR"),
+    )
+
+
+def write_table(
+    df: pd.DataFrame,
+    dest: Path,
+    name: str,
+    formats: Sequence[str],
+    chart_type: str,
+    palette: Palette,
+) -> List[Path]:
+    """ Write results table in requested formats as 'dest/name.<format>'. """
+    outputs = []
+    if "csv" in formats:
+        outputs.append(Path(dest, f"{name}.csv"))
+        df.to_csv(outputs[-1])
+    if "parquet" in formats:
+        outputs.append(Path(dest, f"{name}.parquet"))
+        pq.write_table(table_to_arrow(df), str(outputs[-1]))
+    if "json" in formats or "html" in formats:
+        plot = create_chart(df, chart_type, palette)
+        if "json" in formats:
+            outputs.append(Path(dest, f"{name}.json"))
+            with open(outputs[-1], "w") as f:
+                json.dump(plot, f)
+        if "html" in formats:
+            outputs.append(Path(dest, f"{name}.html"))
+            with open(outputs[-1], "w", encoding="utf-8") as f:
+                f.write(
+                    HTML_TEMPLATE.format(
+                        title=name,
+                        background=palette.get_color("BACKGROUND_COLOR"),
+                        div_id=plot["divId"],
+                        # closing tags in trace names would end the script block
+                        plot=json.dumps(plot).replace("</", "<\\/"),
+                    )
+                )
+    return outputs
+
+
+def export_results_file(
+    file: ParquetFile, dest: Path, options: ExportOptions, palette: Palette
+) -> Tuple[List[Path], int]:
+    """ Write matching variables of each table, returns outputs and number of variables. """
+    outputs = []
+    n_variables = 0
+    for table in file.table_names:
+        if options.tables and not match_pattern(table, options.tables):
+            continue
+        model = ViewModel(table, file)
+        view_variables = match_view_variables(model, options.patterns)
+        if not view_variables:
+            continue
+        df = model.get_results(
+            view_variables,
+            units_system=options.units_system,
+            rate_units=options.rate_units,
+            energy_units=options.energy_units,
+            rate_to_energy=options.rate_to_energy,
+        )
+        if df is not None:
+            dest.mkdir(parents=True, exist_ok=True)
+            outputs.extend(
+                write_table(
+                    df, dest, sanitize_name(table), options.formats, options.chart_type, palette
+                )
+            )
+            n_variables += len(df.columns)
+    return outputs, n_variables
+
+
+@instrument
+def export_file(path: Path, output_dir: Path, options: ExportOptions) -> ExportResult:
+    """ Process a single results file and write its outputs, this runs in a worker process.
+
+    Outputs are written into 'output_dir/<file name>/<table>.<format>',
+    file name is included only when the source holds multiple environments.
+
+    """
+    start = time.perf_counter()
+    outputs = []
+    n_variables = 0
+    try:
+        palette = Palette.parse_palettes(Settings.PALETTE_PATH)[options.palette_name]
+        with tempfile.TemporaryDirectory(prefix="chartify-export-") as workdir:
+            # file ids are unique only within this process so cached
+            # tables must not be shared with other workers, previous
+            # store is restored as worker processes are reused
+            previous_store = ViewModel.ARROW_STORE
+            ViewModel.ARROW_STORE = ArrowStore(Path(workdir, "arrow"))
+            try:
+                files = read_results_files(path, Path(workdir))
+                for file in files:
+                    if len(files) == 1:
+                        dest = output_dir
+                    else:
+                        dest = Path(output_dir, sanitize_name(file.file_name))
+                    try:
+                        file_outputs, n = export_results_file(file, dest, options, palette)
+                        outputs.extend(file_outputs)
+                        n_variables += n
+                    finally:
+                        ViewModel.ARROW_STORE.wait()
+                        ViewModel.invalidate_results(file.id_)
+            finally:
+                ViewModel.ARROW_STORE.wait()
+                ViewModel.ARROW_STORE = previous_store
+    except Exception:
+        error = traceback.format_exc()
+    else:
+        error = None
+    return ExportResult(
+        path=str(path),
+        n_variables=n_variables,
+        outputs=[str(p) for p in outputs],
+        duration=time.perf_counter() - start,
+        error=error,
+    )
+
+
+def run_batch_export(
+    paths: Sequence[Path],
+    output_dir: Path,
+    options: ExportOptions,
+    max_workers: Optional[int] = None,
+) -> List[ExportResult]:
+    """ Export given files in parallel.
+
+    A line is appended into output directory manifest as soon
+    as each file gets processed so partial results are usable
+    even when the job is interrupted.
+
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    pool = create_pool(max_workers)
+    results = []
+    start = time.perf_counter()
+    with open(Path(output_dir, MANIFEST_NAME), "a") as manifest:
+        futures = {
+            pool.submit(export_file, path, Path(output_dir, name), options): path
+            for path, name in zip(paths, create_output_names(paths))
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            manifest.write(json.dumps(result._asdict()) + "\n")
+            manifest.flush()
+            elapsed = time.perf_counter() - start
+            if result.error:
+                logger.error("Failed to export '%s'!\n%s", result.path, result.error)
+            else:
+                logger.info(
+                    "[%d/%d] '%s' exported in %.2f s, %d outputs (%.1f files/min).",
+                    len(results),
+                    len(futures),
+                    result.path,
+                    result.duration,
+                    len(result.outputs),
+                    len(results) / elapsed * 60,
+                )
+    elapsed = time.perf_counter() - start
+    n_failed = sum(1 for r in results if r.error)
+    logger.info(
+        "Exported %d files (%d failed) in %.2f s, throughput %.1f files/min.",
+        len(results) - n_failed,
+        n_failed,
+        elapsed,
+        len(results) / elapsed * 60 if elapsed else 0,
+    )
+    return results
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="chartify export",
+        description="Export results of EnergyPlus or excel files without the GUI.",
+    )
+    parser.add_argument("paths", nargs="+", type=Path, help="results files or directories")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="output directory")
+    parser.add_argument(
+        "-p",
+        "--pattern",
+        action="append",
+        default=[],
+        help="wildcard pattern matched against 'key | type | units', "
+        "can be used multiple times, all variables are exported by default",
+    )
+    parser.add_argument(
+        "-t",
+        "--table",
+        action="append",
+        default=[],
+        help="wildcard table name pattern, can be used multiple times",
+    )
+    parser.add_argument(
+        "-f", "--format", action="append", choices=FORMATS, help="output format (default csv)"
+    )
+    parser.add_argument("--chart-type", choices=CHART_TYPES, default="scatter")
+    parser.add_argument("--units-system", choices=["SI", "IP"], default="SI")
+    parser.add_argument("--energy-units", default="J")
+    parser.add_argument("--rate-units", default="W")
+    parser.add_argument("--rate-to-energy", action="store_true")
+    parser.add_argument("--palette", default="default", help="chart color scheme")
+    parser.add_argument("-w", "--workers", type=int, help="number of worker processes")
+    # handled by 'main.py' before any instrumented module gets imported
+    parser.add_argument("--instrument", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str]) -> int:
+    """ Run batch export, returns non zero exit code when any file fails. """
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    options = ExportOptions(
+        patterns=args.pattern,
+        tables=args.table,
+        formats=args.format or ["csv"],
+        chart_type=args.chart_type,
+        units_system=args.units_system,
+        energy_units=args.energy_units,
+        rate_units=args.rate_units,
+        rate_to_energy=args.rate_to_energy,
+        palette_name=args.palette,
+    )
+    paths = collect_paths(args.paths)
+    if not paths:
+        logger.error("No results files found.")
+        return 1
+    results = run_batch_export(paths, args.output, options, max_workers=args.workers)
+    return 1 if any(r.error for r in results) else 0
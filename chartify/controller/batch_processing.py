@@ -0,0 +1,139 @@
+import logging
+import traceback
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Tuple, Optional
+
+from PySide2.QtCore import QObject, Signal, QRunnable, Slot
+
+from chartify.controller.progress_logging import UiLogger
+from chartify.ui.widgets.treeview_model import ViewModel
+
+MAX_WORKERS = 8
+
+
+def group_models_by_file(models: List[ViewModel]) -> Dict[int, List[ViewModel]]:
+    """ Group models so each group shares the same source file. """
+    groups = defaultdict(list)
+    for model in models:
+        groups[model.file_id].append(model)
+    return dict(groups)
+
+
+def process_file_models(
+    models: List[ViewModel], file_func: Callable[[ViewModel], Any]
+) -> List[Tuple[ViewModel, Any]]:
+    """ Apply file operation on all models referencing a single file. """
+    return [(model, file_func(model)) for model in models]
+
+
+# noinspection PyUnresolvedReferences
+class BatchSignals(QObject):
+    file_processed = Signal(list)
+    finished = Signal(list)
+
+
+class ModelUpdater(QObject):
+    """ Apply processed file results on models.
+
+    The updater needs to be created in the GUI thread so
+    results emitted from a worker thread are applied there.
+
+    """
+
+    def __init__(
+        self, model_func: Callable[[ViewModel, Any], None], parent: Optional[QObject] = None
+    ):
+        super().__init__(parent)
+        self.model_func = model_func
+
+    @Slot(list)
+    def apply_model_updates(self, results: List[Tuple[ViewModel, Any]]) -> None:
+        """ Invalidate data derived from modified files and update model items. """
+        for model, result in results:
+            model.mark_file_modified()
+            self.model_func(model, result)
+
+
+class BatchJob(QRunnable):
+    """ Apply an operation on models of many files.
+
+    File side operations run in parallel, models referencing
+    the same file are always processed serially as files are
+    not thread safe. Results are passed back to the GUI thread
+    in batches (one per file) where models are marked modified
+    and 'model_func' is applied.
+
+    A failure in one file does not stop processing of the others,
+    ids of failed files are emitted with 'finished' signal.
+
+    Attributes & Parameters
+    -----------------------
+    name : str
+        Task name as displayed in progress widget.
+    models : list of ViewModel
+        Models to be processed.
+    file_func : callable
+        Function modifying a source file, takes a model as an argument.
+    model_func : callable
+        Function updating model items, takes a model and 'file_func'
+        result, this is called in GUI thread.
+    logger : UiLogger
+        Logger reporting job progress.
+    max_workers : int, optional
+        Maximum number of files processed simultaneously.
+    parent : QObject, optional
+        Owner of the model updater, it should live in GUI thread.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        models: List[ViewModel],
+        file_func: Callable[[ViewModel], Any],
+        model_func: Callable[[ViewModel, Any], None],
+        logger: UiLogger,
+        max_workers: Optional[int] = None,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__()
+        self.name = name
+        self.groups = group_models_by_file(models)
+        self.file_func = file_func
+        self.logger = logger
+        self.max_workers = max_workers or MAX_WORKERS
+        self.signals = BatchSignals()
+        # updater lives in GUI thread so model updates are queued there
+        self.updater = ModelUpdater(model_func, parent)
+        self.signals.file_processed.connect(self.updater.apply_model_updates)
+        self.signals.finished.connect(self.updater.deleteLater)
+
+    def run(self) -> None:
+        failed = []
+        with self.logger.log_task(self.name):
+            self.logger.set_maximum_progress(len(self.groups))
+            n_workers = max(1, min(self.max_workers, len(self.groups)))
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                futures = {
+                    executor.submit(process_file_models, models, self.file_func): id_
+                    for id_, models in self.groups.items()
+                }
+                for future in as_completed(futures):
+                    try:
+                        results = future.result()
+                    except Exception:
+                        failed.append(futures[future])
+                        self.logger.log_message(
+                            f"Processing file id '{futures[future]}' failed!\n"
+                            f"{traceback.format_exc()}",
+                            level=logging.ERROR,
+                        )
+                    else:
+                        self.signals.file_processed.emit(results)
+                    self.logger.increment_progress()
+        if failed:
+            self.logger.log_task_failed(f"Failed to process files with ids: {failed}.")
+        else:
+            self.logger.done()
+        self.signals.finished.emit(failed)
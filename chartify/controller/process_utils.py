@@ -1,23 +1,30 @@
 from multiprocessing import cpu_count
+from typing import Optional
 
-import loky
-import psutil
+# loky and psutil are imported on demand to reduce startup time
 
 
-def create_pool():
-    """ Create a new process pool. """
-    n_cores = cpu_count()
-    workers = (n_cores - 1) if n_cores > 1 else 1
-    return loky.get_reusable_executor(max_workers=workers)
+def create_pool(max_workers: Optional[int] = None):
+    """ Create a new process pool, one core is left for the main process by default. """
+    import loky
+
+    if max_workers is None:
+        n_cores = cpu_count()
+        max_workers = (n_cores - 1) if n_cores > 1 else 1
+    return loky.get_reusable_executor(max_workers=max_workers)
 
 
 def kill_pool():
     """ Shutdown the process pool. """
+    import loky
+
     loky.get_reusable_executor().shutdown(wait=False, kill_workers=True)
 
 
 def kill_child_processes(parent_pid):
     """ Terminate all running child processes. """
+    import psutil
+
     try:
         parent = psutil.Process(parent_pid)
     except psutil.NoSuchProcess:
@@ -0,0 +1,281 @@
+import hashlib
+import json
+import os
+import threading
+import traceback
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from zipfile import ZipFile, ZIP_STORED
+
+import pandas as pd
+from esofile_reader.convertor import can_convert_rate_to_energy
+from esofile_reader.pqt.parquet_file import ParquetFile
+from esofile_reader.processing.progress_logger import BaseLogger, INFO
+
+from chartify.controller.progress_logging import UiLogger
+from chartify.model.lazy_file import LazyParquetFile
+from chartify.model.project_archive import (
+    FORMAT_VERSION,
+    ChunkWriter,
+    copy_member,
+    get_chunk_name,
+    get_manifest_names,
+    get_referenced_chunks,
+    open_project_archive,
+    read_manifest,
+    write_manifest,
+)
+from chartify.utils.instrumentation import instrument
+
+MAX_WORKERS = 4
+MAX_MANIFESTS = 20
+MAX_GARBAGE_RATIO = 0.5
+
+FileArchive = namedtuple("FileArchive", "fingerprint members tables")
+
+
+def get_file_fingerprint(file: ParquetFile) -> str:
+    """ Create hash identifying file content.
+
+    File id and name are not included so the same content
+    is recognized after the project gets reopened.
+
+    """
+    if isinstance(file, LazyParquetFile):
+        if not file.loaded:
+            return file.fingerprint
+        file = file.get_file()
+    hasher = hashlib.sha1()
+    hasher.update(f"{file.file_type}|{file.file_path}|{file.file_created}".encode())
+    for table in file.table_names:
+        hasher.update(table.encode())
+        header_df = file.get_header_df(table).reset_index()
+        hasher.update(pd.util.hash_pandas_object(header_df, index=False).values.tobytes())
+    return hasher.hexdigest()
+
+
+def describe_tables(file: ParquetFile) -> Dict[str, dict]:
+    """ Get table metadata required to show file without loading data. """
+    if isinstance(file, LazyParquetFile):
+        if not file.loaded:
+            return file.table_metadata
+        file = file.get_file()
+    tables = {}
+    for table in file.table_names:
+        header_df = file.get_header_df(table)
+        tables[table] = {
+            "simple": bool(file.is_header_simple(table)),
+            "rate_to_energy": bool(can_convert_rate_to_energy(file, table)),
+            "index": header_df.index.name,
+            "header": header_df.reset_index().to_dict(orient="split"),
+        }
+    return tables
+
+
+class ProjectSaver:
+    """ Save project files into a single archive.
+
+    Files are saved in parallel, archive members of each file
+    are written straight into the project archive as content
+    addressed chunks. Unchanged files (identified by a content
+    fingerprint) are not written again, only their chunks are
+    referenced by a new manifest describing files. Saved state
+    of an opened project is read from its manifest so files
+    are not written again on the first save either.
+
+    Saves only append new chunks and a new manifest, so old
+    chunks remain in the archive until it gets compacted. This
+    happens after a save when the archive holds too many
+    manifests or the unreferenced data is too large. Previous
+    archive state is restored when a save gets interrupted.
+
+    Files must not be modified while being written, file
+    operations should hold a lock given by 'get_file_lock'.
+    This applies to variable renames, removals and aggregations
+    (both current file edits and batch jobs), file renames and
+    removals. Files which are not in the storage yet (still
+    being loaded) cannot be saved so these are not locked.
+
+    Attributes & Parameters
+    -----------------------
+    max_workers : int
+        Maximum number of files written simultaneously.
+    max_manifests : int
+        Maximum number of manifests kept in the archive.
+    max_garbage_ratio : float
+        Maximum share of archive size taken by unreferenced data.
+
+    """
+
+    def __init__(
+        self,
+        max_workers: int = MAX_WORKERS,
+        max_manifests: int = MAX_MANIFESTS,
+        max_garbage_ratio: float = MAX_GARBAGE_RATIO,
+    ):
+        self.max_workers = max_workers
+        self.max_manifests = max_manifests
+        self.max_garbage_ratio = max_garbage_ratio
+        self._archives: Dict[str, FileArchive] = {}
+        self._file_locks: Dict[int, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._file_locks_lock = threading.Lock()
+
+    def get_file_lock(self, id_: int) -> threading.Lock:
+        """ Get a lock held while given file is being saved. """
+        with self._file_locks_lock:
+            return self._file_locks.setdefault(id_, threading.Lock())
+
+    def forget_file(self, id_: int) -> None:
+        """ Drop lock of a removed file. """
+        with self._file_locks_lock:
+            self._file_locks.pop(id_, None)
+
+    def add_saved_files(self, files: List[LazyParquetFile]) -> None:
+        """ Register saved state of files read from project manifest. """
+        archives = {
+            file.fingerprint: FileArchive(file.fingerprint, file.members, file.table_metadata)
+            for file in files
+        }
+        # not locked to avoid blocking, a concurrent save only drops these
+        self._archives = {**self._archives, **archives}
+
+    def is_dirty(self, fingerprint: str, existing: Set[str]) -> bool:
+        """ Check if file changed since the last save or its chunks are missing. """
+        try:
+            archive = self._archives[fingerprint]
+        except KeyError:
+            return True
+        return any(
+            get_chunk_name(digest) not in existing for digest in archive.members.values()
+        )
+
+    def update_file_archive(
+        self, file: ParquetFile, workdir: Path, writer: ChunkWriter
+    ) -> Tuple[FileArchive, bool]:
+        """ Write file chunks if needed, returns file state and 'True' when written. """
+        with self.get_file_lock(file.id_):
+            fingerprint = get_file_fingerprint(file)
+            archive = self._archives.get(fingerprint)
+            if not self.is_dirty(fingerprint, writer.existing):
+                return archive, False
+            file.save_file_to_zip(writer, workdir, BaseLogger(file.file_name, level=INFO))
+            # the same content has the same table metadata
+            tables = archive.tables if archive else describe_tables(file)
+        return FileArchive(fingerprint, writer.members, tables), True
+
+    @staticmethod
+    def create_manifest(
+        files: List[ParquetFile], archives: List[FileArchive], dashboard: Optional[dict] = None
+    ) -> dict:
+        """ Describe saved files. """
+        manifest = {"version": FORMAT_VERSION, "files": {}, "dashboard": dashboard}
+        for file, archive in zip(files, archives):
+            manifest["files"][str(file.id_)] = {
+                "file_name": file.file_name,
+                "file_type": file.file_type,
+                "fingerprint": archive.fingerprint,
+                "members": archive.members,
+                "tables": archive.tables,
+            }
+        return manifest
+
+    def needs_compaction(self, path: Path) -> bool:
+        """ Check if there's too much unused data in project archive. """
+        with ZipFile(path, mode="r") as zf:
+            n_manifests = len(get_manifest_names(zf))
+        return (
+            n_manifests > self.max_manifests
+            or self.get_garbage_ratio(path) > self.max_garbage_ratio
+        )
+
+    @instrument
+    def save(
+        self,
+        files: List[ParquetFile],
+        path: Path,
+        workdir: Path,
+        logger: UiLogger,
+        dashboard: Optional[dict] = None,
+    ):
+        """ Save given files and dashboard state into project archive. """
+        with self._lock:
+            try:
+                with logger.log_task(f"save file {path.stem}"):
+                    logger.set_maximum_progress(len(files) + 1)
+                    n_workers = max(1, min(self.max_workers, len(files)))
+                    with open_project_archive(path) as zf:
+                        existing = set(zf.namelist())
+                        archive_lock = threading.Lock()
+                        writers = [ChunkWriter(zf, existing, archive_lock) for _ in files]
+                        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                            futures = [
+                                executor.submit(self.update_file_archive, file, workdir, w)
+                                for file, w in zip(files, writers)
+                            ]
+                            for future in as_completed(futures):
+                                future.result()
+                                logger.increment_progress()
+                        archives = []
+                        for file, future in zip(files, futures):
+                            archive, written = future.result()
+                            if not written:
+                                logger.log_message(f"File '{file.file_name}' unchanged.", INFO)
+                            archives.append(archive)
+                        manifest = self.create_manifest(files, archives, dashboard)
+                        # json dump converts tuples so compare serialized manifests
+                        if json.dumps(manifest) != json.dumps(read_manifest(zf)):
+                            write_manifest(zf, manifest)
+                    self._archives = {archive.fingerprint: archive for archive in archives}
+                    n = sum(writer.n_written for writer in writers)
+                    logger.log_message(f"Written {n} new chunks.", INFO)
+                    if self.needs_compaction(path):
+                        self.compact_archive(path)
+                        logger.log_message(f"Compacted file {path.stem}.", INFO)
+                    logger.increment_progress()
+                logger.done()
+            except Exception:
+                logger.log_task_failed(traceback.format_exc())
+
+    @staticmethod
+    def get_garbage_ratio(path: Path) -> float:
+        """ Get share of archive size taken by unreferenced members. """
+        with ZipFile(path, mode="r") as zf:
+            manifest = read_manifest(zf)
+            referenced = get_referenced_chunks(manifest)
+            referenced.add(get_manifest_names(zf)[-1])
+            sizes = {info.filename: info.compress_size for info in zf.infolist()}
+        total = sum(sizes.values())
+        garbage = sum(v for k, v in sizes.items() if k not in referenced)
+        return garbage / total if total else 0
+
+    @staticmethod
+    def compact_archive(path: Path, logger: Optional[UiLogger] = None) -> None:
+        """ Rewrite project archive keeping only current chunks and manifest. """
+        temp_path = path.with_name(path.name + ".tmp")
+        with ZipFile(path, mode="r") as zf_in:
+            manifest = read_manifest(zf_in)
+            chunks = sorted(get_referenced_chunks(manifest))
+            if logger:
+                logger.set_maximum_progress(len(chunks))
+            with ZipFile(
+                temp_path, mode="w", compression=ZIP_STORED, allowZip64=True
+            ) as zf_out:
+                for name in chunks:
+                    copy_member(zf_in, name, zf_out, name)
+                    if logger:
+                        logger.increment_progress()
+                write_manifest(zf_out, manifest)
+        os.replace(temp_path, path)
+
+    def compact(self, path: Path, logger: UiLogger) -> None:
+        """ Remove unused chunks from project archive. """
+        with self._lock:
+            try:
+                with logger.log_task(f"compact file {path.stem}"):
+                    self.compact_archive(path, logger)
+                logger.done()
+            except Exception:
+                logger.log_task_failed(traceback.format_exc())
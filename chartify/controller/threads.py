@@ -1,12 +1,13 @@
-from contextlib import contextmanager
+import logging
 
-from PySide2.QtCore import QThread, Signal, QRunnable
-from esofile_reader.pqt.parquet_file import ParquetFile
+from PySide2.QtCore import QThread, Signal, QRunnable, QObject
+
+logger = logging.getLogger(__name__)
 
 
 # noinspection PyUnresolvedReferences
 class FileWatcher(QThread):
-    file_loaded = Signal(ParquetFile)
+    file_loaded = Signal(object)
 
     def __init__(self, file_queue):
         super().__init__()
@@ -18,26 +19,39 @@ class FileWatcher(QThread):
             self.file_loaded.emit(file)
 
 
-@contextmanager
-def suspend_watcher(main_window, thread: FileWatcher) -> None:
-    queue = thread.file_queue
-    thread.quit()
-    yield
-    main_window.watcher = FileWatcher(queue)
-    main_window.watcher.start()
+# noinspection PyUnresolvedReferences
+class WorkerSignals(QObject):
+    finished = Signal(object)
+    failed = Signal(object)
 
 
 class Worker(QRunnable):
+    """ Run given function in a thread pool.
+
+    Note that 'callback' is called from the worker thread,
+    connect to 'signals.finished' to receive the result
+    in the GUI thread. Exceptions raised by the function
+    are logged and emitted through 'signals.failed'.
+
+    """
+
     def __init__(self, func, *args, callback=None, **kwargs):
         super().__init__()
         self.func = func
         self.callback = callback
         self.args = args
         self.kwargs = kwargs
+        self.signals = WorkerSignals()
 
     def run(self):
-        # TODO catch fetch exceptions, emit signal to handle results
-        res = self.func(*self.args, **self.kwargs)
+        try:
+            res = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            name = getattr(self.func, "__name__", self.func)
+            logger.exception("Worker function '%s' failed.", name)
+            self.signals.failed.emit(e)
+            return
 
         if self.callback:
             self.callback(res)
+        self.signals.finished.emit(res)
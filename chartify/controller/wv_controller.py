@@ -1,31 +1,35 @@
 import json
+import logging
+import threading
 import uuid
-from typing import Tuple, Union
+from typing import Tuple, Union, Callable, Optional, Dict, List, TYPE_CHECKING
 
 from PySide2 import QtWebChannel
-from PySide2.QtCore import QObject, Slot, Signal, QJsonValue, QUrl, QThreadPool
-from PySide2.QtGui import QColor
-from PySide2.QtWebEngineWidgets import QWebEnginePage, QWebEngineView
+from PySide2.QtCore import QObject, Slot, Signal, QJsonValue, QUrl, QThreadPool, Qt
 
 from chartify.charts.chart import Chart
 from chartify.charts.chart_functions import transform_trace
 from chartify.charts.chart_settings import generate_grid_item, color_generator
-from chartify.charts.trace import Trace1D, TraceData
+from chartify.charts.trace import Trace1D, Trace2D, TraceData
+from chartify.model.data_server import DataServer, TIMESTAMPS, VALUES, get_origin
 from chartify.model.model import AppModel
 from chartify.settings import Settings
 from chartify.controller.threads import Worker
-from chartify.utils.tiny_profiler import profile
-from chartify.utils.utils import int_generator, calculate_totals, printdict
+from chartify.utils.instrumentation import Instrumentation, instrument
+from chartify.utils.utils import (
+    int_generator,
+    calculate_timestamps,
+    calculate_totals,
+    printdict,
+)
 
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+    from PySide2.QtWebEngineWidgets import QWebEngineView
+    from chartify.ui.widgets.treeview_model import ViewModel
 
-class MyPage(QWebEnginePage):
-    def __init__(self):
-        super().__init__()
-        self.setBackgroundColor(QColor("transparent"))
-
-    def javaScriptConsoleMessage(self, level, msg, line, source):
-        if "PERFORMANCE WARNING" not in msg:
-            print(f"JS >> {source} {line} {msg}")
+logger = logging.getLogger(__name__)
 
 
 class WVController(QObject):
@@ -33,35 +37,139 @@ class WVController(QObject):
     A controller to provide communication between
     web view instance and core application.
 
+    The web view is created when the dashboard page gets
+    loaded as web engine is slow to import and start.
+
+    Attributes & Parameters
+    -----------------------
+    m : AppModel
+        An access to the application database.
+    create_web_view : callable
+        Function returning a web view to display the dashboard.
+    fetch_results : callable, optional
+        Function returning results of currently selected
+        variables, these are added when a trace is dropped.
+
+    Attributes
+    ----------
+    wv : QWebEngineView
+        A web view displaying the dashboard.
+
     """
 
     fullLayoutUpdated = Signal("QVariantMap", "QVariantMap", "QVariantMap")
     componentUpdated = Signal(str, "QVariantMap")
     componentAdded = Signal(str, "QVariantMap", "QVariantMap")
+    layoutRestyled = Signal("QVariantMap", "QVariantMap")
+    itemValuesFetched = Signal(str, object)
 
     color_generator = color_generator()
     item_counter = int_generator()
 
-    def __init__(self, model: AppModel, web_view: QWebEngineView):
+    def __init__(
+        self,
+        model: AppModel,
+        create_web_view: Callable[[], "QWebEngineView"],
+        fetch_results: Optional[Callable[[], Optional["pd.DataFrame"]]] = None,
+    ):
         super().__init__()
         self.m = model
-        self.wv = web_view
-
-        page = MyPage()
-        self.wv.setPage(page)
+        self.create_web_view = create_web_view
+        self.fetch_results = fetch_results
+        self._wv = None
 
         self.channel = QtWebChannel.QWebChannel(self)
         self.channel.registerObject("bridge", self)
-        self.wv.page().setWebChannel(self.channel)
-
-        self.wv.load(QUrl(Settings.URL))
-        self.wv.setAcceptDrops(True)
 
         self.thread_pool = QThreadPool()
 
-    @profile
-    def refresh_layout(self):
-        """ Re-render all components. """
+        # data keys of trace values already sent to (and cached by) the web view
+        self.sent_traces: Dict[str, tuple] = {}
+
+        # trace values are fetched by the web view over http instead of web channel
+        self.data_server = (
+            DataServer(
+                self.get_array,
+                port=Settings.DATA_SERVER_PORT,
+                origin=get_origin(Settings.URL),
+            )
+            if Settings.USE_DATA_SERVER
+            else None
+        )
+
+        # trace data with published addresses, data server reads only these
+        # so the model is never accessed from data server threads
+        self._served: Dict[str, TraceData] = {}
+        self._served_lock = threading.Lock()
+        # trace data can be removed on any thread
+        self.m.traceDataRemoved.connect(self.on_trace_data_removed, Qt.DirectConnection)
+        # values of restored traces are fetched in background, applied on GUI thread
+        self.itemValuesFetched.connect(self.on_item_values_fetched, Qt.QueuedConnection)
+
+    @property
+    def wv(self) -> "QWebEngineView":
+        if self._wv is None:
+            self._wv = self.create_web_view()
+            self._wv.page().setWebChannel(self.channel)
+        return self._wv
+
+    def load_url(self) -> None:
+        """ Load dashboard page, this should be called once the main window is shown. """
+        if self.data_server is not None:
+            self.data_server.start()
+        self.wv.load(QUrl(Settings.URL))
+
+    def stop_data_server(self) -> None:
+        """ Stop serving trace values. """
+        if self.data_server is not None:
+            self.data_server.stop()
+
+    def get_array(self, kind: str, trace_data_id: str) -> Optional["np.ndarray"]:
+        """ Get values or js timestamps of given trace data, called by data server. """
+        import numpy as np
+
+        with self._served_lock:
+            trace_dt = self._served.get(trace_data_id)
+        if trace_dt is None:
+            return None
+        if kind == TIMESTAMPS:
+            if trace_dt.timestamps is None:
+                return None
+            return np.asarray(trace_dt.timestamps, dtype=np.float64) * 1000
+        if trace_dt.in_store:
+            # memory mapped array, values are not copied
+            return trace_dt.store.get_array(trace_dt.trace_data_id)
+        values = trace_dt.values
+        return None if values is None else np.asarray(values, dtype=np.float64)
+
+    def get_array_sources(self, trace: Trace2D) -> Dict[str, str]:
+        """ Get data server addresses of 'x' and 'y' values. """
+        sources = {}
+        for axis, ref in [("x", trace.x_ref), ("y", trace.y_ref)]:
+            if ref == "datetime" and isinstance(trace.ref, TraceData):
+                trace_dt, kind = trace.ref, TIMESTAMPS
+            elif isinstance(ref, TraceData):
+                trace_dt, kind = ref, VALUES
+            else:
+                continue
+            with self._served_lock:
+                self._served[trace_dt.trace_data_id] = trace_dt
+            sources[f"{axis}Source"] = self.data_server.get_url(kind, trace_dt.trace_data_id)
+        return sources
+
+    def on_trace_data_removed(self, trace_data_ids: List[str]) -> None:
+        """ Stop serving removed trace data. """
+        with self._served_lock:
+            for trace_data_id in trace_data_ids:
+                self._served.pop(trace_data_id, None)
+        if self.data_server is not None:
+            self.data_server.invalidate(trace_data_ids)
+
+    @instrument
+    def refresh_layout(self, resend_data: bool = False):
+        """ Re-render all components, trace values are sent only when not cached. """
+        if resend_data:
+            self.sent_traces.clear()
         components = {}
         for component in self.m.fetch_all_components():
             plot = self.plot_component(component)
@@ -71,7 +179,17 @@ class WVController(QObject):
 
         self.fullLayoutUpdated.emit(items, components, Settings.PALETTE.get_all_colors())
 
-    @profile
+    @instrument
+    def restyle_layout(self):
+        """ Apply current palette on all components without sending trace data. """
+        components = {}
+        for component in self.m.fetch_all_components():
+            plot = self.plot_component(component, include_data=False)
+            components[component.item_id] = plot
+
+        self.layoutRestyled.emit(components, Settings.PALETTE.get_all_colors())
+
+    @instrument
     def gen_component_ids(self, name: str) -> Tuple[str, str, str]:
         """ Generate unique chart ids. """
         while True:
@@ -86,9 +204,16 @@ class WVController(QObject):
             f"{name}-{i}",
         )
 
-    @profile
-    def plot_component(self, component: Union[Chart]) -> dict:
-        """ Request UI update for given component. """
+    @instrument
+    def plot_component(self, component: Union[Chart], include_data: bool = True) -> dict:
+        """ Request UI update for given component.
+
+        Values of traces previously sent to the web view are
+        omitted as the web view caches these under 'traceId'.
+        When data server is running, values of 2D traces are never
+        sent, 'xSource' and 'ySource' addresses are included instead.
+
+        """
         palette = Settings.PALETTE
 
         line_color = palette.get_color("PRIMARY_TEXT_COLOR")
@@ -99,6 +224,16 @@ class WVController(QObject):
 
         if isinstance(component, Chart):
             traces = self.m.fetch_traces(component.item_id)
+            traces_2d = [trace for trace in traces if isinstance(trace, Trace2D)]
+            serve_data = self.data_server is not None and self.data_server.running
+            if serve_data:
+                cached_traces = {trace.trace_id for trace in traces_2d}
+            else:
+                cached_traces = {
+                    trace.trace_id
+                    for trace in traces_2d
+                    if self.sent_traces.get(trace.trace_id) == trace.data_key
+                }
             component = component.as_plotly(
                 traces,
                 line_color,
@@ -106,11 +241,21 @@ class WVController(QObject):
                 modebar_color,
                 grid_color,
                 background_color,
+                include_data=include_data,
+                cached_traces=cached_traces,
             )
-        print(json.dumps(printdict(component, limit=20), indent=4))
+            if include_data and serve_data:
+                sources = {trace.trace_id: self.get_array_sources(trace) for trace in traces_2d}
+                for trace in component["data"]:
+                    trace.update(sources.get(trace.get("traceId"), {}))
+            elif include_data:
+                for trace in traces_2d:
+                    self.sent_traces[trace.trace_id] = trace.data_key
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps(printdict(component, limit=20), indent=4))
         return component
 
-    @profile
+    @instrument
     def update_component(self, item_id: str) -> None:
         """ Request UI update for given component. """
         component = self.m.fetch_component(item_id)
@@ -118,12 +263,11 @@ class WVController(QObject):
         if plot:
             self.componentUpdated.emit(item_id, plot)
 
-    @profile
-    def add_new_traces(self, item_id: str, type_: str) -> None:
+    @instrument
+    def add_new_traces(self, item_id: str, type_: str, df: "pd.DataFrame") -> None:
         """ Process raw pd.DataFrame and store the data. """
-        df = self.m.get_results()
         totals = calculate_totals(df)
-        timestamps = [dt.timestamp() for dt in df.index.to_pydatetime()]
+        timestamps = calculate_timestamps(df)
         chart = self.m.fetch_component(item_id)
 
         for col_ix, values in df.iteritems():
@@ -133,15 +277,20 @@ class WVController(QObject):
             units = col_ix[-1]
             interval = col_ix[1]
             total_value = float(totals.loc[col_ix])
+            # values are kept on disk and read only when serialized
+            with Instrumentation.span("ValuesStore.put", n_values=len(values)):
+                self.m.values_store.put(trace_data_id, values.to_numpy())
             trace_dt = TraceData(
                 item_id,
                 trace_data_id,
                 name,
-                values.tolist(),
+                None,
                 total_value,
                 units,
                 timestamps=timestamps,
                 interval=interval,
+                ref={"column": list(col_ix), "units": df.attrs.get("units", {})},
+                store=self.m.values_store,
             )
 
             self.m.wv_database["trace_data"].append(trace_dt)
@@ -159,10 +308,53 @@ class WVController(QObject):
 
         self.update_component(item_id)
 
+    def hydrate_traces(self, models: Dict[Tuple[str, str], "ViewModel"]) -> None:
+        """ Fetch values of restored traces, items on top of dashboard go first. """
+        from chartify.model.dashboard import get_hydration_order
+
+        refs = []
+        for item_id in get_hydration_order(self.m.wv_database):
+            item_refs = {
+                trace_dt.trace_data_id: trace_dt.ref
+                for trace_dt in self.m.fetch_traces_data(item_id)
+                if not trace_dt.hydrated
+            }
+            if item_refs:
+                refs.append((item_id, item_refs))
+        if refs:
+            self.thread_pool.start(Worker(self.fetch_item_values, refs, models))
+
+    def fetch_item_values(
+        self,
+        refs: List[Tuple[str, Dict[str, dict]]],
+        models: Dict[Tuple[str, str], "ViewModel"],
+    ) -> None:
+        """ Fetch values of given trace data references, this runs in a worker thread. """
+        from chartify.model.dashboard import fetch_ref_values
+
+        for item_id, item_refs in refs:
+            values = {}
+            for trace_data_id, ref in item_refs.items():
+                series = fetch_ref_values(ref, models)
+                if series is not None:
+                    values[trace_data_id] = series.to_numpy()
+            self.itemValuesFetched.emit(item_id, values)
+
+    @Slot(str, object)
+    def on_item_values_fetched(self, item_id: str, values: Dict[str, "np.ndarray"]) -> None:
+        """ Store fetched values of restored traces and update their component. """
+        for trace_data_id, array in values.items():
+            # trace data could have been removed while being fetched
+            if self.m.fetch_trace_data(trace_data_id) is not None:
+                self.m.values_store.put(trace_data_id, array)
+        if self.m.fetch_component(item_id) is not None:
+            self.update_component(item_id)
+
     @Slot()
     def onConnectionInitialized(self) -> None:
         """ Callback from the webview after initialized. """
-        self.refresh_layout()
+        # newly loaded page does not hold any trace values
+        self.refresh_layout(resend_data=True)
 
     @Slot(str)
     def onNewChartRequested(self, chart_type: str) -> None:
@@ -187,6 +379,10 @@ class WVController(QObject):
     def onItemRemoved(self, item_id: str) -> None:
         """ Remove component from app model. """
         print(f"PY removeItem {item_id}.")
+        for trace in self.m.fetch_traces(item_id):
+            self.sent_traces.pop(trace.trace_id, None)
+            self.m.wv_database["traces"].remove(trace)
+        self.m.remove_trace_data(self.m.fetch_traces_data(item_id))
         component = self.m.fetch_component(item_id)
         self.m.wv_database["components"].remove(component)
         try:
@@ -239,7 +435,9 @@ class WVController(QObject):
     @Slot(str, str)
     def onTraceDropped(self, item_id: str, chart_type: str) -> None:
         """ Handle trace webview trace drop. """
-        self.thread_pool.start(Worker(self.add_new_traces, item_id, chart_type))
+        df = self.fetch_results() if self.fetch_results else None
+        if df is not None:
+            self.thread_pool.start(Worker(self.add_new_traces, item_id, chart_type, df))
 
     @Slot(str, str)
     def onTraceClicked(self, item_id: str, trace_id: str) -> None:
@@ -256,6 +454,10 @@ class WVController(QObject):
             if trace.selected:
                 self.m.wv_database["traces"].remove(trace)
 
+        # trace data of custom charts stay available for new traces
+        if not self.m.fetch_component(item_id).custom:
+            self.m.remove_unused_trace_data(item_id)
+
         self.update_component(item_id)
 
     @Slot(str, str, bool)
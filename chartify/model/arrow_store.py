@@ -0,0 +1,251 @@
+import json
+import logging
+import threading
+import uuid
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, Future
+from pathlib import Path
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+MAX_SIZE = 1024 ** 3
+
+METADATA_KEY = b"chartify"
+
+# a single arrow file holding some columns of a table
+Chunk = namedtuple("Chunk", "path ids size")
+
+TableKey = Tuple[int, str]
+
+
+def table_to_arrow(df: pd.DataFrame, ids: Optional[Sequence[Hashable]] = None) -> pa.Table:
+    """ Convert results table, column labels and ids are stored in metadata. """
+    flat_df = df.copy(deep=False)
+    flat_df.columns = [str(i) for i in range(len(df.columns))]
+    table = pa.Table.from_pandas(flat_df, preserve_index=True)
+    metadata = {
+        "columns": [list(c) if isinstance(c, tuple) else c for c in df.columns],
+        "names": list(df.columns.names),
+    }
+    if ids is not None:
+        metadata["ids"] = [list(i) if isinstance(i, tuple) else i for i in ids]
+    return table.replace_schema_metadata(
+        {**table.schema.metadata, METADATA_KEY: json.dumps(metadata).encode()}
+    )
+
+
+def arrow_to_table(table: pa.Table, columns: Optional[List[int]] = None) -> pd.DataFrame:
+    """ Convert arrow table back into results table, only given column positions are read. """
+    metadata = json.loads(table.schema.metadata[METADATA_KEY])
+    labels = metadata["columns"]
+    if columns is not None:
+        index_columns = [
+            c for c in table.schema.pandas_metadata["index_columns"] if isinstance(c, str)
+        ]
+        table = table.select([str(i) for i in columns] + index_columns)
+        labels = [labels[i] for i in columns]
+    df = table.to_pandas()
+    if len(metadata["names"]) > 1:
+        df.columns = pd.MultiIndex.from_tuples(
+            [tuple(c) for c in labels], names=metadata["names"]
+        )
+    else:
+        df.columns = pd.Index(labels, name=metadata["names"][0])
+    return df
+
+
+class ArrowStore:
+    """ Uncompressed Arrow IPC copies of recently used results tables.
+
+    Reading parquet requires decompression and conversion,
+    Arrow IPC files are memory mapped and read without copying.
+
+    Data are stored per results table, columns are added as
+    'chunks' (one file per write) whenever new columns of the
+    table are read and any subset of stored columns can be
+    sliced without reading the others. Columns are identified
+    by 'ids', column labels are used when not given.
+
+    Chunks are written on a background thread so the caller is
+    not blocked. Least recently used tables are deleted when total
+    size exceeds 'max_size' bytes.
+
+    Attributes & Parameters
+    -----------------------
+    workdir : Path
+        A directory to store arrow files.
+    max_size : int
+        Maximum total size of stored files in bytes.
+
+    """
+
+    def __init__(self, workdir: Path, max_size: int = MAX_SIZE):
+        self.workdir = workdir
+        self.max_size = max_size
+        self._tables = OrderedDict()
+        self._size = 0
+        self._pending = {}
+        self._lock = threading.RLock()
+        self._executor = None
+
+    def __contains__(self, key: TableKey) -> bool:
+        return key in self._tables
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="arrow")
+        return self._executor
+
+    def get_path(self, key: TableKey) -> Path:
+        """ Get path of a new chunk of given table. """
+        return Path(self.workdir, f"{key[0]}-{uuid.uuid4().hex}.arrow")
+
+    def get_paths(self, key: TableKey) -> List[Path]:
+        """ Get paths of all chunks of given table. """
+        with self._lock:
+            return [chunk.path for chunk in self._tables.get(key, [])]
+
+    def get_ids(self, key: TableKey) -> List[Hashable]:
+        """ Get ids of stored columns of given table. """
+        with self._lock:
+            return [id_ for chunk in self._tables.get(key, []) for id_ in chunk.ids]
+
+    def get(
+        self, key: TableKey, ids: Optional[List[Hashable]] = None
+    ) -> Optional[pd.DataFrame]:
+        """ Read stored columns, returns 'None' when none of these is available.
+
+        All columns of the table are read when 'ids' are not given,
+        columns which are not stored are omitted.
+
+        """
+        with self._lock:
+            try:
+                chunks = list(self._tables[key])
+            except KeyError:
+                return None
+            self._tables.move_to_end(key)
+        requested = None if ids is None else set(ids)
+        frames = []
+        for chunk in chunks:
+            columns = [
+                i for i, id_ in enumerate(chunk.ids) if requested is None or id_ in requested
+            ]
+            if not columns:
+                continue
+            try:
+                with pa.memory_map(str(chunk.path), "r") as source:
+                    table = pa.ipc.open_file(source).read_all()
+            except (FileNotFoundError, pa.ArrowInvalid):
+                self.remove(key)
+                return None
+            frames.append(arrow_to_table(table, columns))
+        return pd.concat(frames, axis=1) if frames else None
+
+    def write(self, key: TableKey, df: pd.DataFrame, ids: List[Hashable]) -> Path:
+        """ Write table into a new arrow chunk. """
+        table = table_to_arrow(df, ids)
+        path = self.get_path(key)
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        return path
+
+    def filter_new_columns(
+        self, key: TableKey, df: pd.DataFrame, ids: Optional[List[Hashable]]
+    ) -> Tuple[pd.DataFrame, List[Hashable]]:
+        """ Drop columns which are already stored or being written. """
+        ids = list(df.columns) if ids is None else list(ids)
+        with self._lock:
+            known = set(self.get_ids(key))
+            for pending_ids in self._pending.get(key, {}).values():
+                known.update(pending_ids)
+        new = [i for i, id_ in enumerate(ids) if id_ not in known]
+        return df.iloc[:, new], [ids[i] for i in new]
+
+    def put(
+        self, key: TableKey, df: pd.DataFrame, ids: Optional[List[Hashable]] = None
+    ) -> None:
+        """ Store new columns of a table, least recently used tables are deleted. """
+        df, ids = self.filter_new_columns(key, df, ids)
+        if ids:
+            path = self.write(key, df, ids)
+            self._register(key, Chunk(path, ids, path.stat().st_size))
+
+    def _put_pending(
+        self, key: TableKey, df: pd.DataFrame, ids: List[Hashable], token: str
+    ) -> None:
+        path = self.write(key, df, ids)
+        with self._lock:
+            # table could have been invalidated while being written
+            if self._pending.get(key, {}).pop(token, None) is None:
+                path.unlink(missing_ok=True)
+            else:
+                if not self._pending[key]:
+                    del self._pending[key]
+                self._register(key, Chunk(path, ids, path.stat().st_size))
+
+    def _register(self, key: TableKey, chunk: Chunk) -> None:
+        with self._lock:
+            if chunk.size > self.max_size:
+                chunk.path.unlink(missing_ok=True)
+                return
+            self._tables.setdefault(key, []).append(chunk)
+            self._tables.move_to_end(key)
+            self._size += chunk.size
+            while self._size > self.max_size:
+                self._pop(next(iter(self._tables)))
+
+    def put_async(
+        self, key: TableKey, df: pd.DataFrame, ids: Optional[List[Hashable]] = None
+    ) -> Optional[Future]:
+        """ Transcode new columns of a table on a background thread. """
+        with self._lock:
+            df, ids = self.filter_new_columns(key, df, ids)
+            if not ids:
+                return None
+            token = uuid.uuid4().hex
+            self._pending.setdefault(key, {})[token] = ids
+            return self.executor.submit(self._put_pending, key, df, ids, token)
+
+    def _pop(self, key: TableKey) -> None:
+        for chunk in self._tables.pop(key, []):
+            self._size -= chunk.size
+            chunk.path.unlink(missing_ok=True)
+
+    def remove(self, key: TableKey) -> None:
+        """ Delete all chunks of given table. """
+        with self._lock:
+            self._pop(key)
+
+    def invalidate_file(self, file_id: int) -> None:
+        """ Delete all tables of given file. """
+        with self._lock:
+            for key in [k for k in self._pending if k[0] == file_id]:
+                del self._pending[key]
+            for key in [k for k in self._tables if k[0] == file_id]:
+                self._pop(key)
+
+    def wait(self) -> None:
+        """ Block until pending chunks are written. """
+        if self._executor is not None:
+            # tasks are processed in order by a single worker
+            self._executor.submit(lambda: None).result()
+
+    def clear(self) -> None:
+        """ Delete all stored tables. """
+        with self._lock:
+            self._pending.clear()
+            for key in list(self._tables):
+                self._pop(key)
+
@@ -0,0 +1,180 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from zipfile import ZipFile
+
+import numpy as np
+import pandas as pd
+from esofile_reader.df.level_names import KEY_LEVEL, TYPE_LEVEL, UNITS_LEVEL
+
+from chartify.charts.chart import Chart
+from chartify.charts.trace import Trace1D, Trace2D, Trace3D, TraceData
+from chartify.model.project_archive import read_manifest
+from chartify.model.values_store import ValuesStore
+from chartify.ui.widgets.treeview_model import ViewModel, VV
+
+TRACE_ATTRS = ["name", "item_id", "trace_id", "color", "type_", "selected", "priority"]
+AXIS_ATTRS = ["xaxis", "yaxis", "zaxis"]
+REF_ATTRS = ["_x_ref", "_y_ref", "_z_ref"]
+
+
+def dump_ref(ref: Union[str, TraceData, None]) -> Optional[dict]:
+    if isinstance(ref, TraceData):
+        return {"trace_data": ref.trace_data_id}
+    elif ref is not None:
+        return {"value": ref}
+
+
+def load_ref(ref: Optional[dict], trace_data: Dict[str, TraceData]):
+    if ref is not None:
+        return trace_data[ref["trace_data"]] if "trace_data" in ref else ref["value"]
+
+
+def dump_trace(trace: Union[Trace1D, Trace2D, Trace3D]) -> dict:
+    """ Get trace attributes, trace data are referenced by id. """
+    state = {"class": type(trace).__name__, **{k: getattr(trace, k) for k in TRACE_ATTRS}}
+    if isinstance(trace, Trace1D):
+        state["ref"] = dump_ref(trace.ref)
+    else:
+        for attr in AXIS_ATTRS + ["_num_values", "_interval"]:
+            if hasattr(trace, attr):
+                state[attr] = getattr(trace, attr)
+        for attr in REF_ATTRS:
+            if hasattr(trace, attr):
+                state[attr] = dump_ref(getattr(trace, attr))
+    return state
+
+
+def load_trace(state: dict, trace_data: Dict[str, TraceData]) -> Union[Trace1D, Trace2D]:
+    """ Create trace from stored attributes. """
+    classes = {"Trace1D": Trace1D, "Trace2D": Trace2D, "Trace3D": Trace3D}
+    trace = classes[state["class"]](*[state[k] for k in TRACE_ATTRS])
+    if isinstance(trace, Trace1D):
+        trace.ref = load_ref(state["ref"], trace_data)
+    else:
+        # stored state has been validated already
+        for attr in AXIS_ATTRS + ["_num_values", "_interval"]:
+            if attr in state:
+                setattr(trace, attr, state[attr])
+        for attr in REF_ATTRS:
+            if attr in state:
+                setattr(trace, attr, load_ref(state[attr], trace_data))
+        if isinstance(trace.ref, TraceData):
+            trace._timestamps = trace.ref.timestamps
+    return trace
+
+
+def dump_dashboard(wv_database: dict) -> dict:
+    """ Get compact dashboard state, trace values are not included. """
+    timestamps_keys = {}
+    timestamps = {}
+    trace_data = []
+    for trace_dt in wv_database["trace_data"]:
+        # timestamps array is shared by traces created together
+        timestamps_key = None
+        if trace_dt.timestamps is not None:
+            timestamps_key = timestamps_keys.setdefault(
+                id(trace_dt.timestamps), str(len(timestamps_keys))
+            )
+            timestamps[timestamps_key] = np.asarray(trace_dt.timestamps).tolist()
+        trace_data.append(
+            {
+                "item_id": trace_dt.item_id,
+                "trace_data_id": trace_dt.trace_data_id,
+                "name": trace_dt.name,
+                "total_value": trace_dt.total_value,
+                "units": trace_dt.units,
+                "interval": trace_dt.interval,
+                "n_values": trace_dt.n_values,
+                "timestamps": timestamps_key,
+                "ref": trace_dt.ref,
+            }
+        )
+    return {
+        "items": wv_database["items"],
+        "components": [dict(vars(component)) for component in wv_database["components"]],
+        "traces": [dump_trace(trace) for trace in wv_database["traces"]],
+        "trace_data": trace_data,
+        "timestamps": timestamps,
+    }
+
+
+def load_dashboard(state: dict, store: ValuesStore) -> dict:
+    """ Create dashboard database, trace values are read from 'store' once fetched. """
+    timestamps = {
+        key: np.asarray(ts, dtype=np.float64) for key, ts in state["timestamps"].items()
+    }
+    trace_data = {}
+    for trace_dt_state in state["trace_data"]:
+        key = trace_dt_state["timestamps"]
+        trace_dt = TraceData(
+            trace_dt_state["item_id"],
+            trace_dt_state["trace_data_id"],
+            trace_dt_state["name"],
+            None,
+            trace_dt_state["total_value"],
+            trace_dt_state["units"],
+            timestamps=timestamps[key] if key is not None else None,
+            interval=trace_dt_state["interval"],
+            ref=trace_dt_state["ref"],
+            store=store,
+        )
+        trace_dt.n_values = trace_dt_state["n_values"]
+        trace_data[trace_dt.trace_data_id] = trace_dt
+    components = []
+    for component_state in state["components"]:
+        chart = Chart(
+            component_state["item_id"], component_state["chart_id"], component_state["type_"]
+        )
+        vars(chart).update(component_state)
+        components.append(chart)
+    return {
+        "trace_data": list(trace_data.values()),
+        "traces": [load_trace(trace, trace_data) for trace in state["traces"]],
+        "components": components,
+        "items": state["items"],
+    }
+
+
+def read_project_dashboard(path: Path) -> Optional[dict]:
+    """ Read dashboard state stored in project archive. """
+    with ZipFile(path, mode="r") as zf:
+        manifest = read_manifest(zf)
+    return manifest.get("dashboard") if manifest else None
+
+
+def get_hydration_order(wv_database: dict) -> List[str]:
+    """ Get item ids sorted from the top of the dashboard. """
+    item_ids = [component.item_id for component in wv_database["components"]]
+    items = wv_database["items"]
+    if isinstance(items, dict):
+
+        def position(item_id: str) -> Tuple[float, float]:
+            item = items.get(item_id)
+            if isinstance(item, dict):
+                return item.get("y", float("inf")), item.get("x", float("inf"))
+            return float("inf"), float("inf")
+
+        item_ids.sort(key=position)
+    return item_ids
+
+
+def fetch_ref_values(
+    ref: Optional[dict], models: Dict[Tuple[str, str], ViewModel]
+) -> Optional[pd.Series]:
+    """ Get values of a stored trace data reference. """
+    if not ref:
+        return None
+    column = tuple(ref["column"])
+    file_name, table, key = column[:3]
+    model = models.get((file_name, table))
+    if model is None:
+        return None
+    header_df = model.header_df
+    mask = header_df[KEY_LEVEL] == key
+    if len(column) == 5:
+        mask &= header_df[TYPE_LEVEL] == column[3]
+    type_ = column[3] if len(column) == 5 else None
+    view_variables = [VV(key, type_, units) for units in header_df.loc[mask, UNITS_LEVEL]]
+    df = model.get_results(view_variables, **ref["units"]) if view_variables else None
+    if df is not None and column in df.columns:
+        return df[column]
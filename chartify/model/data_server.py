@@ -0,0 +1,394 @@
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Callable, Dict, Iterable, Optional, Tuple, TYPE_CHECKING
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+HOST = "127.0.0.1"
+
+# array kinds served by the data server
+VALUES = "values"
+TIMESTAMPS = "timestamps"
+
+MAX_HEADER_SIZE = 64 * 1024
+KEEP_ALIVE_TIMEOUT = 60
+MAX_CACHE_SIZE = 256 * 1024 ** 2
+
+STATUS_TEXT = {
+    200: "OK",
+    204: "No Content",
+    206: "Partial Content",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    416: "Range Not Satisfiable",
+    500: "Internal Server Error",
+}
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Methods": "GET, HEAD, OPTIONS",
+    "Access-Control-Allow-Headers": "Range, If-None-Match, If-Range",
+    "Access-Control-Expose-Headers": "ETag, Content-Range, Content-Length, X-Dtype",
+}
+
+PATH_PATTERN = re.compile(rf"^/({VALUES}|{TIMESTAMPS})/([\w\-.]+)$")
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+Response = namedtuple("Response", "status headers body")
+
+# raw array bytes with their entity tag
+Buffer = namedtuple("Buffer", "data etag")
+
+ResolveType = Callable[[str, str], Optional["np.ndarray"]]
+
+GetBufferType = Callable[[str, str], Optional[Buffer]]
+
+
+def get_origin(url: str) -> str:
+    """ Get origin (scheme, host and port) of given address. """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_cors_headers(origin: Optional[str]) -> Dict[str, str]:
+    """ Get headers allowing given origin to read responses. """
+    if origin is None:
+        # only same origin requests can read responses
+        return dict(CORS_HEADERS)
+    return {"Access-Control-Allow-Origin": origin, **CORS_HEADERS}
+
+
+def create_etag(buffer: memoryview) -> str:
+    """ Create strong entity tag from array content. """
+    return f'"{hashlib.sha1(buffer).hexdigest()}"'
+
+
+def create_buffer(array: "np.ndarray") -> Buffer:
+    """ Convert array into little endian float64 bytes. """
+    import numpy as np
+
+    data = memoryview(np.ascontiguousarray(array, dtype="<f8")).cast("B")
+    return Buffer(data, create_etag(data))
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """ Get (start, stop) byte slice of a single 'bytes' range.
+
+    Returns 'None' when range is not satisfiable, ValueError
+    is raised for unsupported syntax (e.g. multiple ranges).
+
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        raise ValueError(f"Unsupported range: '{header}'.")
+    first, last = match.groups()
+    if first == "":
+        # suffix range, last n bytes
+        start, stop = max(0, size - int(last)), size
+    else:
+        start = int(first)
+        stop = min(size, int(last) + 1) if last else size
+    if start >= size or start >= stop:
+        return None
+    return start, stop
+
+
+def matches_etag(header: str, etag: str) -> bool:
+    """ Check if 'If-None-Match' like header matches given entity tag. """
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def create_response(
+    method: str,
+    path: str,
+    headers: Dict[str, str],
+    get_buffer: GetBufferType,
+    cors_headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """ Process a single request, headers are expected to be lower case. """
+    cors_headers = get_cors_headers(None) if cors_headers is None else cors_headers
+    if method == "OPTIONS":
+        return Response(204, dict(cors_headers), b"")
+    if method not in ("GET", "HEAD"):
+        return Response(405, {**cors_headers, "Allow": "GET, HEAD, OPTIONS"}, b"")
+
+    match = PATH_PATTERN.match(path.split("?", 1)[0])
+    cached = get_buffer(*match.groups()) if match else None
+    if cached is None:
+        return Response(404, dict(cors_headers), b"")
+
+    buffer, etag = cached
+    response_headers = {
+        **cors_headers,
+        "Content-Type": "application/octet-stream",
+        "X-Dtype": "float64",
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Accept-Ranges": "bytes",
+    }
+    if "if-none-match" in headers and matches_etag(headers["if-none-match"], etag):
+        return Response(304, response_headers, b"")
+
+    status = 200
+    body = buffer
+    range_header = headers.get("range")
+    if range_header and headers.get("if-range", etag) == etag:
+        try:
+            byte_range = parse_range(range_header, len(buffer))
+        except ValueError:
+            # unsupported ranges are ignored, the whole array is sent
+            byte_range = (0, len(buffer))
+        if byte_range is None:
+            response_headers["Content-Range"] = f"bytes */{len(buffer)}"
+            return Response(416, response_headers, b"")
+        start, stop = byte_range
+        if (start, stop) != (0, len(buffer)):
+            status = 206
+            body = buffer[start:stop]
+            response_headers["Content-Range"] = f"bytes {start}-{stop - 1}/{len(buffer)}"
+    if method == "HEAD":
+        response_headers["Content-Length"] = str(len(body))
+        body = b""
+    return Response(status, response_headers, body)
+
+
+def serialize_head(status: int, headers: Dict[str, str], keep_alive: bool) -> bytes:
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"]
+    lines.extend(f"{k}: {v}" for k, v in headers.items())
+    lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+class DataServer:
+    """ Local HTTP endpoint serving trace arrays to the web view.
+
+    Arrays are sent as raw little endian float64 bytes from
+    '/values/<trace_data_id>' and '/timestamps/<trace_data_id>',
+    responses carry content based ETag and support single
+    'bytes' range requests so zoomed windows can be fetched
+    without transferring whole arrays.
+
+    Server runs on its own asyncio loop in a daemon thread,
+    arrays are resolved and hashed in the loop's default executor
+    so bulk transfers never touch the GUI thread.
+
+    Converted arrays and their ETags are cached until total size
+    exceeds 'max_cache_size' bytes, least recently used arrays
+    are dropped first. Arrays need to be invalidated when their
+    source changes.
+
+    Attributes & Parameters
+    -----------------------
+    resolve : callable
+        Function taking array kind and id, returns an array
+        or 'None' when the array is not available.
+    host : str
+        Interface to listen on, only loopback should be used.
+    port : int
+        Port to listen on, free port is chosen when 0.
+    origin : str, optional
+        The only origin allowed to read responses, cross origin
+        reads are not allowed when not given.
+    max_cache_size : int
+        Maximum total size of cached arrays in bytes.
+
+    """
+
+    def __init__(
+        self,
+        resolve: ResolveType,
+        host: str = HOST,
+        port: int = 0,
+        origin: Optional[str] = None,
+        max_cache_size: int = MAX_CACHE_SIZE,
+    ):
+        self.resolve = resolve
+        self.host = host
+        self.port = port
+        self.cors_headers = get_cors_headers(origin)
+        self.max_cache_size = max_cache_size
+        self._cache = OrderedDict()
+        self._cache_size = 0
+        # incremented on invalidation so arrays being resolved are not cached
+        self._generation = 0
+        self._cache_lock = threading.Lock()
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._started = threading.Event()
+        self._error = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def get_url(self, kind: str, id_: str) -> str:
+        """ Get address of given array. """
+        return f"{self.url}/{kind}/{id_}"
+
+    def get_buffer(self, kind: str, id_: str) -> Optional[Buffer]:
+        """ Get array bytes with ETag, arrays are resolved only when not cached. """
+        key = (kind, id_)
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            generation = self._generation
+        array = self.resolve(kind, id_)
+        if array is None:
+            return None
+        buffer = create_buffer(array)
+        size = len(buffer.data)
+        with self._cache_lock:
+            if generation == self._generation and size <= self.max_cache_size:
+                previous = self._cache.pop(key, None)
+                if previous is not None:
+                    self._cache_size -= len(previous.data)
+                self._cache[key] = buffer
+                self._cache_size += size
+                while self._cache_size > self.max_cache_size:
+                    _, dropped = self._cache.popitem(last=False)
+                    self._cache_size -= len(dropped.data)
+        return buffer
+
+    def invalidate(self, ids: Iterable[str]) -> None:
+        """ Drop cached arrays of given ids. """
+        with self._cache_lock:
+            self._generation += 1
+            for id_ in ids:
+                for kind in (VALUES, TIMESTAMPS):
+                    buffer = self._cache.pop((kind, id_), None)
+                    if buffer is not None:
+                        self._cache_size -= len(buffer.data)
+
+    def clear(self) -> None:
+        """ Drop all cached arrays. """
+        with self._cache_lock:
+            self._generation += 1
+            self._cache.clear()
+            self._cache_size = 0
+
+    def start(self) -> int:
+        """ Start serving in background thread, returns bound port. """
+        if self.running:
+            return self.port
+        self._started.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="data-server", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._error is not None:
+            raise self._error
+        logger.info("Data server listening on '%s'.", self.url)
+        return self.port
+
+    def stop(self) -> None:
+        """ Stop serving and wait for the thread to finish. """
+        if self.running:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(
+                    self.handle_connection, self.host, self.port, limit=MAX_HEADER_SIZE
+                )
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self._error = e
+            self._started.set()
+            self._loop.close()
+            return
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            # keep-alive connections would be left pending
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    async def read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[Tuple[str, str, str, Dict[str, str]]]:
+        """ Read request line and headers, returns 'None' when connection is closed. """
+        try:
+            data = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        lines = data.decode("latin-1").split("\r\n")
+        method, path, version = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        return method, path, version, headers
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """ Serve requests of a single (possibly keep-alive) connection. """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(serialize_head(400, self.cors_headers, keep_alive=False))
+                    break
+                if request is None:
+                    break
+                method, path, version, headers = request
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                )
+                try:
+                    response = await loop.run_in_executor(
+                        None,
+                        create_response,
+                        method,
+                        path,
+                        headers,
+                        self.get_buffer,
+                        self.cors_headers,
+                    )
+                except Exception:
+                    logger.exception("Data server failed to process '%s'.", path)
+                    response = Response(500, dict(self.cors_headers), b"")
+                response_headers = {"Content-Length": str(len(response.body))}
+                response_headers.update(response.headers)
+                writer.write(serialize_head(response.status, response_headers, keep_alive))
+                if response.body:
+                    writer.write(response.body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            # client went away or server is shutting down
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,199 @@
+import shutil
+import threading
+from functools import partial
+from pathlib import Path
+from uuid import uuid1
+from typing import List, Dict
+from zipfile import ZipFile
+
+import pandas as pd
+from esofile_reader.convertor import can_convert_rate_to_energy
+from esofile_reader.df.level_names import KEY_LEVEL, TYPE_LEVEL, UNITS_LEVEL
+from esofile_reader.pqt.parquet_file import ParquetFile
+from esofile_reader.processing.progress_logger import BaseLogger
+from esofile_reader.typehints import VariableType
+
+from chartify.model.project_archive import (
+    CHUNK_SIZE,
+    ChunkWriter,
+    copy_member,
+    get_chunk_name,
+    read_manifest,
+    recover_project_archive,
+)
+
+
+class LazyParquetFile(ParquetFile):
+    """ Saved project file loaded on demand.
+
+    Only file metadata stored in project manifest is available
+    initially, this is enough to display file variables and to
+    save the file again. Any data operation needs to be applied
+    on a file returned by 'get_file', file data is extracted from
+    the project archive on the first call.
+
+    Parquet file is not initialized, accessing an attribute which
+    is not defined on the lazy file raises 'AttributeError'.
+
+    Attributes & Parameters
+    -----------------------
+    id_ : int
+        File identifier.
+    file_name : str
+        File name.
+    file_type : str
+        Original results file type.
+    fingerprint : str
+        Hash identifying saved file content.
+    archive_path : Path
+        Project archive.
+    workdir : Path
+        A directory to extract file data.
+    members : dict of {str : str}
+        File archive members with their content hash.
+    table_metadata : dict of {str : dict}
+        Table metadata as stored in manifest.
+
+    """
+
+    # noinspection PyMissingConstructor
+    def __init__(
+        self,
+        id_: int,
+        file_name: str,
+        file_type: str,
+        fingerprint: str,
+        archive_path: Path,
+        workdir: Path,
+        members: Dict[str, str],
+        table_metadata: Dict[str, dict],
+    ):
+        self.id_ = id_
+        self.file_name = file_name
+        self.file_type = file_type
+        self.fingerprint = fingerprint
+        self.archive_path = archive_path
+        self.workdir = workdir
+        self.members = members
+        self.table_metadata = table_metadata
+        self._header_dfs = {}
+        self._file = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, item):
+        # called only for attributes not defined on lazy file
+        raise AttributeError(
+            f"'{type(self).__name__}' has no attribute '{item}', "
+            f"file data is available through 'get_file()'."
+        )
+
+    @property
+    def loaded(self) -> bool:
+        return self._file is not None
+
+    @property
+    def table_names(self) -> List[str]:
+        if self.loaded:
+            return self._file.table_names
+        return list(self.table_metadata.keys())
+
+    def is_header_simple(self, table: str) -> bool:
+        if self.loaded:
+            return self._file.is_header_simple(table)
+        return self.table_metadata[table]["simple"]
+
+    def can_convert_rate_to_energy(self, table: str) -> bool:
+        if self.loaded:
+            return can_convert_rate_to_energy(self._file, table)
+        return self.table_metadata[table]["rate_to_energy"]
+
+    def get_header_df(self, table: str) -> pd.DataFrame:
+        if self.loaded:
+            return self._file.get_header_df(table)
+        if table not in self._header_dfs:
+            metadata = self.table_metadata[table]
+            header_df = pd.DataFrame(**metadata["header"])
+            self._header_dfs[table] = header_df.set_index(metadata["index"])
+        return self._header_dfs[table]
+
+    def variable_exists(self, variable: VariableType) -> bool:
+        """ Check if variable is included in file, data is not loaded. """
+        if self.loaded:
+            return self._file.search_tree.variable_exists(variable)
+        if variable.table not in self.table_metadata:
+            return False
+        header_df = self.get_header_df(variable.table)
+        mask = header_df[KEY_LEVEL] == variable.key
+        mask &= header_df[UNITS_LEVEL] == variable.units
+        if not self.is_header_simple(variable.table):
+            mask &= header_df[TYPE_LEVEL] == variable.type
+        return bool(mask.any())
+
+    def rename(self, name: str) -> None:
+        self.file_name = name
+        if self.loaded:
+            self._file.rename(name)
+
+    def extract(self) -> Path:
+        """ Extract file data from project archive. """
+        with ZipFile(self.archive_path, mode="r") as zf:
+            for name, digest in self.members.items():
+                path = Path(self.workdir, name)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with zf.open(get_chunk_name(digest)) as src, open(path, "wb") as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        top_level = {Path(name).parts[0] for name in self.members}
+        return Path(self.workdir, top_level.pop())
+
+    def get_file(self) -> ParquetFile:
+        """ Get fully loaded file, data is extracted on first request. """
+        with self._lock:
+            if self._file is None:
+                file = ParquetFile.from_fs(self.extract())
+                file.id_ = self.id_
+                file.rename(self.file_name)
+                self._file = file
+                self._header_dfs.clear()
+            return self._file
+
+    def save_file_to_zip(self, zf: ZipFile, relative_to: Path, logger: BaseLogger) -> None:
+        """ Save file data, archived data of unloaded file is copied as is. """
+        if self.loaded:
+            # keep member names as stored in project archive
+            self._file.save_file_to_zip(zf, self.workdir, logger)
+            return
+        with ZipFile(self.archive_path, mode="r") as src:
+            for name, digest in self.members.items():
+                chunk_name = get_chunk_name(digest)
+                if isinstance(zf, ChunkWriter):
+                    zf.add_chunk(name, digest, partial(src.open, chunk_name))
+                else:
+                    copy_member(src, chunk_name, zf, name)
+
+    def clean_up(self) -> None:
+        """ Remove extracted file data. """
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def read_project_files(path: Path, workdir: Path) -> List[LazyParquetFile]:
+    """ Create lazy files from saved project manifest. """
+    recover_project_archive(path)
+    with ZipFile(path, mode="r") as zf:
+        manifest = read_manifest(zf)
+    if manifest is None:
+        raise ValueError(f"File '{path}' is not a valid project file.")
+    files = []
+    for id_, file in manifest["files"].items():
+        files.append(
+            LazyParquetFile(
+                int(id_),
+                file["file_name"],
+                file["file_type"],
+                file["fingerprint"],
+                path,
+                Path(workdir, f"project-{uuid1()}"),
+                file["members"],
+                file["tables"],
+            )
+        )
+    return files
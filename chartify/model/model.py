@@ -1,15 +1,20 @@
+import threading
 from pathlib import Path
-from typing import List, Union
-from zipfile import ZipFile
+from typing import List, Union, TYPE_CHECKING
 
-from PySide2.QtCore import QObject
-from esofile_reader.pqt.parquet_file import ParquetFile
-from esofile_reader.pqt.parquet_storage import ParquetStorage
+from PySide2.QtCore import QObject, Signal
 
 from chartify.charts.chart import Chart
 from chartify.charts.trace import Trace1D, Trace2D, TraceData
-from chartify.controller.file_processing import UiLogger
+from chartify.model.values_store import ValuesStore
 from chartify.settings import Settings
+from chartify.utils.instrumentation import instrument
+
+if TYPE_CHECKING:
+    from esofile_reader.pqt.parquet_file import ParquetFile
+    from esofile_reader.pqt.parquet_storage import ParquetStorage
+    from chartify.controller.progress_logging import UiLogger
+    from chartify.controller.project_saving import ProjectSaver
 
 
 class AppModel(QObject):
@@ -20,34 +25,74 @@ class AppModel(QObject):
     The database is being held in memory as it works
     as a standard python  dictionary at the moment.
 
+    File storage and project saver are created on first
+    use as results file libraries are slow to import.
+
+    Signals
+    -------
+    traceDataRemoved : list of str
+        Ids of trace data removed from the database.
+
     """
 
+    traceDataRemoved = Signal(list)
+
     def __init__(self):
         super().__init__()
         # ~~~~ File Database ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-        self.storage = ParquetStorage(workdir=Path(Settings.APP_TEMP_DIR, "storage"))
+        self._storage = None
 
         # ~~~~ WebView Database ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         self.wv_database = {"trace_data": [], "traces": [], "components": [], "items": {}}
+        self.values_store = ValuesStore(Path(Settings.APP_TEMP_DIR, "trace_data"))
 
         # ~~~~ Save Path ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         self.path = None
+        self._saver = None
+        self._saver_lock = threading.Lock()
+
+    @property
+    def storage(self) -> "ParquetStorage":
+        if self._storage is None:
+            from esofile_reader.pqt.parquet_storage import ParquetStorage
+
+            self._storage = ParquetStorage(workdir=Path(Settings.APP_TEMP_DIR, "storage"))
+        return self._storage
+
+    @storage.setter
+    def storage(self, storage: "ParquetStorage") -> None:
+        self._storage = storage
+
+    @property
+    def saver(self) -> "ProjectSaver":
+        # saver is also used from background threads
+        with self._saver_lock:
+            if self._saver is None:
+                from chartify.controller.project_saving import ProjectSaver
+
+                self._saver = ProjectSaver()
+            return self._saver
+
+    def get_file_lock(self, id_: int) -> threading.Lock:
+        """ Get a lock guarding file modifications against saving. """
+        return self.saver.get_file_lock(id_)
 
     @property
     def workdir(self):
         return self.storage.workdir
 
-    def save_to_zip(self, path: Path, logger: UiLogger) -> None:
-        with ZipFile(path, mode="w") as zf:
-            self.m.save_to_zip()
-            for pqf in self.m.files.values():
-                pqf.save_file_to_zip(zf, self.workdir, logger)
+    @instrument
+    def save_to_zip(
+        self, files: List["ParquetFile"], path: Path, logger: "UiLogger", dashboard: dict = None
+    ) -> None:
+        """ Save given files into project archive. """
+        self.saver.save(files, path, self.workdir, logger, dashboard=dashboard)
 
-    def get_file(self, id_: int) -> ParquetFile:
+    def get_file(self, id_: int) -> "ParquetFile":
         """ Get 'DatabaseFile for the given id. """
         return self.storage.files[id_]
 
-    def get_other_files(self) -> List[ParquetFile]:
+    def get_other_files(self) -> List["ParquetFile"]:
         """ Get all the other files than currently selected. """
         other_files = []
         for file in self.get_all_files():
@@ -55,14 +100,15 @@ class AppModel(QObject):
                 other_files.append(file)
         return other_files
 
-    def get_all_files(self) -> List[ParquetFile]:
+    def get_all_files(self) -> List["ParquetFile"]:
         """ Get all files of currently used type. """
         files = []
         for id_, file in self.storage.files.items():
             files.append(file)
         return files
 
-    def store_file(self, file: ParquetFile) -> int:
+    @instrument
+    def store_file(self, file: "ParquetFile") -> int:
         """ Store file in database. """
         try:
             return self.storage.store_file(file)
@@ -77,13 +123,32 @@ class AppModel(QObject):
         """ Get all used file names. """
         return [file.file_name for file in self.get_all_files()]
 
-    def delete_file(self, id_: int) -> None:
-        """ Delete file from the database. """
-        self.storage.delete_file(id_)
+    def delete_file(self, id_: int) -> bool:
+        """ Delete file from the database.
+
+        Restored trace data of the file which have not been fetched
+        yet cannot be fetched anymore so these are dropped together
+        with their traces. Returns 'True' when any trace got dropped.
+
+        """
+        file_name = self.get_file_name(id_)
+        with self.saver.get_file_lock(id_):
+            self.storage.delete_file(id_)
+        self.saver.forget_file(id_)
+        trace_data = [
+            trace_dt
+            for trace_dt in self.wv_database["trace_data"]
+            if not trace_dt.hydrated and trace_dt.ref and trace_dt.ref["column"][0] == file_name
+        ]
+        for trace in self.fetch_traces_referencing(trace_data):
+            self.wv_database["traces"].remove(trace)
+        self.remove_trace_data(trace_data)
+        return bool(trace_data)
 
     def rename_file(self, id_: int, name: str):
         """ Rename given file. """
-        self.storage.files[id_].rename(name)
+        with self.get_file_lock(id_):
+            self.storage.files[id_].rename(name)
 
     def fetch_all_components(self):
         """ Get all components. """
@@ -117,10 +182,11 @@ class AppModel(QObject):
 
     def fetch_trace_data(self, trace_data_id: str) -> TraceData:
         """ Get trace of a given id. """
-        for trace_data in self.wv_database["traces"]:
+        for trace_data in self.wv_database["trace_data"]:
             if trace_data.trace_data_id == trace_data_id:
                 return trace_data
 
+    @instrument
     def fetch_traces(self, item_id: str) -> List[Union[Trace1D, Trace2D]]:
         """ Get traces assigned for a given item. """
         traces = []
@@ -134,9 +200,43 @@ class AppModel(QObject):
         trace_data = []
         for trace_dt in self.wv_database["trace_data"]:
             if trace_dt.item_id == item_id:
-                trace_data.append(trace_data)
+                trace_data.append(trace_dt)
         return trace_data
 
+    @staticmethod
+    def get_trace_refs(trace: Union[Trace1D, Trace2D]) -> List[TraceData]:
+        """ Get trace data used by given trace. """
+        refs = [trace.x_ref, trace.y_ref] if isinstance(trace, Trace2D) else [trace.ref]
+        return [ref for ref in refs if isinstance(ref, TraceData)]
+
+    def fetch_traces_referencing(
+        self, trace_data: List[TraceData]
+    ) -> List[Union[Trace1D, Trace2D]]:
+        """ Get traces using any of given trace data. """
+        ids = {trace_dt.trace_data_id for trace_dt in trace_data}
+        return [
+            trace
+            for trace in self.wv_database["traces"]
+            if any(ref.trace_data_id in ids for ref in self.get_trace_refs(trace))
+        ]
+
+    def remove_trace_data(self, trace_data: List[TraceData]) -> None:
+        """ Remove trace data from database including stored values. """
+        for trace_dt in trace_data:
+            self.wv_database["trace_data"].remove(trace_dt)
+        if trace_data:
+            # listeners drop mapped arrays before their files are deleted
+            self.traceDataRemoved.emit([trace_dt.trace_data_id for trace_dt in trace_data])
+        for trace_dt in trace_data:
+            self.values_store.remove(trace_dt.trace_data_id)
+
+    def remove_unused_trace_data(self, item_id: str) -> None:
+        """ Remove trace data of given item which are not used by any trace. """
+        trace_data = self.fetch_traces_data(item_id)
+        used = self.fetch_traces_referencing(trace_data)
+        ids = {ref.trace_data_id for trace in used for ref in self.get_trace_refs(trace)}
+        self.remove_trace_data([t for t in trace_data if t.trace_data_id not in ids])
+
     def fetch_all_item_ids(self) -> List[str]:
         """ Get all used item ids. """
         return list(self.wv_database["items"].keys())
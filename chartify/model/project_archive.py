@@ -0,0 +1,235 @@
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, IO, Iterator, List, Optional, Set, Union
+from zipfile import ZipFile, ZipInfo, ZIP_STORED, BadZipFile
+
+CHUNK_SIZE = 1024 ** 2
+FORMAT_VERSION = 1
+CHUNKS_DIR = "chunks"
+MANIFEST_PREFIX = "manifest-"
+PENDING_SUFFIX = ".pending"
+
+# archive member name : content hash
+MembersType = Dict[str, str]
+
+
+def get_chunk_name(digest: str) -> str:
+    return f"{CHUNKS_DIR}/{digest}"
+
+
+def hash_file(path: Path) -> str:
+    """ Calculate content hash of a file. """
+    hasher = hashlib.sha1()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def copy_member(zf_in: ZipFile, name: str, zf_out: ZipFile, new_name: str) -> None:
+    """ Stream archive member into another archive. """
+    info = ZipInfo(new_name, date_time=zf_in.getinfo(name).date_time)
+    info.compress_type = ZIP_STORED
+    with zf_in.open(name) as src, zf_out.open(info, "w", force_zip64=True) as dst:
+        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+
+def get_manifest_names(zf: ZipFile) -> List[str]:
+    """ Get manifest member names, the last one is current. """
+    names = [n for n in zf.namelist() if n.startswith(MANIFEST_PREFIX)]
+    return sorted(names, key=lambda n: int(n[len(MANIFEST_PREFIX) : -len(".json")]))
+
+
+def read_manifest(zf: ZipFile) -> Optional[dict]:
+    """ Read current project manifest, returns 'None' for legacy archives. """
+    names = get_manifest_names(zf)
+    if names:
+        return json.loads(zf.read(names[-1]))
+
+
+def get_referenced_chunks(manifest: dict) -> Set[str]:
+    """ Get names of chunks used by manifest files. """
+    return {
+        get_chunk_name(digest)
+        for file in manifest["files"].values()
+        for digest in file["members"].values()
+    }
+
+
+def write_manifest(zf: ZipFile, manifest: dict) -> None:
+    names = get_manifest_names(zf)
+    n = int(names[-1][len(MANIFEST_PREFIX) : -len(".json")]) + 1 if names else 0
+    zf.writestr(f"{MANIFEST_PREFIX}{n}.json", json.dumps(manifest))
+
+
+def get_pending_path(path: Path) -> Path:
+    """ Get path of a file holding archive size before an unfinished save. """
+    return path.with_name(path.name + PENDING_SUFFIX)
+
+
+def sync_file(path: Path) -> None:
+    """ Make sure that file content is written on disk. """
+    with open(path, "rb+") as f:
+        os.fsync(f.fileno())
+
+
+def recover_project_archive(path: Path) -> bool:
+    """ Drop data appended by an interrupted save, returns 'True' if there was any. """
+    pending_path = get_pending_path(path)
+    if not pending_path.exists():
+        return False
+    try:
+        size = int(pending_path.read_text())
+    except ValueError:
+        # interrupted before appending started, archive is intact
+        pass
+    else:
+        with open(path, "rb+") as f:
+            f.truncate(size)
+            os.fsync(f.fileno())
+    pending_path.unlink()
+    return True
+
+
+def is_project_archive(path: Path) -> bool:
+    """ Check if given path is an archive with project manifest. """
+    try:
+        with ZipFile(path, mode="r") as zf:
+            return read_manifest(zf) is not None
+    except (FileNotFoundError, BadZipFile):
+        return False
+
+
+@contextlib.contextmanager
+def append_project_archive(path: Path) -> Iterator[ZipFile]:
+    """ Open project archive to append new members after its central directory.
+
+    Current central directory stays intact until new one is written
+    so the original archive size is all that's needed to restore it.
+    The size is kept in a 'pending' file until the save finishes.
+
+    """
+    size = path.stat().st_size
+    pending_path = get_pending_path(path)
+    pending_path.write_text(str(size))
+    sync_file(pending_path)
+    try:
+        with ZipFile(path, mode="a", compression=ZIP_STORED, allowZip64=True) as zf:
+            zf.start_dir = size
+            yield zf
+            # new members need to be on disk before being referenced
+            zf.fp.flush()
+            os.fsync(zf.fp.fileno())
+        sync_file(path)
+    except BaseException:
+        recover_project_archive(path)
+        raise
+    pending_path.unlink()
+
+
+@contextlib.contextmanager
+def create_project_archive(path: Path) -> Iterator[ZipFile]:
+    """ Write new project archive, existing file is replaced once finished. """
+    temp_path = path.with_name(path.name + ".tmp")
+    try:
+        with ZipFile(temp_path, mode="w", compression=ZIP_STORED, allowZip64=True) as zf:
+            yield zf
+        sync_file(temp_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    os.replace(temp_path, path)
+
+
+@contextlib.contextmanager
+def open_project_archive(path: Path) -> Iterator[ZipFile]:
+    """ Open existing project archive to be appended or create a new one.
+
+    Interrupted save leaves the archive in its previous state,
+    either immediately or on the next access through
+    'recover_project_archive'.
+
+    """
+    recover_project_archive(path)
+    if is_project_archive(path):
+        with append_project_archive(path) as zf:
+            yield zf
+    else:
+        with create_project_archive(path) as zf:
+            yield zf
+
+
+class ChunkWriter:
+    """ Zip file like target writing members as project archive chunks.
+
+    Files are saved calling 'write' or 'writestr' as they would
+    on a 'ZipFile'. Content of each member is hashed and written
+    straight into the project archive unless a chunk with the same
+    content is already there.
+
+    Writers of files saved in parallel share the project archive,
+    names of its members and a lock guarding the archive.
+
+    Attributes & Parameters
+    -----------------------
+    zf : ZipFile
+        Project archive opened for writing.
+    existing : set of str
+        Names of project archive members.
+    lock : threading.Lock
+        A lock held while writing into project archive.
+
+    Attributes
+    ----------
+    members : dict of {str : str}
+        Written members with their content hash.
+    n_written : int
+        Number of chunks added into project archive.
+
+    """
+
+    def __init__(self, zf: ZipFile, existing: Set[str], lock: threading.Lock):
+        self.zf = zf
+        self.existing = existing
+        self.lock = lock
+        self.members = {}
+        self.n_written = 0
+
+    def write(self, filename: Union[str, Path], arcname: Optional[str] = None, *args) -> None:
+        # use zip file name normalization so member names match
+        info = ZipInfo.from_file(filename, arcname)
+        if info.is_dir():
+            return
+        digest = hash_file(Path(filename))
+        self.add_chunk(info.filename, digest, lambda: open(filename, "rb"))
+
+    def writestr(self, zinfo_or_arcname: Union[str, ZipInfo], data: Union[str, bytes], *args):
+        if isinstance(zinfo_or_arcname, ZipInfo):
+            name = zinfo_or_arcname.filename
+        else:
+            name = zinfo_or_arcname
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = hashlib.sha1(data).hexdigest()
+        self.add_chunk(name, digest, lambda: BytesIO(data))
+
+    def add_chunk(self, name: str, digest: str, open_source: Callable[[], IO[bytes]]) -> None:
+        """ Register file member, content is written only if not stored yet. """
+        self.members[name] = digest
+        chunk_name = get_chunk_name(digest)
+        with self.lock:
+            if chunk_name in self.existing:
+                return
+            info = ZipInfo(chunk_name, date_time=time.localtime()[:6])
+            info.compress_type = ZIP_STORED
+            with open_source() as src, self.zf.open(info, "w", force_zip64=True) as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            self.existing.add(chunk_name)
+            self.n_written += 1
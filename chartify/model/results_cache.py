@@ -0,0 +1,144 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Hashable, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MAX_SIZE = 256 * 1024 ** 2
+
+CacheKey = Tuple[int, str, FrozenSet[Hashable], str, str, str, bool]
+
+
+class ResultsCache:
+    """ Memory bounded LRU cache for results tables.
+
+    Tables are evicted from the least recently used one
+    when total size exceeds 'max_size' bytes. Cache is
+    accessed from multiple threads when results are fetched
+    in parallel so all operations are guarded by a lock.
+
+    Attributes & Parameters
+    -----------------------
+    max_size : int
+        Maximum total size of stored tables in bytes.
+    hits : int
+        Number of successful look ups.
+    misses : int
+        Number of unsuccessful look ups.
+    evictions : int
+        Number of tables dropped to satisfy size limit.
+
+    """
+
+    def __init__(self, max_size: int = MAX_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._tables = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._tables)
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._tables
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @staticmethod
+    def create_key(
+        file_id: int,
+        table: str,
+        variables: FrozenSet[Hashable],
+        units_system: str,
+        rate_units: str,
+        energy_units: str,
+        rate_to_energy: bool,
+    ) -> CacheKey:
+        """ Create hashable key identifying a results table. """
+        return (
+            file_id,
+            table,
+            frozenset(variables),
+            units_system,
+            rate_units,
+            energy_units,
+            rate_to_energy,
+        )
+
+    @staticmethod
+    def get_table_size(df: pd.DataFrame) -> int:
+        """ Get memory size of given table in bytes. """
+        return int(df.memory_usage(deep=True, index=True).sum())
+
+    def get(self, key: CacheKey) -> Optional[pd.DataFrame]:
+        """ Get stored table copy, returns 'None' when not available. """
+        with self._lock:
+            try:
+                df, _ = self._tables[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._tables.move_to_end(key)
+            self.hits += 1
+            return df.copy()
+
+    def put(self, key: CacheKey, df: pd.DataFrame) -> None:
+        """ Store table copy, tables bigger than size limit are ignored. """
+        size = self.get_table_size(df)
+        if size > self.max_size:
+            return
+        with self._lock:
+            self._pop(key)
+            self._tables[key] = (df.copy(), size)
+            self._size += size
+            while self._size > self.max_size:
+                self._pop(next(iter(self._tables)))
+                self.evictions += 1
+
+    def _pop(self, key: CacheKey) -> None:
+        if key in self._tables:
+            _, size = self._tables.pop(key)
+            self._size -= size
+
+    def invalidate_file(self, file_id: int) -> None:
+        """ Drop all tables of given file. """
+        with self._lock:
+            for key in [k for k in self._tables if k[0] == file_id]:
+                self._pop(key)
+        logger.debug("Results cache invalidated for file id '%s'. %s", file_id, self)
+
+    def clear(self) -> None:
+        """ Drop all stored tables and reset statistics. """
+        with self._lock:
+            self._tables.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """ Get cache usage statistics. """
+        return {
+            "tables": len(self._tables),
+            "size": self._size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __repr__(self):
+        stats = self.get_stats()
+        return (
+            f"ResultsCache(tables={stats['tables']}, "
+            f"size={stats['size'] / 1024 ** 2:.1f}/{stats['max_size'] / 1024 ** 2:.0f} MB, "
+            f"hits={stats['hits']}, misses={stats['misses']}, evictions={stats['evictions']})"
+        )
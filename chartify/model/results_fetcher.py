@@ -0,0 +1,87 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+
+import pandas as pd
+
+from chartify.utils.instrumentation import instrument
+
+if TYPE_CHECKING:
+    from chartify.ui.widgets.treeview_model import ViewModel, VV
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 8
+
+
+class ResultsFetcher:
+    """ Fetch results from multiple view models concurrently.
+
+    Reading results is mostly I/O bound as each file reads
+    its own parquets so requests are distributed on a thread
+    pool with capped number of workers.
+
+    Attributes & Parameters
+    -----------------------
+    max_workers : int
+        Maximum number of simultaneous requests.
+
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.max_workers = max_workers
+        self._executor = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="results"
+            )
+        return self._executor
+
+    def iter_results(
+        self,
+        models: List["ViewModel"],
+        view_variables: List["VV"],
+        **units_kwargs: Union[str, bool],
+    ) -> Iterator[Tuple[int, Optional[pd.DataFrame]]]:
+        """ Yield model position and its results as soon as they are available. """
+        if len(models) == 1:
+            # avoid thread overhead for a single request
+            yield 0, models[0].get_results(view_variables, **units_kwargs)
+        else:
+            futures = {
+                self.executor.submit(model.get_results, view_variables, **units_kwargs): i
+                for i, model in enumerate(models)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    @instrument
+    def fetch(
+        self,
+        models: List["ViewModel"],
+        view_variables: List["VV"],
+        **units_kwargs: Union[str, bool],
+    ) -> Optional[pd.DataFrame]:
+        """ Get results from all models, frames are ordered as given models. """
+        start = time.perf_counter()
+        frames = [None] * len(models)
+        for i, df in self.iter_results(models, view_variables, **units_kwargs):
+            frames[i] = df
+        frames = [df for df in frames if df is not None]
+        df = pd.concat(frames, axis=1, sort=False, copy=False) if frames else None
+        wall_time = time.perf_counter() - start
+        logger.info("Fetched results from %d models in %.3f s.", len(models), wall_time)
+        if models and logger.isEnabledFor(logging.DEBUG):
+            # results cache is shared by all view models
+            logger.debug("%s", models[0].RESULTS_CACHE)
+        return df
+
+    def shutdown(self) -> None:
+        """ Release worker threads. """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
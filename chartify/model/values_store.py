@@ -0,0 +1,91 @@
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MAX_HOT = 64
+
+
+class ValuesStore:
+    """ Keep trace values on disk instead of python lists.
+
+    Arrays are stored as '.npy' files in the application
+    workdir and read back using memory map, so only recently
+    used arrays are held in memory. Values are converted into
+    python lists only when requested (when a chart gets
+    serialized).
+
+    Ids of stored arrays are tracked in memory so membership
+    checks do not hit the file system.
+
+    Attributes & Parameters
+    -----------------------
+    workdir : Path
+        A directory to store arrays.
+    max_hot : int
+        Maximum number of arrays kept in memory.
+
+    """
+
+    def __init__(self, workdir: Path, max_hot: int = MAX_HOT):
+        self.workdir = workdir
+        self.max_hot = max_hot
+        self._hot = OrderedDict()
+        self._ids = set()
+        self._lock = threading.RLock()
+
+    def __contains__(self, id_: str) -> bool:
+        return id_ in self._ids
+
+    def get_path(self, id_: str) -> Path:
+        return Path(self.workdir, f"{id_}.npy")
+
+    def put(self, id_: str, values: Iterable[float]) -> None:
+        """ Store given values. """
+        import numpy as np
+
+        with self._lock:
+            # drop previously mapped array of the same id
+            self._hot.pop(id_, None)
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        np.save(self.get_path(id_), np.asarray(values, dtype=np.float64), allow_pickle=False)
+        with self._lock:
+            self._ids.add(id_)
+
+    def get_array(self, id_: str) -> "np.ndarray":
+        """ Get read only array of stored values. """
+        with self._lock:
+            try:
+                self._hot.move_to_end(id_)
+                return self._hot[id_]
+            except KeyError:
+                import numpy as np
+
+                array = np.load(self.get_path(id_), mmap_mode="r", allow_pickle=False)
+                self._hot[id_] = array
+                if len(self._hot) > self.max_hot:
+                    self._hot.popitem(last=False)
+                return array
+
+    def get_values(self, id_: str) -> List[float]:
+        """ Get stored values as a list. """
+        return self.get_array(id_).tolist()
+
+    def remove(self, id_: str) -> None:
+        """ Delete stored values. """
+        with self._lock:
+            self._hot.pop(id_, None)
+            self._ids.discard(id_)
+        self.get_path(id_).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """ Delete all stored values. """
+        with self._lock:
+            self._hot.clear()
+            self._ids.clear()
+        if self.workdir.exists():
+            for path in self.workdir.glob("*.npy"):
+                path.unlink(missing_ok=True)
@@ -27,10 +27,12 @@ class Settings:
 
     SOURCE_ICONS_DIR = Path(ROOT, "resources/icons/")
     SETTINGS_PATH = Path(Path.home(), ".chartify", "settings.json")
+    ICONS_CACHE_DIR = Path(Path.home(), ".chartify", "icons")
 
     APP_TEMP_DIR = Path(tempfile.gettempdir(), "chartify")
 
-    EXTENSIONS = [".csv", ".xlsx", ".eso", ".cfs"]
+    PROJECT_EXTENSION = ".cfs"
+    EXTENSIONS = [".csv", ".xlsx", ".eso", PROJECT_EXTENSION]
 
     IP_ENERGY_UNITS = ["Btu", "kBbtu", "MBtu"]
     IP_POWER_UNITS = ["Btu/h", "kBtu/h", "MBtu/h", "W"]
@@ -67,6 +69,9 @@ class Settings:
     MIRRORED = None
     SPLIT = None
 
+    USE_DATA_SERVER = False
+    DATA_SERVER_PORT = 0
+
     _EXCLUDE = [
         "_EXCLUDE",
         "ROOT",
@@ -80,6 +85,7 @@ class Settings:
         "ICON_MEDIUM_SIZE",
         "ICON_LARGE_SIZE",
         "SETTINGS_PATH",
+        "ICONS_CACHE_DIR",
         "APP_TEMP_DIR",
     ]
 
@@ -1,10 +1,12 @@
 import json
 import re
 import traceback
+from collections import namedtuple
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple, Dict, Union, Iterable, Optional, List
+from typing import Tuple, Dict, Union, Iterable, Optional, List, Pattern
 
-from chartify.ui.icon_painter import Pixmap
+from chartify.ui.icon_cache import IconCache
 
 
 class InvalidRangeError(Exception):
@@ -151,6 +153,111 @@ class Palette:
         return dct
 
 
+@lru_cache(maxsize=None)
+def get_line_pattern(color_key: str) -> Pattern:
+    """ Get compiled pattern to match a line with color. """
+    return re.compile(rf"(.*){color_key}\s?#?(\d\d)?;?")
+
+
+@lru_cache(maxsize=None)
+def get_url_pattern(color_key: str) -> Pattern:
+    """ Get compiled pattern to match a line with url. """
+    return re.compile(rf"(.*)URL\((.*?)\)\s?#{color_key}\s?#?(\d\d)?;")
+
+
+ColorPlaceholder = namedtuple("ColorPlaceholder", "prop color_key opacity")
+IconPlaceholder = namedtuple("IconPlaceholder", "prop url color_key opacity")
+PaletteBundle = namedtuple("PaletteBundle", "name css icon_paths")
+
+
+class CssTemplate:
+    """ Precompiled css source.
+
+    Source css lines are split into literal segments and
+    placeholders for palette colors and repainted icons,
+    so rendering a palette is a single join.
+
+    Attributes & Parameters
+    -----------------------
+    segments : list of {str, ColorPlaceholder, IconPlaceholder}
+        Literal css segments and placeholders.
+    color_keys : list of str
+        Palette color keys the template has been compiled for.
+
+    """
+
+    def __init__(
+        self,
+        segments: List[Union[str, ColorPlaceholder, IconPlaceholder]],
+        color_keys: List[str],
+    ):
+        self.segments = segments
+        self.color_keys = color_keys
+
+    def __repr__(self):
+        n_placeholders = sum(1 for seg in self.segments if not isinstance(seg, str))
+        return f"CssTemplate(segments={len(self.segments)}, placeholders={n_placeholders})"
+
+    @classmethod
+    def compile(cls, source_css: Iterable[str], color_keys: List[str]) -> "CssTemplate":
+        """ Split given css lines into literals and placeholders. """
+        segments = []
+        literal = []
+        for line in source_css:
+            color_key = next((k for k in color_keys if k in line), None)
+            if color_key is None:
+                literal.append(line)
+                continue
+            if literal:
+                segments.append("".join(literal))
+                literal = []
+            if "URL" in line or "url" in line:
+                prop, url, opacity = CssParser.parse_url(line, color_key)
+                segments.append(IconPlaceholder(prop, url, color_key, opacity))
+            else:
+                prop, opacity = get_line_pattern(color_key).findall(line)[0]
+                segments.append(ColorPlaceholder(prop, color_key, opacity))
+        if literal:
+            segments.append("".join(literal))
+        return cls(segments, color_keys)
+
+    @classmethod
+    def from_files(cls, css_paths: List[Path], color_keys: List[str]) -> "CssTemplate":
+        """ Compile given css files into a single template. """
+        lines = []
+        for path in sorted(css_paths):
+            with open(path, "r") as f:
+                lines.extend(f.readlines())
+        return cls.compile(lines, color_keys)
+
+    def render(
+        self, palette: Palette, source_icons_dir: Path, dest_icons_dir: Path
+    ) -> Tuple[str, List[str]]:
+        """ Create css for given palette. """
+        icon_cache = IconCache.for_dir(dest_icons_dir)
+        colors = {}
+        parts = []
+        icon_paths = []
+        for seg in self.segments:
+            if isinstance(seg, str):
+                parts.append(seg)
+            elif isinstance(seg, ColorPlaceholder):
+                key = (seg.color_key, seg.opacity)
+                if key not in colors:
+                    rgb = palette.get_color_tuple(seg.color_key)
+                    rgb = rgb if not seg.opacity else (*rgb, perc_to_float(seg.opacity))
+                    colors[key] = string_rgb(rgb)
+                parts.append(f"{seg.prop}{colors[key]};\n")
+            else:
+                rgb = palette.get_color_tuple(seg.color_key)
+                rgb = (*rgb, seg.opacity) if seg.opacity else rgb
+                source_path = Path(source_icons_dir, seg.url)
+                dest_path = icon_cache.get_path(source_path, *rgb)
+                parts.append(f"{seg.prop}url({dest_path});\n")
+                icon_paths.append(dest_path)
+        return "".join(parts), icon_paths
+
+
 class CssParser:
     """ A class used to parse input css.
 
@@ -158,27 +265,30 @@ class CssParser:
     images with URL annotation will be parsed.
 
     Icons defined as: URL(some/path)#PRIMARY_COLOR#20
-    will be repainted using given 'palette' color.
+    will be repainted using given 'palette' color, repainted
+    icons are shared through 'IconCache' of destination dir.
 
     Note that 'parse_css_files' needs to be called
-    to process given css files.
+    to process given css files. Css files are compiled
+    into 'CssTemplate' only once, subsequent calls only
+    render the template.
 
     """
 
+    _TEMPLATES = {}
+
     @classmethod
     def parse_line(cls, line: str, color_key: str, rgb: Tuple[int, int, int]) -> str:
         """ Get a color string or tuple. """
-        pattern = rf"(.*){color_key}\s?#?(\d\d)?;?"
-        prop, opacity = re.findall(pattern, line)[0]
+        prop, opacity = get_line_pattern(color_key).findall(line)[0]
         rgb = rgb if not opacity else (*rgb, perc_to_float(opacity))
         return f"{prop}{string_rgb(rgb)};\n"
 
     @classmethod
     def parse_url(cls, line: str, color_key: str) -> Tuple[str, str, Optional[float]]:
         """ Parse a line with an url. """
-        pattern = rf"(.*)URL\((.*?)\)\s?#{color_key}\s?#?(\d\d)?;"
         try:
-            tup = re.findall(pattern, line)
+            tup = get_url_pattern(color_key).findall(line)
             prop, url, opacity = tup[0]
             opacity = perc_to_float(opacity) if opacity else None
         except IndexError:
@@ -199,7 +309,7 @@ class CssParser:
         prop, url, opacity = cls.parse_url(line, color_key)
         source_path = Path(source_icons_dir, url)
         rgb = (*rgb, opacity) if opacity else rgb
-        dest_path = Pixmap.repaint_icon(source_path, dest_icons_dir, *rgb)
+        dest_path = IconCache.for_dir(dest_icons_dir).get_path(source_path, *rgb)
         return f"{prop}url({dest_path});\n", dest_path
 
     @classmethod
@@ -211,21 +321,25 @@ class CssParser:
         dest_icons_dir: Path,
     ) -> Tuple[str, List[str]]:
         """ Parse given css file. """
-        css = ""
-        icon_paths = []
-        for line in source_css:
-            if any(map(lambda x: x in line, palette.COLORS)):
-                color_key = next(k for k in palette.COLORS if k in line)
-                rgb = palette.get_color_tuple(color_key)
-                if "URL" in line or "url" in line:
-                    line, icon_path = cls.parse_url_line(
-                        line, color_key, rgb, source_icons_dir, dest_icons_dir
-                    )
-                    icon_paths.append(icon_path)
-                else:
-                    line = cls.parse_line(line, color_key, rgb)
-            css += line
-        return css, icon_paths
+        template = CssTemplate.compile(source_css, palette.COLORS)
+        return template.render(palette, source_icons_dir, dest_icons_dir)
+
+    @classmethod
+    def get_template(
+        cls, css_paths_or_dir: Union[Path, List[Path]], color_keys: List[str]
+    ) -> CssTemplate:
+        """ Get compiled template, template is compiled again only when files change. """
+        if isinstance(css_paths_or_dir, list):
+            css_paths = sorted(css_paths_or_dir)
+        else:
+            css_paths = sorted(p for p in css_paths_or_dir.iterdir() if p.suffix == ".css")
+        key = (
+            tuple((path, path.stat().st_mtime_ns) for path in css_paths),
+            tuple(color_keys),
+        )
+        if key not in cls._TEMPLATES:
+            cls._TEMPLATES[key] = CssTemplate.from_files(css_paths, color_keys)
+        return cls._TEMPLATES[key]
 
     @classmethod
     def parse_css_files(
@@ -236,16 +350,5 @@ class CssParser:
         dest_icons_dir: Path,
     ) -> Tuple[str, List[str]]:
         """ Read and parse given css paths. """
-        if isinstance(css_paths_or_dir, list):
-            css_paths = css_paths_or_dir
-        else:
-            css_paths = [path for path in css_paths_or_dir.iterdir() if path.suffix == ".css"]
-        css_paths.sort()
-        all_css = ""
-        all_icon_paths = []
-        for path in css_paths:
-            with open(path, "r") as f:
-                css, icon_paths = cls.parse_css(f, palette, source_icons_dir, dest_icons_dir)
-                all_css += css
-                all_icon_paths.extend(icon_paths)
-        return all_css, all_icon_paths
+        template = cls.get_template(css_paths_or_dir, palette.COLORS)
+        return template.render(palette, source_icons_dir, dest_icons_dir)
@@ -0,0 +1,156 @@
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Tuple, Union
+
+from PySide2.QtGui import QImage, QPixmap
+
+from chartify.ui.icon_painter import Pixmap
+
+logger = logging.getLogger(__name__)
+
+IconKey = Tuple[str, int, int, int, float]
+
+
+class IconCache:
+    """ Persistent storage of repainted icons.
+
+    Repainted icons are stored as .PNG files named by the
+    content hash of the source icon and requested color so
+    the same icon is rendered only once, no matter how many
+    application sessions or palette switches happen.
+
+    Instances are shared per cache directory, use 'for_dir'
+    class method to get one.
+
+    Attributes & Parameters
+    -----------------------
+    cache_dir : Path
+        A directory where repainted icons are stored.
+    hits : int
+        Number of requests served from memory or disk.
+    misses : int
+        Number of requests which required icon to be repainted.
+
+    """
+
+    _INSTANCES = {}
+    _INSTANCES_LOCK = threading.Lock()
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self._hashes = {}
+        self._pixmaps = {}
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return f"IconCache(cache_dir={self.cache_dir}, hits={self.hits}, misses={self.misses})"
+
+    @classmethod
+    def for_dir(cls, cache_dir: Union[str, Path]) -> "IconCache":
+        """ Get cache instance shared by all users of given directory. """
+        cache_dir = Path(cache_dir)
+        with cls._INSTANCES_LOCK:
+            if cache_dir not in cls._INSTANCES:
+                cls._INSTANCES[cache_dir] = cls(cache_dir)
+            return cls._INSTANCES[cache_dir]
+
+    @staticmethod
+    def create_name(key: IconKey) -> str:
+        """ Create cached icon file name. """
+        digest, r, g, b, a = key
+        return f"{digest}-{r}-{g}-{b}-{float(a)}.png"
+
+    def hash_icon(self, source_path: Path) -> str:
+        """ Get content hash of the source icon. """
+        stat = source_path.stat()
+        stamp = (source_path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            try:
+                return self._hashes[stamp]
+            except KeyError:
+                digest = hashlib.sha1(source_path.read_bytes()).hexdigest()
+                self._hashes[stamp] = digest
+                return digest
+
+    def create_key(
+        self, source_path: Path, r: int = 0, g: int = 0, b: int = 0, a: float = 1
+    ) -> IconKey:
+        """ Create icon identifier. """
+        if not source_path.exists():
+            raise FileNotFoundError(f"Cannot find url: '{source_path}'!")
+        return self.hash_icon(source_path), r, g, b, a
+
+    def render(self, source_path: Path, key: IconKey) -> Path:
+        """ Repaint source icon and store it in cache directory. """
+        _, r, g, b, a = key
+        dest_path = Path(self.cache_dir, self.create_name(key))
+        img = QImage(str(source_path))
+        if not (r == 0 and g == 0 and b == 0 and a == 1):
+            img = Pixmap.repaint_image(img, r, g, b, a)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # write into temporary file first so partially written icon is never used
+        temp_path = dest_path.with_name(f"{dest_path.stem}-{threading.get_ident()}.tmp")
+        if not img.save(str(temp_path), "PNG"):
+            raise IOError(f"Cannot save icon '{dest_path}'.")
+        os.replace(temp_path, dest_path)
+        logger.debug("Rendered icon '%s' as '%s'.", source_path.name, dest_path.name)
+        return dest_path
+
+    def get_path(
+        self, source_path: Path, r: int = 0, g: int = 0, b: int = 0, a: float = 1
+    ) -> str:
+        """ Get path of repainted icon, icon is rendered only when not cached. """
+        key = self.create_key(source_path, r, g, b, a)
+        dest_path = Path(self.cache_dir, self.create_name(key))
+        with self._lock:
+            if dest_path.exists():
+                self.hits += 1
+                return str(dest_path)
+            self.misses += 1
+        return str(self.render(source_path, key))
+
+    def get_pixmap(
+        self, source_path: Path, r: int = 0, g: int = 0, b: int = 0, a: float = 1
+    ) -> QPixmap:
+        """ Get repainted icon as pixmap. """
+        key = self.create_key(source_path, r, g, b, a)
+        with self._lock:
+            if key in self._pixmaps:
+                self.hits += 1
+                return self._pixmaps[key]
+        pixmap = QPixmap(self.get_path(source_path, r, g, b, a))
+        with self._lock:
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+    def get_stats(self) -> Dict[str, Union[int, float]]:
+        """ Get cache usage statistics. """
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "n_pixmaps": len(self._pixmaps),
+        }
+
+    def reset_stats(self) -> None:
+        """ Reset hit and miss counters. """
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def clear(self) -> None:
+        """ Remove all cached icons. """
+        with self._lock:
+            self._pixmaps.clear()
+            self._hashes.clear()
+            if self.cache_dir.exists():
+                for path in self.cache_dir.iterdir():
+                    if path.suffix in (".png", ".tmp"):
+                        path.unlink()
+            self.reset_stats()
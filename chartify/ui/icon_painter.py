@@ -36,17 +36,29 @@ class Pixmap(QPixmap):
         f.close()
         return f.fileName()
 
+    @staticmethod
+    def repaint_image(img: QImage, r: int, g: int, b: int, a: float) -> QImage:
+        """ Get image with all non-transparent pixels painted with given color. """
+        # numpy is not needed when icons are read from cache
+        import numpy as np
+
+        w, h = img.width(), img.height()
+        argb = img.convertToFormat(QImage.Format_ARGB32)
+        pixels = np.frombuffer(argb.constBits(), dtype=np.uint32, count=w * h)
+        alpha = pixels >> 24
+        if img.hasAlphaChannel():
+            # match QColor floating point alpha (16 bit channel) truncated to integer
+            new_alpha = np.trunc(alpha * 257 / 65535 * 255 * a).astype(np.uint32)
+        else:
+            new_alpha = np.full(pixels.shape, 255, dtype=np.uint32)
+        color = np.uint32((r << 16) | (g << 8) | b)
+        new_pixels = np.where(alpha > 0, (new_alpha << 24) | color, pixels).astype(np.uint32)
+        new_img = QImage(new_pixels.tobytes(), w, h, 4 * w, QImage.Format_ARGB32).copy()
+        return new_img.convertToFormat(img.format())
+
     def repaint(self, r: int, g: int, b: int, a: float) -> None:
         """ Repaint all non-transparent pixels with given color. """
-        img = QImage(self.toImage())
-        for x in range(img.width()):
-            for y in range(img.height()):
-                col = img.pixelColor(x, y)
-                r1, g1, b1, f = col.getRgbF()
-                new_col = QColor(r, g, b, f * 255 * a)
-                if f > 0:
-                    img.setPixelColor(x, y, new_col)
-        self.convertFromImage(img)
+        self.convertFromImage(self.repaint_image(self.toImage(), r, g, b, a))
 
 
 def text_to_pixmap(text: str, font: QFont, color: QColor, size: QSize = None) -> QPixmap:
@@ -1,14 +1,23 @@
 import contextlib
 import ctypes
-import shutil
+import logging
+import time
 from functools import partial
 from pathlib import Path
-from typing import Optional, Tuple, List, Union, Set, Dict
-
-import pandas as pd
-from PySide2.QtCore import QSize, Qt, QCoreApplication, Signal, QPoint, QTimer, QModelIndex
-from PySide2.QtGui import QIcon, QKeySequence, QColor
-from PySide2.QtWebEngineWidgets import QWebEngineView
+from typing import Optional, Tuple, List, Union, Set, Dict, ContextManager, TYPE_CHECKING
+
+from PySide2.QtCore import (
+    QSize,
+    Qt,
+    QCoreApplication,
+    Signal,
+    Slot,
+    QPoint,
+    QTimer,
+    QModelIndex,
+    QThreadPool,
+)
+from PySide2.QtGui import QIcon, QKeySequence, QColor, QPixmap
 from PySide2.QtWidgets import (
     QWidget,
     QSplitter,
@@ -27,28 +36,35 @@ from PySide2.QtWidgets import (
     QVBoxLayout,
     QStackedWidget,
 )
-from esofile_reader.convertor import all_rate_or_energy
-from esofile_reader.df.level_names import *
-from esofile_reader.pqt.parquet_storage import ParquetStorage, ParquetFile
 
+from chartify.controller.threads import Worker
 from chartify.settings import Settings, OutputType
 from chartify.ui.widgets.buttons import MenuButton
-from chartify.ui.css_theme import Palette, CssParser
+from chartify.ui.css_theme import Palette, CssParser, PaletteBundle
 from chartify.ui.widgets.dialogs import ConfirmationDialog, SingleInputDialog, DoubleInputDialog
 from chartify.ui.widgets.drop_frame import DropFrame
-from chartify.ui.icon_painter import Pixmap, draw_filled_circle_icon
+from chartify.ui.icon_cache import IconCache
+from chartify.ui.icon_painter import draw_filled_circle_icon
 from chartify.ui.widgets.progress_widget import ProgressContainer
 from chartify.ui.widgets.stacked_widget import StackedWidget
 from chartify.ui.widgets.tab_widget import TabWidget
 from chartify.ui.toolbar import Toolbar
-from chartify.ui.widgets.treeview import TreeView, ViewMask, ViewType
-from chartify.ui.widgets.treeview_model import (
-    ViewModel,
+from chartify.ui.widgets.view_variable import (
+    VV,
     is_variable_attr_identical,
     stringify_view_variable,
-    VV,
-    PROXY_UNITS_LEVEL,
 )
+from chartify.utils.instrumentation import instrument
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from PySide2.QtWebEngineWidgets import QWebEngineView
+    from esofile_reader.pqt.parquet_file import ParquetFile
+    from chartify.model.results_fetcher import ResultsFetcher
+    from chartify.ui.widgets.treeview import TreeView
+    from chartify.ui.widgets.treeview_model import ViewModel, PreparedModel
+
+logger = logging.getLogger(__name__)
 
 
 # noinspection PyPep8Naming,PyUnresolvedReferences
@@ -63,7 +79,7 @@ class MainWindow(QMainWindow):
     tabChanged = Signal(int)
     treeNodeUpdated = Signal(str)
     selectionChanged = Signal(list)
-    variableRenameRequested = Signal(list, VV, VV)
+    variableRenameRequested = Signal(list, object, object)
     variableRemoveRequested = Signal(list, list)
     aggregationRequested = Signal(list, str, list, str, str)
     fileProcessingRequested = Signal(list)
@@ -74,6 +90,21 @@ class MainWindow(QMainWindow):
 
     _CLOSE_FLAG = False
 
+    # icons painted using 'PRIMARY_TEXT_COLOR' and 'SECONDARY_TEXT_COLOR'
+    PRIMARY_ICONS = [
+        "file.png",
+        "save.png",
+        "help.png",
+        "remove.png",
+        "add_file.png",
+        "drop_file.png",
+        "sigma.png",
+        "mean.png",
+        "pen.png",
+    ]
+    SECONDARY_ICONS = ["plain_view.png", "tree_view.png", "unfold_less.png", "unfold_more.png"]
+    DISABLED_ICON_OPACITY = 0.6
+
     def __init__(self):
         super().__init__()
         # ~~~~ Main Window setup ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -258,6 +289,18 @@ class MainWindow(QMainWindow):
         self.timer = QTimer()
         self.timer.setSingleShot(True)
 
+        # ~~~~ Background view model preparation ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        self.thread_pool = QThreadPool()
+        # views being prepared by their worker signals
+        self._preparing_views = {}
+
+        # ~~~~ Source file locks ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # files are shared with background jobs and saving, see 'lock_file'
+        self.file_lock_factory = None
+
+        # ~~~~ Results ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        self._results_fetcher = None
+
         # ~~~~ Right hand area ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         self.right_main_wgt = QWidget(self.central_splitter)
         right_side_policy = QSizePolicy()
@@ -279,8 +322,8 @@ class MainWindow(QMainWindow):
         self.main_chart_widget.setMinimumWidth(600)
         self.right_main_layout.addWidget(self.main_chart_widget)
 
-        self.web_view = QWebEngineView(self)
-        self.main_chart_layout.addWidget(self.web_view)
+        # web engine is loaded on first use, see 'create_web_view'
+        self.web_view = None
 
         # ~~~~ Status bar ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         self.status_bar = QStatusBar(self)
@@ -293,6 +336,8 @@ class MainWindow(QMainWindow):
         # ~~~~ Palettes ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         self.palettes = Palette.parse_palettes(Settings.PALETTE_PATH)
         Settings.PALETTE = self.palettes[Settings.PALETTE_NAME]
+        # css and icons for each palette, populated by 'prerender_palettes'
+        self.palette_bundles: Dict[str, PaletteBundle] = {}
 
         # ~~~~ Scheme button ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         actions, default_action = self.create_scheme_actions()
@@ -362,23 +407,47 @@ class MainWindow(QMainWindow):
         self.connect_view_tools_signals()
         self.connect_toolbar_signals()
 
+    def create_web_view(self) -> "QWebEngineView":
+        """ Create chart area web view, web engine is loaded on the first call. """
+        if self.web_view is None:
+            from chartify.ui.widgets.web_view import create_web_view
+
+            self.web_view = create_web_view(self)
+            self.main_chart_layout.addWidget(self.web_view)
+        return self.web_view
+
+    def lock_file(self, id_: int) -> ContextManager:
+        """ Get a lock which needs to be held while the given file is modified. """
+        if self.file_lock_factory is None:
+            return contextlib.nullcontext()
+        return self.file_lock_factory(id_)
+
     @property
     def current_tab_widget(self) -> TabWidget:
         """ Currently displayed tab widget. """
         return self.output_stacked_widget.currentWidget()
 
+    @property
+    def results_fetcher(self) -> "ResultsFetcher":
+        """ Results fetcher created on first use. """
+        if self._results_fetcher is None:
+            from chartify.model.results_fetcher import ResultsFetcher
+
+            self._results_fetcher = ResultsFetcher()
+        return self._results_fetcher
+
     @property
     def current_file_widget(self) -> StackedWidget:
         """ Currently chosen file stacked widget. """
         return self.current_tab_widget.currentWidget()
 
     @property
-    def current_view(self) -> TreeView:
+    def current_view(self) -> "TreeView":
         """ Currently selected outputs file. """
         return self.current_file_widget.currentWidget()
 
     @property
-    def current_model(self) -> ViewModel:
+    def current_model(self) -> "ViewModel":
         """ Currently selected source model."""
         return self.current_view.source_model
 
@@ -387,6 +456,15 @@ class MainWindow(QMainWindow):
         """ All available tab widgets. """
         return [self.standard_tab_wgt, self.totals_tab_wgt, self.diff_tab_wgt]
 
+    def get_view_models_by_name(self) -> Dict[Tuple[str, str], "ViewModel"]:
+        """ Get all view models as (file name, table) : model dictionary. """
+        models = {}
+        for tab_widget in self.tab_widgets:
+            for file_widget in tab_widget.get_all_children():
+                for model in file_widget.all_view_models:
+                    models[(model.file_name, model.name)] = model
+        return models
+
     def update_settings(self):
         """ Save settings into class attributes. """
         Settings.SIZE = (self.width(), self.height())
@@ -450,82 +528,138 @@ class MainWindow(QMainWindow):
         c1 = Settings.PALETTE.get_color_tuple("PRIMARY_TEXT_COLOR")
         c2 = Settings.PALETTE.get_color_tuple("SECONDARY_TEXT_COLOR")
 
-        r = Settings.SOURCE_ICONS_DIR
-        self.setWindowIcon(Pixmap(Path(r, "smile.png"), 255, 255, 255))
+        icon_cache = IconCache.for_dir(Settings.ICONS_CACHE_DIR)
 
-        self.load_file_btn.setIcon(QIcon(Pixmap(Path(r, "file.png"), *c1)))
-        self.save_btn.setIcon(QIcon(Pixmap(Path(r, "save.png"), *c1)))
-        self.about_btn.setIcon(QIcon(Pixmap(Path(r, "help.png"), *c1)))
-        self.close_all_act.setIcon(QIcon(Pixmap(Path(r, "remove.png"), *c1)))
-        self.load_file_act.setIcon(QIcon(Pixmap(Path(r, "add_file.png"), *c1)))
+        def pixmap(name: str, rgb: Tuple[int, int, int], a: float = 1) -> QPixmap:
+            return icon_cache.get_pixmap(Path(Settings.SOURCE_ICONS_DIR, name), *rgb, a=a)
 
-        self.drop_button.setIcon(Pixmap(Path(r, "drop_file.png"), *c1))
+        self.setWindowIcon(pixmap("smile.png", (255, 255, 255)))
+
+        self.load_file_btn.setIcon(QIcon(pixmap("file.png", c1)))
+        self.save_btn.setIcon(QIcon(pixmap("save.png", c1)))
+        self.about_btn.setIcon(QIcon(pixmap("help.png", c1)))
+        self.close_all_act.setIcon(QIcon(pixmap("remove.png", c1)))
+        self.load_file_act.setIcon(QIcon(pixmap("add_file.png", c1)))
+
+        self.drop_button.setIcon(pixmap("drop_file.png", c1))
         self.drop_button.setToolButtonStyle(Qt.ToolButtonTextUnderIcon)
         self.drop_button.setIconSize(Settings.ICON_LARGE_SIZE)
 
-        self.totals_button.setIcon(Pixmap(Path(r, "add_file.png"), *c1))
+        self.totals_button.setIcon(pixmap("add_file.png", c1))
         self.totals_button.setToolButtonStyle(Qt.ToolButtonTextUnderIcon)
         self.totals_button.setIconSize(Settings.ICON_LARGE_SIZE)
 
-        self.diff_button.setIcon(Pixmap(Path(r, "add_file.png"), *c1))
+        self.diff_button.setIcon(pixmap("add_file.png", c1))
         self.diff_button.setToolButtonStyle(Qt.ToolButtonTextUnderIcon)
         self.diff_button.setIconSize(Settings.ICON_LARGE_SIZE)
 
         enabled_off = (QIcon.Normal, QIcon.Off)
         disabled_off = (QIcon.Disabled, QIcon.Off)
         disabled_on = (QIcon.Disabled, QIcon.On)
-        disabled_a = 0.6
+        disabled_a = self.DISABLED_ICON_OPACITY
 
         icon = QIcon()
-        icon.addPixmap(Pixmap(Path(r, "sigma.png"), *c1), *enabled_off)
-        icon.addPixmap(Pixmap(Path(r, "sigma.png"), *c1, a=disabled_a), *disabled_off)
+        icon.addPixmap(pixmap("sigma.png", c1), *enabled_off)
+        icon.addPixmap(pixmap("sigma.png", c1, a=disabled_a), *disabled_off)
         self.sum_act.setIcon(icon)
 
         icon = QIcon()
-        icon.addPixmap(Pixmap(Path(r, "mean.png"), *c1), *enabled_off)
-        icon.addPixmap(Pixmap(Path(r, "mean.png"), *c1, a=disabled_a), *disabled_off)
+        icon.addPixmap(pixmap("mean.png", c1), *enabled_off)
+        icon.addPixmap(pixmap("mean.png", c1, a=disabled_a), *disabled_off)
         self.mean_act.setIcon(icon)
 
         icon = QIcon()
-        icon.addPixmap(Pixmap(Path(r, "remove.png"), *c1), *enabled_off)
-        icon.addPixmap(Pixmap(Path(r, "remove.png"), *c1, a=disabled_a), *disabled_off)
+        icon.addPixmap(pixmap("remove.png", c1), *enabled_off)
+        icon.addPixmap(pixmap("remove.png", c1, a=disabled_a), *disabled_off)
         self.remove_variables_act.setIcon(icon)
 
         icon = QIcon()
-        icon.addPixmap(Pixmap(Path(r, "pen.png"), *c1), *enabled_off)
-        icon.addPixmap(Pixmap(Path(r, "pen.png"), *c1, a=disabled_a), *disabled_off)
+        icon.addPixmap(pixmap("pen.png", c1), *enabled_off)
+        icon.addPixmap(pixmap("pen.png", c1, a=disabled_a), *disabled_off)
         self.rename_variable_act.setIcon(icon)
 
         icon = QIcon()
-        icon.addPixmap(Pixmap(Path(r, "plain_view.png"), *c2), *enabled_off)
-        icon.addPixmap(Pixmap(Path(r, "plain_view.png"), *c2, a=disabled_a), *disabled_off)
-        icon.addPixmap(Pixmap(Path(r, "tree_view.png"), *c2), *enabled_off)
-        icon.addPixmap(Pixmap(Path(r, "tree_view.png"), *c2, a=disabled_a), *disabled_on)
+        icon.addPixmap(pixmap("plain_view.png", c2), *enabled_off)
+        icon.addPixmap(pixmap("plain_view.png", c2, a=disabled_a), *disabled_off)
+        icon.addPixmap(pixmap("tree_view.png", c2), *enabled_off)
+        icon.addPixmap(pixmap("tree_view.png", c2, a=disabled_a), *disabled_on)
         self.tree_act.setIcon(icon)
 
         icon = QIcon()
-        icon.addPixmap(Pixmap(Path(r, "unfold_less.png"), *c2), *enabled_off)
-        icon.addPixmap(Pixmap(Path(r, "unfold_less.png"), *c2, a=disabled_a), *disabled_off)
+        icon.addPixmap(pixmap("unfold_less.png", c2), *enabled_off)
+        icon.addPixmap(pixmap("unfold_less.png", c2, a=disabled_a), *disabled_off)
         self.collapse_all_act.setIcon(icon)
 
         icon = QIcon()
-        icon.addPixmap(Pixmap(Path(r, "unfold_more.png"), *c2), *enabled_off)
-        icon.addPixmap(Pixmap(Path(r, "unfold_more.png"), *c2, a=disabled_a), *disabled_off)
+        icon.addPixmap(pixmap("unfold_more.png", c2), *enabled_off)
+        icon.addPixmap(pixmap("unfold_more.png", c2, a=disabled_a), *disabled_off)
         self.expand_all_act.setIcon(icon)
 
-    def load_css_and_icons(self) -> None:
-        """ Update application appearance. """
-        icons_dir = Path(Settings.APP_TEMP_DIR, "icons")
-        shutil.rmtree(icons_dir, ignore_errors=True)
-        icons_dir.mkdir()
+    @classmethod
+    def render_palette(cls, palette: Palette) -> PaletteBundle:
+        """ Render application css and icons for given palette. """
         css, icon_paths = CssParser.parse_css_files(
-            Settings.CSS_DIR, Settings.PALETTE, Settings.SOURCE_ICONS_DIR, icons_dir,
+            Settings.CSS_DIR,
+            palette,
+            Settings.SOURCE_ICONS_DIR,
+            Settings.ICONS_CACHE_DIR,
         )
-        self._temp_icons = icon_paths
+        # icon files are only rendered here, pixmaps must be created in GUI thread
+        icon_cache = IconCache.for_dir(Settings.ICONS_CACHE_DIR)
+        for names, color_key in [
+            (cls.PRIMARY_ICONS, "PRIMARY_TEXT_COLOR"),
+            (cls.SECONDARY_ICONS, "SECONDARY_TEXT_COLOR"),
+        ]:
+            rgb = palette.get_color_tuple(color_key)
+            for name in names:
+                for a in (1, cls.DISABLED_ICON_OPACITY):
+                    icon_cache.get_path(Path(Settings.SOURCE_ICONS_DIR, name), *rgb, a=a)
+        return PaletteBundle(palette.name, css, icon_paths)
+
+    @classmethod
+    def render_palettes(cls, palettes: List[Palette]) -> List[PaletteBundle]:
+        """ Render application css and icons for all given palettes. """
+        return [cls.render_palette(palette) for palette in palettes]
+
+    def prerender_palettes(self) -> None:
+        """ Render all palettes in background so color scheme switch is instant. """
+        palettes = [p for name, p in self.palettes.items() if name not in self.palette_bundles]
+        if palettes:
+            worker = Worker(self.render_palettes, palettes)
+            worker.signals.finished.connect(self.on_palettes_rendered)
+            self.thread_pool.start(worker)
+
+    def on_palettes_rendered(self, bundles: List[PaletteBundle]) -> None:
+        """ Store palettes rendered in background. """
+        for bundle in bundles:
+            self.palette_bundles.setdefault(bundle.name, bundle)
+
+    def load_css_and_icons(self) -> None:
+        """ Update application appearance. """
+        start = time.perf_counter()
+        icon_cache = IconCache.for_dir(Settings.ICONS_CACHE_DIR)
+        icon_cache.reset_stats()
+        bundle = self.palette_bundles.get(Settings.PALETTE_NAME)
+        prerendered = bundle is not None
+        if not prerendered:
+            bundle = self.render_palette(Settings.PALETTE)
+            self.palette_bundles[Settings.PALETTE_NAME] = bundle
+        self._temp_icons = bundle.icon_paths
         # css needs to be cleared to repaint the window properly
         self.setStyleSheet("")
-        self.setStyleSheet(css)
+        self.setStyleSheet(bundle.css)
         self.load_icons()
+        stats = icon_cache.get_stats()
+        logger.info(
+            "Palette '%s' (prerendered: %s) applied in %.3f s, "
+            "icon cache hit rate %.0f %% (%d/%d).",
+            Settings.PALETTE_NAME,
+            prerendered,
+            time.perf_counter() - start,
+            stats["hit_rate"] * 100,
+            stats["hits"],
+            stats["hits"] + stats["misses"],
+        )
 
     def mirror_layout(self):
         """ Mirror the layout. """
@@ -542,11 +676,11 @@ class MainWindow(QMainWindow):
             file_widgets = [self.current_file_widget]
         return file_widgets
 
-    def filter_models(self, view_models: List[ViewModel]) -> List[ViewModel]:
+    def filter_models(self, view_models: List["ViewModel"]) -> List["ViewModel"]:
         """ Return models of the same type (SIMPLE, TREE) as the current one. """
         return [m for m in view_models if m.is_simple is self.current_model.is_simple]
 
-    def get_all_models(self) -> List[ViewModel]:
+    def get_all_models(self) -> List["ViewModel"]:
         """ Gather models based on toolbar settings. """
         models = []
         for file_widget in self.get_all_file_widgets():
@@ -558,41 +692,40 @@ class MainWindow(QMainWindow):
                     models.append(file_widget.get_view_model(table_name))
         return self.filter_models(models)
 
-    def get_all_other_models(self) -> List[ViewModel]:
+    def get_all_other_models(self) -> List["ViewModel"]:
         """ Gather models based on toolbar settings. """
         models = self.get_all_models()
         models.remove(self.current_model)
         return models
 
-    def on_tree_node_changed(self, treeview: TreeView) -> None:
+    def on_tree_node_changed(self, treeview: "TreeView") -> None:
         """ Update current view on tree node column change. """
         self.update_treeview(treeview)
 
     def on_item_double_clicked(
         self,
-        treeview: TreeView,
+        treeview: "TreeView",
         row: int,
         parent_index: Optional[QModelIndex],
-        old_view_variable: VV,
+        old_view_variable: "VV",
     ) -> None:
         """ Update variable name on view double click event. """
         old_key = old_view_variable.key
-        key_blocker = set(treeview.get_items_text_for_column(KEY_LEVEL))
-        key_blocker.remove(old_key)
-        if treeview.source_model.is_simple:
+        key_blocker, type_blocker = treeview.get_rename_blockers(old_view_variable)
+        is_simple = treeview.source_model.is_simple
+        if is_simple:
             res = self.confirm_rename_simple_variable(old_key, key_blocker)
         else:
             old_type = old_view_variable.type
-            type_blocker = set(treeview.get_items_text_for_column(TYPE_LEVEL))
-            type_blocker.remove(old_type)
             res = self.confirm_rename_variable(old_key, old_type, key_blocker, type_blocker)
 
         if res is not None:
-            key = res if treeview.view_type is ViewType.SIMPLE else res[0]
-            type_ = None if treeview.view_type is ViewType.SIMPLE else res[1]
+            key = res if is_simple else res[0]
+            type_ = None if is_simple else res[1]
             units = old_view_variable.units
             new_view_variable = VV(key=key, type=type_, units=units)
-            treeview.update_variable(row, parent_index, new_view_variable)
+            with self.lock_file(treeview.source_model.file_id):
+                treeview.update_variable(row, parent_index, new_view_variable)
             if models := self.get_all_other_models():
                 self.variableRenameRequested.emit(models, old_view_variable, new_view_variable)
 
@@ -600,7 +733,8 @@ class MainWindow(QMainWindow):
         """ Handle remove variable action trigger event. """
         if selected := self.current_view.get_selected_view_variable():
             if self.confirm_remove_variables(selected):
-                self.current_model.delete_variables(selected)
+                with self.lock_file(self.current_model.file_id):
+                    self.current_model.delete_variables(selected)
                 self.on_selection_cleared()
                 if models := self.get_all_other_models():
                     self.variableRemoveRequested.emit(models, selected)
@@ -608,7 +742,7 @@ class MainWindow(QMainWindow):
     def on_aggregation_requested(self, func: str) -> None:
         """ Handle variable aggregation action trigger event. """
         if view_variables := self.current_view.get_selected_view_variable():
-            if self.current_view.view_type is ViewType.SIMPLE:
+            if self.current_model.is_simple:
                 res = self.confirm_aggregate_simple_variables(view_variables, func)
             else:
                 res = self.confirm_aggregate_variables(view_variables, func)
@@ -618,22 +752,26 @@ class MainWindow(QMainWindow):
                 else:
                     new_key = res
                     new_type = None
-                self.current_view.aggregate_variables(view_variables, func, new_key, new_type)
+                with self.lock_file(self.current_model.file_id):
+                    self.current_view.aggregate_variables(
+                        view_variables, func, new_key, new_type
+                    )
                 if models := self.get_all_other_models():
                     self.aggregationRequested.emit(
                         models, func, view_variables, new_key, new_type
                     )
 
-    def fetch_results(self) -> pd.DataFrame:
+    @instrument
+    def fetch_results(self) -> Optional["pd.DataFrame"]:
         """ Retrieve results for currently selected variables. """
         if view_variables := self.current_view.get_selected_view_variable():
             models = self.get_all_models()
-            frames = []
-            for model in models:
-                df = model.get_results(view_variables, **self.toolbar.current_units)
-                if df is not None:
-                    frames.append(df)
-            return pd.concat(frames, axis=1, sort=False)
+            units = self.toolbar.current_units
+            df = self.results_fetcher.fetch(models, view_variables, **units)
+            if df is not None:
+                # units are stored to be able to fetch the same results again
+                df.attrs["units"] = units
+            return df
 
     def on_sum_action_triggered(self):
         """ Handle sum action trigger. """
@@ -654,8 +792,12 @@ class MainWindow(QMainWindow):
             selected[0],
         )
 
-    def add_file_widget(self, file: ParquetFile):
+    def add_file_widget(self, file: "ParquetFile"):
         """ Add processed file to tab widget corresponding to data type. """
+        from esofile_reader.pqt.parquet_file import ParquetFile
+        from chartify.ui.widgets.treeview import TreeView
+        from chartify.ui.widgets.treeview_model import ViewModel
+
         tab_widgets_switch = {
             ParquetFile.TOTALS: self.totals_tab_wgt,
             ParquetFile.DIFF: self.diff_tab_wgt,
@@ -668,6 +810,7 @@ class MainWindow(QMainWindow):
         tab_widget = tab_widgets_switch.get(file.file_type, self.standard_tab_wgt)
         output_type = output_type_switch.get(file.file_type, OutputType.STANDARD)
         file_widget = StackedWidget(tab_widget)
+        views = []
         for name in file.table_names:
             model = ViewModel(name, file)
             view = TreeView(model, output_type)
@@ -676,8 +819,65 @@ class MainWindow(QMainWindow):
             view.treeNodeChanged.connect(self.on_tree_node_changed)
             view.itemDoubleClicked.connect(self.on_item_double_clicked)
             file_widget.addWidget(view)
+            views.append(view)
+        # views display a placeholder until their data is prepared in background
+        self.prepare_views(views)
         tab_widget.addTab(file_widget, file.file_name)
 
+    def prepare_views(self, treeviews: List["TreeView"]) -> None:
+        """ Prepare view model data in a worker thread.
+
+        Model state is copied on the GUI thread so the worker
+        does not access the source file. Prepared data is handed
+        over to the model on the GUI thread and attached once
+        the view gets displayed.
+
+        """
+        from chartify.ui.widgets.treeview import ViewMask
+        from chartify.ui.widgets.treeview_model import ViewModel
+
+        for treeview in treeviews:
+            model = treeview.source_model
+            if model.initialized or model.preparing:
+                continue
+            arguments = model.get_prepare_arguments(
+                tree_node=ViewMask.get_required_tree_node(treeview, self.tree_act.isChecked()),
+                **self.toolbar.current_units,
+            )
+            worker = Worker(ViewModel.create_prepared_model, *arguments)
+            # signals are emitted on a pool thread, bound slots of the main
+            # window are called on the GUI thread, sender identifies the view
+            self._preparing_views[worker.signals] = treeview
+            worker.signals.finished.connect(self.on_view_prepared)
+            worker.signals.failed.connect(self.on_view_preparation_failed)
+            model.preparing = True
+            self.thread_pool.start(worker)
+
+    @Slot(object)
+    def on_view_prepared(self, prepared: "PreparedModel") -> None:
+        """ Attach prepared data if the view is currently displayed. """
+        treeview = self._preparing_views.pop(self.sender())
+        treeview.source_model.preparing = False
+        treeview.source_model.set_prepared_model(prepared)
+        self.update_placeholder_view(treeview)
+
+    @Slot(object)
+    def on_view_preparation_failed(self, error: Exception) -> None:
+        """ Build the view on the GUI thread if it's displayed. """
+        treeview = self._preparing_views.pop(self.sender())
+        logger.warning(
+            "Failed to prepare table '%s' in background: %r.", treeview.source_model.name, error
+        )
+        treeview.source_model.preparing = False
+        self.update_placeholder_view(treeview)
+
+    def update_placeholder_view(self, treeview: "TreeView") -> None:
+        """ Replace displayed placeholder with actual model data. """
+        if not self.current_tab_widget.is_empty() and treeview is self.current_view:
+            self.update_treeview(treeview)
+        else:
+            treeview.viewport().update()
+
     def expand_all(self):
         """ Expand all tree view items. """
         if not self.current_tab_widget.is_empty():
@@ -693,7 +893,7 @@ class MainWindow(QMainWindow):
         path, _ = QFileDialog.getSaveFileName(
             parent=self,
             caption="Save project",
-            filter=f"CFS (*{ParquetStorage.EXT})",
+            filter=f"CFS (*{Settings.PROJECT_EXTENSION})",
             dir=str(Settings.SAVE_PATH) if Settings.SAVE_PATH else None,
         )
         if path:
@@ -759,17 +959,11 @@ class MainWindow(QMainWindow):
         """ Check if source units should be visible. """
         return self.toolbar.source_units_toggle.isChecked()
 
-    def get_filter_dict(self) -> Dict[str, str]:
-        """ Retrieve filter inputs from ui, text uses lower. """
-        pairs = zip(
-            [KEY_LEVEL, TYPE_LEVEL, PROXY_UNITS_LEVEL],
-            [
-                self.key_line_edit.text(),
-                self.type_line_edit.text(),
-                self.units_line_edit.text(),
-            ],
+    def get_filter_dict(self, treeview: "TreeView") -> Dict[str, str]:
+        """ Retrieve filter inputs from ui. """
+        return treeview.create_filter_dict(
+            self.key_line_edit.text(), self.type_line_edit.text(), self.units_line_edit.text()
         )
-        return {key: text.lower() for key, text in pairs if text.strip()}
 
     def on_output_type_change_requested(self, index: int) -> None:
         """ Show tab widget corresponding to the given radio button. """
@@ -796,7 +990,7 @@ class MainWindow(QMainWindow):
         self.sum_act.setEnabled(False)
         self.mean_act.setEnabled(False)
 
-    def enable_selection_actions(self, view_variables: List[VV]):
+    def enable_selection_actions(self, view_variables: List["VV"]):
         """  Update toolbar actions to match current selection. """
         self.remove_variables_act.setEnabled(False)
         self.rename_variable_act.setEnabled(False)
@@ -807,14 +1001,11 @@ class MainWindow(QMainWindow):
             if len(view_variables) == 1:
                 self.rename_variable_act.setEnabled(True)
             elif len(view_variables) > 1:
-                units = [var.units for var in view_variables]
-                if len(set(units)) == 1 or (
-                    all_rate_or_energy(units) and self.current_model.allow_rate_to_energy
-                ):
+                if self.current_model.can_aggregate_variables(view_variables):
                     self.sum_act.setEnabled(True)
                     self.mean_act.setEnabled(True)
 
-    def enable_actions_for_view(self, view: TreeView) -> None:
+    def enable_actions_for_view(self, view: "TreeView") -> None:
         """ Enable or disable actions related to given view. """
         allow_tree = not view.source_model.is_simple
         self.tree_act.setEnabled(allow_tree)
@@ -864,7 +1055,7 @@ class MainWindow(QMainWindow):
         self.current_file_widget.set_treeview(next_treeview)
         self.update_treeview(next_treeview, ref_treeview)
 
-    def on_selection_populated(self, view_variables: List[VV]):
+    def on_selection_populated(self, view_variables: List["VV"]):
         """ Update ui actions related to given selection. """
         self.enable_selection_actions(view_variables)
         self.selectionChanged.emit(view_variables)
@@ -913,12 +1104,12 @@ class MainWindow(QMainWindow):
 
     def on_source_units_toggled(self, checked: bool):
         """ Hide or show source units column as requested. """
-        if not self.current_tab_widget.is_empty():
-            self.current_view.hide_section(UNITS_LEVEL, not checked)
+        if not self.current_tab_widget.is_empty() and self.current_model.initialized:
+            self.current_view.show_source_units(checked)
 
     def on_units_changed(self) -> None:
         """ Update units on current view to correspond with toolbar settings. """
-        if not self.current_tab_widget.is_empty():
+        if not self.current_tab_widget.is_empty() and self.current_model.initialized:
             self.current_view.update_units(**self.toolbar.current_units)
 
     def on_custom_units_toggled(self) -> None:
@@ -936,11 +1127,16 @@ class MainWindow(QMainWindow):
         self.toolbar.unitsChanged.connect(self.on_units_changed)
         self.toolbar.source_units_toggle.stateChanged.connect(self.on_source_units_toggled)
 
-    def update_treeview(self, treeview: TreeView, ref_treeview: TreeView = None) -> None:
+    def update_treeview(self, treeview: "TreeView", ref_treeview: "TreeView" = None) -> None:
+        from chartify.ui.widgets.treeview import ViewMask
+
+        if treeview.source_model.preparing:
+            # placeholder is displayed, view is updated once the data is ready
+            return
         with ViewMask(
             treeview=treeview,
             ref_treeview=ref_treeview,
-            filter_dict=self.get_filter_dict(),
+            filter_dict=self.get_filter_dict(treeview),
             show_source_units=self.show_source_units(),
         ) as mask:
             mask.update_treeview(
@@ -963,7 +1159,7 @@ class MainWindow(QMainWindow):
     def on_filter_timeout(self):
         """ Apply a filter when the filter text is edited. """
         if not self.current_tab_widget.is_empty():
-            self.current_view.filter_view(self.get_filter_dict())
+            self.current_view.filter_view(self.get_filter_dict(self.current_view))
 
     def connect_view_tools_signals(self):
         """ Connect signals emitted by filtering buttons. """
@@ -1000,7 +1196,7 @@ class MainWindow(QMainWindow):
             text = f"table '{table_name}', file '{file_name}'"
         return text
 
-    def confirm_remove_variables(self, view_variables: List[VV],) -> bool:
+    def confirm_remove_variables(self, view_variables: List["VV"],) -> bool:
         """ Confirm removing of selected variables. """
         title = f"Delete following variables from {self.get_files_and_tables_text()}: "
         inf_text = "\n".join([stringify_view_variable(var) for var in view_variables])
@@ -1035,10 +1231,10 @@ class MainWindow(QMainWindow):
             return dialog.input1_text, dialog.input2_text
 
     def confirm_aggregate_simple_variables(
-        self, view_variables: List[VV], func_name: str
+        self, view_variables: List["VV"], func_name: str
     ) -> Optional[str]:
         """ Confirm aggregation of given simple variables. """
-        if is_variable_attr_identical(view_variables, KEY_LEVEL):
+        if is_variable_attr_identical(view_variables, "key"):
             key = f"{view_variables[0].key} - {func_name}"
         else:
             key = f"Custom Key - {func_name}"
@@ -1052,15 +1248,15 @@ class MainWindow(QMainWindow):
             return dialog.input1_text
 
     def confirm_aggregate_variables(
-        self, view_variables: List[VV], func_name: str
+        self, view_variables: List["VV"], func_name: str
     ) -> Optional[Tuple[str, str]]:
         """ Confirm aggregation of given variables. """
-        if is_variable_attr_identical(view_variables, KEY_LEVEL):
+        if is_variable_attr_identical(view_variables, "key"):
             key = f"{view_variables[0].key} - {func_name}"
         else:
             key = f"Custom Key - {func_name}"
 
-        if is_variable_attr_identical(view_variables, TYPE_LEVEL):
+        if is_variable_attr_identical(view_variables, "type"):
             type_ = view_variables[0].type
         else:
             type_ = "Custom Type"
@@ -1,9 +1,10 @@
-from typing import List, Dict
+from typing import List, Dict, TYPE_CHECKING
 
 from PySide2.QtWidgets import QStackedWidget, QWidget
 
-from chartify.ui.widgets.treeview import TreeView
-from chartify.ui.widgets.treeview_model import ViewModel
+if TYPE_CHECKING:
+    from chartify.ui.widgets.treeview import TreeView
+    from chartify.ui.widgets.treeview_model import ViewModel
 
 
 class StackedWidget(QStackedWidget):
@@ -11,7 +12,7 @@ class StackedWidget(QStackedWidget):
         super().__init__(parent)
 
     @property
-    def current_treeview(self) -> TreeView:
+    def current_treeview(self) -> "TreeView":
         return self.currentWidget()
 
     @property
@@ -19,7 +20,7 @@ class StackedWidget(QStackedWidget):
         return self.currentWidget().source_model.name
 
     @property
-    def all_view_models(self) -> List[ViewModel]:
+    def all_view_models(self) -> List["ViewModel"]:
         return [treeview.source_model for treeview in self.get_all_children()]
 
     @property
@@ -42,11 +43,11 @@ class StackedWidget(QStackedWidget):
     def get_all_children(self) -> List[QWidget]:
         return [self.widget(i) for i in range(self.count())]
 
-    def get_treeview(self, name: str) -> TreeView:
+    def get_treeview(self, name: str) -> "TreeView":
         index = self.name_indexes[name]
         return self.widget(index)
 
-    def get_view_model(self, name: str) -> ViewModel:
+    def get_view_model(self, name: str) -> "ViewModel":
         return self.get_treeview(name).source_model
 
     def get_next_treeview(self, previous_file_widget: "StackedWidget") -> "StackedWidget":
@@ -59,6 +60,6 @@ class StackedWidget(QStackedWidget):
             name = self.current_table_name
         return self.get_treeview(name)
 
-    def set_treeview(self, treeview: TreeView) -> None:
+    def set_treeview(self, treeview: "TreeView") -> None:
         index = self.indexOf(treeview)
         self.setCurrentIndex(index)
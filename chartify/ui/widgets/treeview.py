@@ -10,7 +10,7 @@ from PySide2.QtCore import (
     QModelIndex,
     Qt,
 )
-from PySide2.QtGui import QDrag, QPixmap
+from PySide2.QtGui import QDrag, QPixmap, QPainter, QPaintEvent
 from PySide2.QtWidgets import QTreeView, QAbstractItemView, QHeaderView
 from esofile_reader.df.level_names import *
 from esofile_reader.typehints import Variable, SimpleVariable
@@ -60,6 +60,8 @@ class TreeView(QTreeView):
 
     """
 
+    PLACEHOLDER_TEXT = "Loading variables..."
+
     selectionCleared = Signal()
     selectionPopulated = Signal(list)
     itemDoubleClicked = Signal(QTreeView, int, QModelIndex, VV)
@@ -142,6 +144,14 @@ class TreeView(QTreeView):
     def initialized(self):
         return self.source_model.initialized
 
+    def paintEvent(self, event: QPaintEvent) -> None:
+        """ Display placeholder text while model data is being prepared. """
+        super().paintEvent(event)
+        if self.source_model.preparing:
+            painter = QPainter(self.viewport())
+            painter.drawText(self.viewport().rect(), Qt.AlignCenter, self.PLACEHOLDER_TEXT)
+            painter.end()
+
     def mousePressEvent(self, event: QEvent) -> None:
         """ Handle mouse events. """
         btn = event.button()
@@ -170,6 +180,12 @@ class TreeView(QTreeView):
             if self.proxy_model.hasChildren(self.proxy_model.index(i, 0)):
                 super().setFirstColumnSpanned(i, self.rootIndex(), True)
 
+    @staticmethod
+    def create_filter_dict(key: str, type_: str, units: str) -> Dict[str, str]:
+        """ Create filter from given texts, text uses lower and empty text is ignored. """
+        pairs = zip([KEY_LEVEL, TYPE_LEVEL, PROXY_UNITS_LEVEL], [key, type_, units])
+        return {level: text.lower() for level, text in pairs if text.strip()}
+
     def filter_view(self, filter_dict: Dict[str, str]) -> None:
         """ Filter the model using given filter tuple. """
         indexes = self.source_model.get_logical_column_indexes()
@@ -299,6 +315,10 @@ class TreeView(QTreeView):
         self.show_all_sections()
         self.header().setSectionHidden(self.source_model.get_logical_column_number(data), hide)
 
+    def show_source_units(self, show: bool) -> None:
+        """ Show or hide source units column. """
+        self.hide_section(UNITS_LEVEL, not show)
+
     def set_span_and_decorate_root(self):
         if self.is_tree:
             self.set_parent_items_spanned()
@@ -445,6 +465,16 @@ class TreeView(QTreeView):
         """ Get all item text for given column. """
         return self.source_model.get_column_data(column)
 
+    def get_rename_blockers(self, view_variable: VV) -> Tuple[Set[str], Set[str]]:
+        """ Get keys and types of other variables, types are empty for simple views. """
+        keys = set(self.get_items_text_for_column(KEY_LEVEL))
+        keys.remove(view_variable.key)
+        if self.source_model.is_simple:
+            return keys, set()
+        types = set(self.get_items_text_for_column(TYPE_LEVEL))
+        types.remove(view_variable.type)
+        return keys, types
+
     def update_variable(
         self, row: int, parent_index: QModelIndex, new_view_variable: VV
     ) -> None:
@@ -544,7 +574,7 @@ class ViewMask:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.treeview.hide_section(UNITS_LEVEL, not self.show_source_units)
+        self.treeview.show_source_units(self.show_source_units)
         if self.filter_dict:
             self.treeview.filter_view(self.filter_dict)
 
@@ -565,14 +595,17 @@ class ViewMask:
             )
         )
 
-    def get_tree_node(self, treeview: TreeView) -> str:
-        return self.CACHED[treeview.output_type].default_header[treeview.view_type][0]
+    @classmethod
+    def get_tree_node(cls, treeview: TreeView) -> str:
+        return cls.CACHED[treeview.output_type].default_header[treeview.view_type][0]
+
+    @classmethod
+    def get_required_tree_node(cls, treeview: TreeView, is_tree: bool) -> Optional[str]:
+        if is_tree and not treeview.source_model.is_simple:
+            return cls.get_tree_node(treeview)
 
     def update_treeview(
         self, treeview: TreeView, is_tree: bool, units_kwargs: Dict[str, Union[str, bool]]
     ) -> None:
-        if is_tree and not treeview.source_model.is_simple:
-            tree_node = self.get_tree_node(treeview)
-        else:
-            tree_node = None
+        tree_node = self.get_required_tree_node(treeview, is_tree)
         treeview.update_model(tree_node=tree_node, **units_kwargs)
@@ -1,6 +1,10 @@
 import contextlib
-from collections import namedtuple
-from typing import Dict, Optional, List
+import threading
+from collections import namedtuple, OrderedDict
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Optional, List, Tuple, Iterable, Sequence, TYPE_CHECKING
 
 import pandas as pd
 from PySide2.QtCore import (
@@ -12,7 +16,11 @@ from PySide2.QtCore import (
 )
 from PySide2.QtGui import QStandardItemModel, QStandardItem
 from esofile_reader import get_results
-from esofile_reader.convertor import can_convert_rate_to_energy, create_conversion_dict
+from esofile_reader.convertor import (
+    all_rate_or_energy,
+    can_convert_rate_to_energy,
+    create_conversion_dict,
+)
 from esofile_reader.df.level_names import (
     KEY_LEVEL,
     TYPE_LEVEL,
@@ -24,14 +32,26 @@ from esofile_reader.exceptions import CannotAggregateVariables
 from esofile_reader.results_processing.table_formatter import TableFormatter
 from esofile_reader.typehints import ResultsFileType, Variable, SimpleVariable, VariableType
 
+from chartify.model.lazy_file import LazyParquetFile
+from chartify.model.results_cache import ResultsCache
+from chartify.settings import Settings
+from chartify.ui.widgets.view_variable import VV
+from chartify.utils.instrumentation import instrument
+
+if TYPE_CHECKING:
+    from chartify.model.arrow_store import ArrowStore
+
 PROXY_UNITS_LEVEL = "proxy_units"
 
-ViewVariable = namedtuple("VV", "key type units")
-VV = ViewVariable
+# units system, rate units, energy units, rate to energy
+RAW_UNITS = ("SI", "W", "J", False)
 
+RowsType = Tuple[Tuple[str, ...], ...]
 
-def stringify_view_variable(view_variable: VV) -> str:
-    return " | ".join([v for v in view_variable if v is not None])
+PreparedModel = namedtuple(
+    "PreparedModel",
+    "version tree_node rate_to_energy units_system energy_units rate_units column_labels groups",
+)
 
 
 def convert_view_variable_to_variable(view_variable: VV, table_name: str) -> VariableType:
@@ -61,12 +81,6 @@ def convert_view_variables_to_variables(
     return [convert_view_variable_to_variable(v, table_name) for v in view_variables]
 
 
-def is_variable_attr_identical(view_variables: List[VV], attr: str) -> bool:
-    """ Check if all variables use the same attribute text. """
-    first_attr = view_variables[0].__getattribute__(attr)
-    return all(map(lambda x: x.__getattribute__(attr) == first_attr, view_variables))
-
-
 def order_view_variable_by_header(view_variable: VV, column_data: List[str]) -> List[str]:
     """ Transform view variable to list sorted by column order. """
     return [
@@ -82,6 +96,114 @@ class FileModelMismatch(Exception):
     pass
 
 
+class ConversionLookUp:
+    """ Process wide cache of source units to proxy units pairs.
+
+    Look up tables are stored per units settings, only the most
+    recently used settings are kept in memory. As the settings
+    are driven by toolbar, the table is 'activated' whenever
+    the toolbar units change.
+
+    """
+
+    MAX_SETTINGS = 8
+    TABLES = OrderedDict()
+    LOCK = threading.RLock()
+
+    @classmethod
+    def get_settings_table(
+        cls, rate_to_energy: bool, units_system: str, energy_units: str, rate_units: str,
+    ) -> Dict[str, str]:
+        """ Get look up table for given settings, least recently used tables are dropped. """
+        settings = (rate_to_energy, units_system, energy_units, rate_units)
+        with cls.LOCK:
+            try:
+                cls.TABLES.move_to_end(settings)
+            except KeyError:
+                cls.TABLES[settings] = {}
+                if len(cls.TABLES) > cls.MAX_SETTINGS:
+                    cls.TABLES.popitem(last=False)
+            return cls.TABLES[settings]
+
+    @classmethod
+    def activate(
+        cls,
+        rate_to_energy: bool = False,
+        units_system: str = "SI",
+        energy_units: str = "J",
+        rate_units: str = "W",
+    ) -> None:
+        """ Mark given settings as the most recently used ones. """
+        cls.get_settings_table(rate_to_energy, units_system, energy_units, rate_units)
+
+    @classmethod
+    def get_table(
+        cls,
+        source_units: Iterable[str],
+        rate_to_energy: bool = False,
+        units_system: str = "SI",
+        energy_units: str = "J",
+        rate_units: str = "W",
+    ) -> Dict[str, str]:
+        """ Get source to proxy units look up including all given units. """
+        table = cls.get_settings_table(rate_to_energy, units_system, energy_units, rate_units)
+        missing = [units for units in pd.unique(pd.Series(source_units)) if units not in table]
+        if missing:
+            proxy_units = ViewModel.create_proxy_units_column(
+                pd.Series(missing),
+                rate_to_energy=rate_to_energy,
+                units_system=units_system,
+                energy_units=energy_units,
+                rate_units=rate_units,
+            )
+            with cls.LOCK:
+                table.update(zip(missing, proxy_units))
+        return table
+
+    @classmethod
+    def get_proxy_units(
+        cls,
+        source_units: str,
+        rate_to_energy: bool = False,
+        units_system: str = "SI",
+        energy_units: str = "J",
+        rate_units: str = "W",
+    ) -> str:
+        """ Convert single units string. """
+        table = cls.get_table(
+            [source_units],
+            rate_to_energy=rate_to_energy,
+            units_system=units_system,
+            energy_units=energy_units,
+            rate_units=rate_units,
+        )
+        return table[source_units]
+
+    @classmethod
+    def clear(cls) -> None:
+        cls.TABLES.clear()
+
+
+class ProxyUnitsItem(QStandardItem):
+    """ Item displaying source units converted by the model look up table.
+
+    Displayed text is not stored on the item so all the items
+    get updated at once by swapping model look up table.
+
+    """
+
+    def __init__(self, text: str, source_units: str):
+        super().__init__(text)
+        self.setData(source_units, Qt.UserRole)
+
+    def data(self, role: int = Qt.UserRole + 1):
+        if role == Qt.DisplayRole:
+            model = self.model()
+            if model is not None:
+                return model.get_proxy_units(super().data(Qt.UserRole))
+        return super().data(role)
+
+
 class ViewModel(QStandardItemModel):
     """ View models allowing 'tree' like structure.
 
@@ -106,11 +228,34 @@ class ViewModel(QStandardItemModel):
         Used energy units.
     rate_units : str
         Used power units.
+    preparing : bool
+        Set while model data is being prepared in background.
     _file_ref : ResultFileType
         A reference to source file.
+    _n_rows : int
+        Maintained number of all rows (including child rows).
+    _n_parents : int
+        Maintained number of rows with children.
+    _column_data : tuple of str
+        Column names as set on the horizontal header.
+    _proxy_units : dict of {str : str}
+        Source units : proxy units pairs displayed by 'ProxyUnitsItem'.
+    _version : int
+        Incremented whenever the source file gets modified.
+    _prepared : PreparedModel, optional
+        Model data prepared in background, attached on rebuild.
+    RESULTS_CACHE : ResultsCache
+        Results tables shared by all models.
+    ARROW_STORE : ArrowStore, optional
+        Raw results tables stored in fast to read format,
+        created on first use (pyarrow is slow to import).
 
     """
 
+    RESULTS_CACHE = ResultsCache()
+    ARROW_STORE = None
+    _ARROW_STORE_LOCK = threading.Lock()
+
     def __init__(self, name: str, file_ref: ResultsFileType):
         super().__init__()
         self.name = name
@@ -120,15 +265,45 @@ class ViewModel(QStandardItemModel):
         self.energy_units = "J"
         self.rate_units = "W"
         self._file_ref = file_ref
+        self._n_rows = 0
+        self._n_parents = 0
+        self._column_data = ()
+        self._proxy_units = {}
+        self._version = 0
+        self._prepared = None
+        self.preparing = False
+
+    @property
+    def file_id(self) -> int:
+        return self._file_ref.id_
+
+    @property
+    def file_name(self) -> str:
+        return self._file_ref.file_name
 
     @property
     def is_simple(self) -> bool:
         return self._file_ref.is_header_simple(self.name)
 
+    @property
+    def source_file(self) -> ResultsFileType:
+        """ File holding variable data, saved project files get loaded. """
+        if isinstance(self._file_ref, LazyParquetFile):
+            return self._file_ref.get_file()
+        return self._file_ref
+
     @property
     def allow_rate_to_energy(self) -> bool:
+        if isinstance(self._file_ref, LazyParquetFile):
+            # avoid loading file data
+            return self._file_ref.can_convert_rate_to_energy(self.name)
         return can_convert_rate_to_energy(self._file_ref, self.name)
 
+    def can_aggregate_variables(self, view_variables: List[VV]) -> bool:
+        """ Check if units of given variables allow aggregation. """
+        units = [var.units for var in view_variables]
+        return len(set(units)) == 1 or (all_rate_or_energy(units) and self.allow_rate_to_energy)
+
     @property
     def header_df(self) -> pd.DataFrame:
         return self._file_ref.get_header_df(self.name)
@@ -137,6 +312,11 @@ class ViewModel(QStandardItemModel):
     def initialized(self) -> bool:
         return self.columnCount() != 0
 
+    @property
+    def fingerprint(self) -> Tuple[Optional[str], Tuple[str, ...]]:
+        """ Structural identifier, models with equal fingerprints share appearance. """
+        return self.tree_node, self._column_data
+
     def get_column_data(self, column: str) -> List[str]:
         """ Get all column items. """
         return self.header_df.loc[:, column].tolist()
@@ -156,15 +336,43 @@ class ViewModel(QStandardItemModel):
                 column_data.append(self.get_display_data_at_index(index))
         return column_data
 
+    def mark_file_modified(self) -> None:
+        """ Invalidate data derived from the source file. """
+        self._version += 1
+        self._prepared = None
+        self.invalidate_results(self.file_id)
+
+    @classmethod
+    def get_arrow_store(cls) -> "ArrowStore":
+        """ Get arrow store shared by all models. """
+        with cls._ARROW_STORE_LOCK:
+            if cls.ARROW_STORE is None:
+                from chartify.model.arrow_store import ArrowStore
+
+                cls.ARROW_STORE = ArrowStore(Path(Settings.APP_TEMP_DIR, "arrow"))
+            return cls.ARROW_STORE
+
+    @classmethod
+    def invalidate_results(cls, file_id: int) -> None:
+        """ Drop all stored results of given file. """
+        cls.RESULTS_CACHE.invalidate_file(file_id)
+        if cls.ARROW_STORE is not None:
+            cls.ARROW_STORE.invalidate_file(file_id)
+
     def count_rows(self) -> int:
-        """ Calculate total number of rows (including child rows). """
-        count = self.rowCount()
-        if not self.is_simple:
-            for i in range(self.rowCount()):
-                item = self.item(i, 0)
-                if item.hasChildren():
-                    count += item.rowCount()
-        return count
+        """ Get total number of rows (including child rows). """
+        return self._n_rows
+
+    def count_leaf_rows(self) -> int:
+        """ Get number of rows without children. """
+        return self._n_rows - self._n_parents
+
+    def clear(self) -> None:
+        """ Remove all items including headers. """
+        super().clear()
+        self._n_rows = 0
+        self._n_parents = 0
+        self._column_data = ()
 
     def needs_rebuild(self, tree_node: Optional[str]) -> bool:
         """ Check if the model needs full update. """
@@ -278,6 +486,7 @@ class ViewModel(QStandardItemModel):
                 if self.get_row_display_data(i)[1:] == ordered_variable:
                     return QItemSelectionRange(index)
 
+    @instrument
     def get_matching_selection(self, view_variables: List[VV]) -> QItemSelection:
         selection = QItemSelection()
         column_data = self.get_logical_column_data()
@@ -297,38 +506,59 @@ class ViewModel(QStandardItemModel):
         if other_model is not None:
             if self is other_model:
                 similar = False
-            else:
+            elif self.fingerprint == other_model.fingerprint:
                 count = self.count_rows()
-                diff = (count - other_model.count_rows()) / count
-                similar = self.tree_node == other_model.tree_node and abs(diff) <= rows_diff
+                other_count = other_model.count_rows()
+                if count == 0:
+                    similar = other_count == 0
+                else:
+                    similar = abs((count - other_count) / count) <= rows_diff
         return similar
 
-    def append_rows(self, rows: pd.DataFrame) -> None:
+    def create_row_items(self, row: Sequence[str], child: bool = False) -> List[QStandardItem]:
+        """ Create items for given row text, text follows logical column order. """
+        proxy_units_column = self._column_data.index(PROXY_UNITS_LEVEL)
+        source_units_column = self._column_data.index(UNITS_LEVEL)
+        item_row = []
+        for i, text in enumerate(row):
+            if i == 0 and child:
+                # first standard item is empty to avoid having parent string in the child row
+                item_row.append(QStandardItem(""))
+            elif i == proxy_units_column:
+                item_row.append(ProxyUnitsItem(text, row[source_units_column]))
+            else:
+                item_row.append(QStandardItem(text))
+        return item_row
+
+    def append_rows(self, rows: Sequence[Sequence[str]]) -> None:
         """ Append rows to the root item. """
-        for row in rows.values:
-            item_row = [QStandardItem(item) for item in row]
-            self.invisibleRootItem().appendRow(item_row)
+        for row in rows:
+            self.invisibleRootItem().appendRow(self.create_row_items(row))
+        self._n_rows += len(rows)
 
-    def append_child_rows(self, parent: QStandardItem, rows: pd.DataFrame) -> None:
+    def append_child_rows(self, parent: QStandardItem, rows: Sequence[Sequence[str]]) -> None:
         """ Append rows to given parent item. """
-        for row in rows.values:
-            # first standard item is empty to avoid having parent string in the child row
-            item_row = [QStandardItem("")]
-            for item in row[1:]:
-                item_row.append(QStandardItem(item))
-            parent.appendRow(item_row)
-
-    def append_tree_rows(self, header_df: pd.DataFrame) -> None:
+        for row in rows:
+            parent.appendRow(self.create_row_items(row, child=True))
+        self._n_rows += len(rows)
+
+    def append_tree_rows(self, groups: Sequence[Tuple[Optional[str], RowsType]]) -> None:
         """ Add rows for a tree like view. """
-        grouped = header_df.groupby(by=[header_df.columns[0]], sort=False)
-        for parent, df in grouped:
-            if len(df.index) == 1:
-                self.append_rows(df)
+        for parent, rows in groups:
+            if parent is None:
+                self.append_rows(rows)
             else:
-                parent_item = QStandardItem(parent)
+                if self.tree_node == PROXY_UNITS_LEVEL:
+                    # child rows share units, parent item represents the whole group
+                    source_units = rows[0][self._column_data.index(UNITS_LEVEL)]
+                    parent_item = ProxyUnitsItem(parent, source_units)
+                else:
+                    parent_item = QStandardItem(parent)
                 parent_item.setDragEnabled(False)
                 self.invisibleRootItem().appendRow(parent_item)
-                self.append_child_rows(parent_item, df)
+                self._n_rows += 1
+                self._n_parents += 1
+                self.append_child_rows(parent_item, rows)
 
     def create_status_tip_from_row(self, row_display_data: List[str]) -> str:
         """ Create status tip string from row text. """
@@ -351,44 +581,51 @@ class ViewModel(QStandardItemModel):
         rate_units: str,
     ) -> pd.Series:
         """ Convert original units as defined by given parameters. """
-        intermediate_units = source_units.copy()
+        # work with categories so the conversion is evaluated once per unique units
+        intermediate_units = source_units.astype("category")
         if rate_to_energy:
-            intermediate_units[intermediate_units == "W"] = "J"
-            intermediate_units[intermediate_units == "W/m2"] = "J/m2"
+            intermediate_units = intermediate_units.map(
+                lambda x: {"W": "J", "W/m2": "J/m2"}.get(x, x)
+            ).astype("category")
         conversion_dict = create_conversion_dict(
-            intermediate_units,
+            pd.Series(intermediate_units.cat.categories),
             units_system=units_system,
             rate_units=rate_units,
             energy_units=energy_units,
         )
         # no units are displayed as dash
         conversion_dict[""] = ("-", 1)
-        proxy_units = intermediate_units.copy()
+        proxy_units = intermediate_units.map(lambda x: conversion_dict.get(x, (x,))[0])
+        proxy_units = proxy_units.astype(object)
         proxy_units.name = PROXY_UNITS_LEVEL
-        # populate proxy column with new units
-        for old, v in conversion_dict.items():
-            proxy_units.loc[intermediate_units == old] = v[0]
         return proxy_units
 
+    @staticmethod
     def create_tree_compatible_header_df(
-        self, rate_to_energy: bool, units_system: str, energy_units: str, rate_units: str,
+        header_df: pd.DataFrame,
+        tree_node: Optional[str],
+        rate_to_energy: bool,
+        units_system: str,
+        energy_units: str,
+        rate_units: str,
     ) -> pd.DataFrame:
         """ Process variables header DataFrame to be compatible with treeview model. """
         # id and table data are not required
-        header_df = self.header_df.drop([ID_LEVEL, TABLE_LEVEL], axis=1)
+        header_df = header_df.drop([ID_LEVEL, TABLE_LEVEL], axis=1)
 
         # add proxy units - these will be visible on ui
-        header_df[PROXY_UNITS_LEVEL] = self.create_proxy_units_column(
-            source_units=header_df[UNITS_LEVEL],
+        conversion_look_up = ConversionLookUp.get_table(
+            header_df[UNITS_LEVEL].unique(),
             rate_to_energy=rate_to_energy,
             units_system=units_system,
             energy_units=energy_units,
             rate_units=rate_units,
         )
-        if self.tree_node:
+        header_df[PROXY_UNITS_LEVEL] = header_df[UNITS_LEVEL].map(conversion_look_up)
+        if tree_node:
             # tree column needs to be first
             new_columns = header_df.columns.tolist()
-            item = new_columns.pop(new_columns.index(self.tree_node))
+            item = new_columns.pop(new_columns.index(tree_node))
             new_columns.insert(0, item)
             header_df = header_df.loc[:, new_columns]
         return header_df
@@ -406,41 +643,138 @@ class ViewModel(QStandardItemModel):
             item.setData(data, Qt.UserRole)
             item.setData(names[data], Qt.DisplayRole)
             self.setHorizontalHeaderItem(i, item)
+        self._column_data = tuple(header_data)
 
-    def rebuild_model(
+    def get_model_parameters(
+        self,
+        tree_node: Optional[str],
+        rate_to_energy: bool,
+        units_system: str,
+        energy_units: str,
+        rate_units: str,
+    ) -> Tuple[Optional[str], bool, str, str, str]:
+        """ Adjust requested model parameters to be valid for the table. """
+        # tree node data is always None for 'Simple' views
+        tree_node = tree_node if not self.is_simple else None
+        rate_to_energy = rate_to_energy if self.allow_rate_to_energy else False
+        return tree_node, rate_to_energy, units_system, energy_units, rate_units
+
+    def get_prepare_arguments(
         self,
         tree_node: Optional[str] = None,
         rate_to_energy: bool = False,
         units_system: str = "SI",
         energy_units: str = "J",
         rate_units: str = "W",
-    ) -> None:
-        """  Create a model and set up its appearance. """
-        if self.rowCount() > 0:
-            self.clear()
+    ) -> tuple:
+        """ Collect a snapshot of data required by 'create_prepared_model'. """
+        parameters = self.get_model_parameters(
+            tree_node, rate_to_energy, units_system, energy_units, rate_units
+        )
+        return (self.header_df.copy(), self._version, *parameters)
 
-        # tree node data is always None for 'Simple' views
-        tree_node = tree_node if not self.is_simple else None
-        rate_to_energy = rate_to_energy if self.allow_rate_to_energy else False
+    @staticmethod
+    @instrument
+    def create_prepared_model(
+        header_df: pd.DataFrame,
+        version: int,
+        tree_node: Optional[str],
+        rate_to_energy: bool,
+        units_system: str,
+        energy_units: str,
+        rate_units: str,
+    ) -> PreparedModel:
+        """ Process header data into immutable rows, no items are created.
 
-        self.tree_node = tree_node
-        self.rate_to_energy = rate_to_energy
-        self.units_system = units_system
-        self.energy_units = energy_units
-        self.rate_units = rate_units
-        header_df = self.create_tree_compatible_header_df(
+        Neither the model nor the source file is accessed so
+        this can be called outside of the GUI thread.
+
+        """
+        header_df = ViewModel.create_tree_compatible_header_df(
+            header_df,
+            tree_node=tree_node,
             rate_to_energy=rate_to_energy,
             units_system=units_system,
             energy_units=energy_units,
             rate_units=rate_units,
         )
-        column_labels = header_df.columns.tolist()
-        header_df = header_df.sort_values(by=column_labels, ascending=True)
-        self.set_column_header_item_data(column_labels)
-        if self.tree_node:
-            self.append_tree_rows(header_df)
+        column_labels = tuple(header_df.columns)
+        header_df = header_df.sort_values(by=list(column_labels), ascending=True)
+        rows = tuple(header_df.itertuples(index=False, name=None))
+        if tree_node:
+            groups = []
+            # rows are sorted so the same parent rows are always consecutive
+            for parent, group in groupby(rows, key=itemgetter(0)):
+                group = tuple(group)
+                groups.append((None, group) if len(group) == 1 else (parent, group))
+            groups = tuple(groups)
         else:
-            self.append_rows(header_df)
+            groups = ((None, rows),)
+        return PreparedModel(
+            version=version,
+            tree_node=tree_node,
+            rate_to_energy=rate_to_energy,
+            units_system=units_system,
+            energy_units=energy_units,
+            rate_units=rate_units,
+            column_labels=column_labels,
+            groups=groups,
+        )
+
+    def prepare_model(
+        self,
+        tree_node: Optional[str] = None,
+        rate_to_energy: bool = False,
+        units_system: str = "SI",
+        energy_units: str = "J",
+        rate_units: str = "W",
+    ) -> PreparedModel:
+        """ Process current header data into immutable rows. """
+        parameters = self.get_model_parameters(
+            tree_node, rate_to_energy, units_system, energy_units, rate_units
+        )
+        return self.create_prepared_model(self.header_df, self._version, *parameters)
+
+    def set_prepared_model(self, prepared: PreparedModel) -> None:
+        """ Store data prepared in background to be attached on the first rebuild. """
+        if not self.initialized and prepared.version == self._version:
+            self._prepared = prepared
+
+    def attach_prepared_model(self, prepared: PreparedModel) -> None:
+        """ Create model items from prepared data. """
+        if self.rowCount() > 0:
+            self.clear()
+        self.tree_node = prepared.tree_node
+        self.rate_to_energy = prepared.rate_to_energy
+        self.units_system = prepared.units_system
+        self.energy_units = prepared.energy_units
+        self.rate_units = prepared.rate_units
+        self._proxy_units = {}
+        self.set_column_header_item_data(list(prepared.column_labels))
+        self.append_tree_rows(prepared.groups)
+
+    @instrument
+    def rebuild_model(
+        self,
+        tree_node: Optional[str] = None,
+        rate_to_energy: bool = False,
+        units_system: str = "SI",
+        energy_units: str = "J",
+        rate_units: str = "W",
+    ) -> None:
+        """  Create a model and set up its appearance. """
+        prepared = self._prepared
+        self._prepared = None
+        parameters = self.get_model_parameters(
+            tree_node, rate_to_energy, units_system, energy_units, rate_units
+        )
+        if (
+            prepared is None
+            or prepared.version != self._version
+            or prepared[1:6] != parameters
+        ):
+            prepared = self.prepare_model(*parameters)
+        self.attach_prepared_model(prepared)
 
     def create_conversion_look_up_table(
         self,
@@ -449,87 +783,49 @@ class ViewModel(QStandardItemModel):
         energy_units: str = "J",
         rate_units: str = "W",
     ) -> Dict[str, str]:
-        source_units = self.header_df[UNITS_LEVEL]
-        proxy_units = self.create_proxy_units_column(
-            source_units,
+        """ Get source units : proxy units pairs for all table units. """
+        return ConversionLookUp.get_table(
+            self.header_df[UNITS_LEVEL].unique(),
             rate_to_energy=rate_to_energy,
             units_system=units_system,
             energy_units=energy_units,
             rate_units=rate_units,
         )
-        df = pd.concat([source_units, proxy_units], axis=1)
-        # create look up dictionary with source units as keys and proxy units as values
-        df.drop_duplicates(inplace=True)
-        df.set_index(UNITS_LEVEL, inplace=True)
-        return df.loc[:, PROXY_UNITS_LEVEL].to_dict()
-
-    def update_proxy_units_parent_item(
-        self, row_number: int, conversion_look_up: Dict[str, str],
-    ) -> None:
-        """ Update proxy units parent item accordingly to conversion lok up. """
-        parent_index = self.index(row_number, 0)
-        first_child_row_data = self.get_row_display_data_mapping(0, parent_index)
-        source_units = first_child_row_data[UNITS_LEVEL]
-        proxy_units = conversion_look_up.get(source_units, source_units)
-        proxy_units_item = self.item(row_number, 0)
-        proxy_units_item.setData(proxy_units, Qt.DisplayRole)
-
-    def update_proxy_units_parent_column(self, conversion_look_up: Dict[str, str]):
-        """ Update proxy units parent column accordingly to conversion look up. """
-        proxy_units_column_number = self.get_logical_column_number(PROXY_UNITS_LEVEL)
-        source_units_column_number = self.get_logical_column_number(UNITS_LEVEL)
-        for i in range(self.rowCount()):
-            if self.item(i, 0).hasChildren():
-                self.update_proxy_units_parent_item(i, conversion_look_up)
-            else:
-                self.update_proxy_units_item(
-                    row=i,
-                    proxy_units_column=proxy_units_column_number,
-                    source_units_column=source_units_column_number,
-                    conversion_look_up=conversion_look_up,
-                    parent_index=QModelIndex(),
-                )
 
-    def update_proxy_units_item(
-        self,
-        row: int,
-        proxy_units_column: int,
-        source_units_column: int,
-        conversion_look_up: Dict[str, str],
-        parent_index: QModelIndex,
-    ) -> None:
-        """ Update proxy units item accordingly to conversion pairs and source units. """
-        source_units = self.get_display_data_at_index(
-            self.index(row, source_units_column, parent_index)
-        )
-        proxy_units_item = self.itemFromIndex(self.index(row, proxy_units_column, parent_index))
-        proxy_units = conversion_look_up.get(source_units, source_units)
-        proxy_units_item.setData(proxy_units, Qt.DisplayRole)
+    def get_proxy_units(self, source_units: str) -> str:
+        """ Get displayed units for given source units. """
+        try:
+            return self._proxy_units[source_units]
+        except KeyError:
+            self._proxy_units = ConversionLookUp.get_table(
+                [source_units],
+                rate_to_energy=self.rate_to_energy,
+                units_system=self.units_system,
+                energy_units=self.energy_units,
+                rate_units=self.rate_units,
+            )
+            return self._proxy_units[source_units]
+
+    def emit_column_data_changed(self, column: int) -> None:
+        """ Notify attached views that all column items have changed. """
+        if self.rowCount() == 0:
+            return
+        if self._n_parents == 0 or self.tree_node == PROXY_UNITS_LEVEL:
+            # child rows do not display the column
+            last_row = self.rowCount() - 1
+            self.dataChanged.emit(self.index(0, column), self.index(last_row, column))
+        else:
+            # single data changed signal cannot span multiple parents
+            self.layoutAboutToBeChanged.emit()
+            self.layoutChanged.emit()
 
     def update_proxy_units_column(self, conversion_look_up: Dict[str, str]) -> None:
         """ Update proxy units column accordingly to conversion pairs and source units. """
-        proxy_units_column_number = self.get_logical_column_number(PROXY_UNITS_LEVEL)
-        source_units_column_number = self.get_logical_column_number(UNITS_LEVEL)
-        for i in range(self.rowCount()):
-            index = self.index(i, 0)
-            if self.hasChildren(index):
-                for j in range(self.rowCount(index)):
-                    self.update_proxy_units_item(
-                        row=j,
-                        proxy_units_column=proxy_units_column_number,
-                        source_units_column=source_units_column_number,
-                        conversion_look_up=conversion_look_up,
-                        parent_index=index,
-                    )
-            else:
-                self.update_proxy_units_item(
-                    row=i,
-                    proxy_units_column=proxy_units_column_number,
-                    source_units_column=source_units_column_number,
-                    conversion_look_up=conversion_look_up,
-                    parent_index=QModelIndex(),
-                )
+        # proxy units items read displayed text from the look up table
+        self._proxy_units = conversion_look_up
+        self.emit_column_data_changed(self.get_logical_column_number(PROXY_UNITS_LEVEL))
 
+    @instrument
     def update_proxy_units(
         self,
         rate_to_energy: bool = False,
@@ -547,10 +843,7 @@ class ViewModel(QStandardItemModel):
         conversion_look_up = self.create_conversion_look_up_table(
             rate_to_energy, units_system, energy_units, rate_units
         )
-        if self.tree_node == PROXY_UNITS_LEVEL:
-            self.update_proxy_units_parent_column(conversion_look_up)
-        else:
-            self.update_proxy_units_column(conversion_look_up)
+        self.update_proxy_units_column(conversion_look_up)
 
     def set_current_status_tip(self, index: QModelIndex) -> None:
         if not self.hasChildren(index):
@@ -572,16 +865,19 @@ class ViewModel(QStandardItemModel):
     def delete_row_from_model(self, row: int, parent_index: Optional[QModelIndex]) -> None:
         """ Delete given row from model. """
         self.removeRow(row, parent_index)
+        self._n_rows -= 1
+        if parent_index.isValid() and not self.hasChildren(parent_index):
+            self._n_parents -= 1
 
     def get_row_text(self, view_variable: VV) -> List[str]:
         """ Get variable data attributes following column order. """
-        proxy_units = self.create_proxy_units_column(
-            pd.Series([view_variable.units]),
+        proxy_units = ConversionLookUp.get_proxy_units(
+            view_variable.units,
             rate_to_energy=self.rate_to_energy,
             units_system=self.units_system,
             energy_units=self.energy_units,
             rate_units=self.rate_units,
-        ).iloc[0]
+        )
         unordered_items = {**view_variable._asdict(), PROXY_UNITS_LEVEL: proxy_units}
         if self.is_simple:
             unordered_items.pop(TYPE_LEVEL)
@@ -597,12 +893,14 @@ class ViewModel(QStandardItemModel):
             tree_items = self.findItems(row_text[0], flags=Qt.MatchExactly, column=0)
             if tree_items:
                 parent = tree_items[0]
-                row_text[0] = ""
-                parent.appendRow([QStandardItem(text) for text in row_text])
+                if not parent.hasChildren():
+                    self._n_parents += 1
+                parent.appendRow(self.create_row_items(row_text, child=True))
             else:
-                self.appendRow([QStandardItem(text) for text in row_text])
+                self.appendRow(self.create_row_items(row_text))
         else:
-            self.appendRow([QStandardItem(text) for text in row_text])
+            self.appendRow(self.create_row_items(row_text))
+        self._n_rows += 1
 
     def update_row(self, view_variable: VV, row: int, parent_index: QModelIndex,) -> None:
         """ Set text on the given row. """
@@ -632,8 +930,9 @@ class ViewModel(QStandardItemModel):
     def update_variable_in_file(
         self, old_view_variable: VV, new_key: str, new_type: Optional[str]
     ) -> VariableType:
+        """ Rename variable in file, this does not update model nor derived data. """
         old_variable = convert_view_variable_to_variable(old_view_variable, self.name)
-        res = self._file_ref.rename_variable(old_variable, new_key, new_type)
+        res = self.source_file.rename_variable(old_variable, new_key, new_type)
         if res is not None:
             return res[1]
 
@@ -643,49 +942,89 @@ class ViewModel(QStandardItemModel):
         new_variable = self.update_variable_in_file(
             old_view_variable, view_variable.key, view_variable.type
         )
+        self.mark_file_modified()
         if new_variable:
             self.update_variable_in_model(old_view_variable, new_variable, row, parent_index)
 
-    def update_variable_if_exists(self, old_view_variable: VV, view_variable: VV,) -> None:
-        """ Update row identified by VV. """
+    def update_variable_in_file_if_exists(
+        self, old_view_variable: VV, view_variable: VV
+    ) -> Optional[VariableType]:
+        """ Rename variable in file, this does not update model nor derived data. """
         old_variable = convert_view_variable_to_variable(old_view_variable, self.name)
-        if self._file_ref.search_tree.variable_exists(old_variable):
-            new_variable = self.update_variable_in_file(
+        if self.variable_exists_in_file(old_variable):
+            return self.update_variable_in_file(
                 old_view_variable, view_variable.key, view_variable.type
             )
-            if self.initialized and new_variable:
-                indexes = self.get_matching_selection([old_view_variable]).indexes()
-                row = indexes[0].row()
-                parent = indexes[0].parent()
-                self.update_variable_in_model(old_view_variable, new_variable, row, parent)
+
+    def update_variable_in_model_if_initialized(
+        self, old_view_variable: VV, new_variable: Optional[VariableType]
+    ) -> None:
+        """ Update model row of the already renamed variable. """
+        if self.initialized and new_variable:
+            indexes = self.get_matching_selection([old_view_variable]).indexes()
+            row = indexes[0].row()
+            parent = indexes[0].parent()
+            self.update_variable_in_model(old_view_variable, new_variable, row, parent)
+
+    def update_variable_if_exists(self, old_view_variable: VV, view_variable: VV,) -> None:
+        """ Update row identified by VV. """
+        new_variable = self.update_variable_in_file_if_exists(old_view_variable, view_variable)
+        self.mark_file_modified()
+        self.update_variable_in_model_if_initialized(old_view_variable, new_variable)
 
     def delete_rows_from_model(self, view_variables: List[VV]):
         """ Delete given variables from model. """
         for selection_range in self.get_matching_selection(view_variables):
             parent = selection_range.parent()
             self.removeRows(selection_range.top(), selection_range.height(), parent)
+            self._n_rows -= selection_range.height()
             if parent.isValid() and not self.hasChildren(parent):
                 self.removeRow(parent.row())
+                self._n_rows -= 1
+                self._n_parents -= 1
 
-    def delete_variables(self, view_variables: List[VV]) -> None:
-        """ Delete given variables. """
-        self._file_ref.remove_variables(
+    def delete_variables_from_file(self, view_variables: List[VV]) -> None:
+        """ Delete given variables from file, this does not update model nor derived data. """
+        self.source_file.remove_variables(
             convert_view_variables_to_variables(view_variables, self.name)
         )
+
+    def delete_rows_from_model_if_initialized(self, view_variables: List[VV]) -> None:
+        """ Delete rows of already removed variables. """
         if self.initialized:
             self.delete_rows_from_model(view_variables)
 
-    def aggregate_variables(
+    def delete_variables(self, view_variables: List[VV]) -> None:
+        """ Delete given variables. """
+        self.delete_variables_from_file(view_variables)
+        self.mark_file_modified()
+        self.delete_rows_from_model_if_initialized(view_variables)
+
+    def aggregate_variables_in_file(
         self, view_variables: List[VV], func: str, new_key: str, new_type: Optional[str] = None,
-    ) -> VV:
+    ) -> Optional[VV]:
+        """ Aggregate variables in file, this does not update model nor derived data. """
         variables = convert_view_variables_to_variables(view_variables, self.name)
         with contextlib.suppress(CannotAggregateVariables):
-            _, variable = self._file_ref.aggregate_variables(variables, func, new_key, new_type)
-            view_variable = convert_variable_to_view_variable(variable)
-            if self.initialized:
-                self.add_row_to_model(view_variable)
-            return view_variable
+            _, variable = self.source_file.aggregate_variables(
+                variables, func, new_key, new_type
+            )
+            return convert_variable_to_view_variable(variable)
 
+    def add_row_to_model_if_initialized(self, view_variable: Optional[VV]) -> None:
+        """ Add row for already aggregated variable. """
+        if self.initialized and view_variable:
+            self.add_row_to_model(view_variable)
+
+    def aggregate_variables(
+        self, view_variables: List[VV], func: str, new_key: str, new_type: Optional[str] = None,
+    ) -> Optional[VV]:
+        view_variable = self.aggregate_variables_in_file(view_variables, func, new_key, new_type)
+        self.mark_file_modified()
+        self.add_row_to_model_if_initialized(view_variable)
+        return view_variable
+
+    @instrument
     def get_results(
         self,
         view_variables: List[VV],
@@ -693,7 +1032,123 @@ class ViewModel(QStandardItemModel):
         rate_units: str,
         energy_units: str,
         rate_to_energy: bool,
-    ) -> pd.DataFrame:
+    ) -> Optional[pd.DataFrame]:
+        """ Get results in given units, converted from cached raw results if possible. """
+        rate_to_energy = rate_to_energy and self.allow_rate_to_energy
+        key = self.RESULTS_CACHE.create_key(
+            self.file_id,
+            self.name,
+            frozenset(view_variables),
+            units_system,
+            rate_units,
+            energy_units,
+            rate_to_energy,
+        )
+        df = self.RESULTS_CACHE.get(key)
+        if df is None:
+            # rate to energy conversion depends on interval length, read from file
+            if not rate_to_energy:
+                raw_df = self.get_raw_results(view_variables)
+                if raw_df is not None:
+                    df = self.convert_results(raw_df, units_system, rate_units, energy_units)
+            if df is None:
+                df = self.read_results(
+                    view_variables, units_system, rate_units, energy_units, rate_to_energy
+                )
+            if df is not None:
+                self.RESULTS_CACHE.put(key, df)
+        return df
+
+    @instrument
+    def get_raw_results(self, view_variables: List[VV]) -> Optional[pd.DataFrame]:
+        """ Get results in base units, each variable is read only once.
+
+        Raw results are cached per variable so any subset or superset
+        of previously requested variables only reads missing columns.
+        Columns evicted from memory are sliced from the arrow store.
+
+        """
+        columns = {}
+        for view_variable in view_variables:
+            df = self.RESULTS_CACHE.get(self.create_raw_key(view_variable))
+            if df is not None:
+                columns[view_variable] = df
+        missing = [v for v in view_variables if v not in columns]
+        if missing:
+            arrow_store = self.get_arrow_store()
+            table_key = (self.file_id, self.name)
+            df = arrow_store.get(table_key, missing)
+            stored = self.split_results(df) if df is not None else {}
+            not_stored = [v for v in missing if v not in stored]
+            if not_stored:
+                df = self.read_results(not_stored, *RAW_UNITS)
+                if df is not None:
+                    read = self.split_results(df)
+                    arrow_store.put_async(table_key, df.copy(), list(read))
+                    stored.update(read)
+            for view_variable, column_df in stored.items():
+                self.RESULTS_CACHE.put(self.create_raw_key(view_variable), column_df)
+                columns[view_variable] = column_df
+        frames = [columns[v] for v in view_variables if v in columns]
+        return pd.concat(frames, axis=1) if frames else None
+
+    def create_raw_key(self, view_variable: VV) -> Tuple:
+        """ Create cache key of a single raw results column. """
+        return self.RESULTS_CACHE.create_key(
+            self.file_id, self.name, frozenset([view_variable]), *RAW_UNITS
+        )
+
+    @staticmethod
+    def split_results(df: pd.DataFrame) -> Dict[VV, pd.DataFrame]:
+        """ Split results table into single column tables. """
+        names = df.columns.names
+        types = (
+            df.columns.get_level_values(TYPE_LEVEL)
+            if TYPE_LEVEL in names
+            else [None] * len(df.columns)
+        )
+        view_variables = zip(
+            df.columns.get_level_values(KEY_LEVEL),
+            types,
+            df.columns.get_level_values(UNITS_LEVEL),
+        )
+        return {VV(*v): df.iloc[:, [i]] for i, v in enumerate(view_variables)}
+
+    @staticmethod
+    def convert_results(
+        df: pd.DataFrame, units_system: str, rate_units: str, energy_units: str
+    ) -> Optional[pd.DataFrame]:
+        """ Convert raw results, returns 'None' when conversion is not a plain factor. """
+        if (units_system, rate_units, energy_units) == RAW_UNITS[:3]:
+            return df
+        units = df.columns.get_level_values(UNITS_LEVEL)
+        conversion_dict = create_conversion_dict(
+            pd.Series(units.unique()),
+            units_system=units_system,
+            rate_units=rate_units,
+            energy_units=energy_units,
+        )
+        if not conversion_dict:
+            return df
+        if not all(pd.api.types.is_number(f) for _, f in conversion_dict.values()):
+            return None
+        conversion = [conversion_dict.get(u, (u, 1)) for u in units]
+        new_units, factors = zip(*conversion)
+        columns = df.columns.to_frame(index=False)
+        columns[UNITS_LEVEL] = new_units
+        converted_df = df.div(list(factors), axis=1)
+        converted_df.columns = pd.MultiIndex.from_frame(columns, names=df.columns.names)
+        return converted_df
+
+    def read_results(
+        self,
+        view_variables: List[VV],
+        units_system: str,
+        rate_units: str,
+        energy_units: str,
+        rate_to_energy: bool,
+    ) -> Optional[pd.DataFrame]:
+        """ Read results from source file. """
         variables = convert_view_variables_to_variables(view_variables, self.name)
         formatter = TableFormatter(
             file_name_position="column",
@@ -703,7 +1158,7 @@ class ViewModel(QStandardItemModel):
             timestamp_format="default",
         )
         return get_results(
-            self._file_ref,
+            self.source_file,
             variables,
             units_system=units_system,
             rate_units=rate_units,
@@ -712,10 +1167,17 @@ class ViewModel(QStandardItemModel):
             table_formatter=formatter,
         )
 
+    def variable_exists_in_file(self, variable: VariableType) -> bool:
+        """ Check if given variable exists in source file. """
+        if isinstance(self._file_ref, LazyParquetFile):
+            # avoid loading file data
+            return self._file_ref.variable_exists(variable)
+        return self._file_ref.search_tree.variable_exists(variable)
+
     def variable_exists(self, view_variable: VariableType) -> bool:
         """ Check if given variable exists in reference model and view. """
         variable = convert_view_variable_to_variable(view_variable, self.name)
-        file_check = self._file_ref.search_tree.variable_exists(variable)
+        file_check = self.variable_exists_in_file(variable)
         if self.initialized:
             selection = self.get_matching_selection([view_variable])
             ui_check = bool(selection.indexes())
@@ -762,6 +1224,8 @@ class FilterModel(QSortFilterProxyModel):
 
     def count_all_rows(self) -> int:
         """ Row count excluding parent rows. """
+        if not self.filter_dict:
+            return self.sourceModel().count_leaf_rows()
         n = 0
         for i in range(self.rowCount()):
             index = self.index(i, 0)
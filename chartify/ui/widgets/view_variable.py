@@ -0,0 +1,15 @@
+from collections import namedtuple
+from typing import List
+
+ViewVariable = namedtuple("VV", "key type units")
+VV = ViewVariable
+
+
+def stringify_view_variable(view_variable: VV) -> str:
+    return " | ".join([v for v in view_variable if v is not None])
+
+
+def is_variable_attr_identical(view_variables: List[VV], attr: str) -> bool:
+    """ Check if all variables use the same attribute text. """
+    first_attr = view_variables[0].__getattribute__(attr)
+    return all(map(lambda x: x.__getattribute__(attr) == first_attr, view_variables))
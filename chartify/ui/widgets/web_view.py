@@ -0,0 +1,21 @@
+from PySide2.QtGui import QColor
+from PySide2.QtWebEngineWidgets import QWebEnginePage, QWebEngineView
+from PySide2.QtWidgets import QWidget
+
+
+class MyPage(QWebEnginePage):
+    def __init__(self):
+        super().__init__()
+        self.setBackgroundColor(QColor("transparent"))
+
+    def javaScriptConsoleMessage(self, level, msg, line, source):
+        if "PERFORMANCE WARNING" not in msg:
+            print(f"JS >> {source} {line} {msg}")
+
+
+def create_web_view(parent: QWidget) -> QWebEngineView:
+    """ Create web view with transparent page. """
+    web_view = QWebEngineView(parent)
+    web_view.setPage(MyPage())
+    web_view.setAcceptDrops(True)
+    return web_view
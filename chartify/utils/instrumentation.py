@@ -0,0 +1,269 @@
+import atexit
+import json
+import logging
+import os
+import random
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = "CHARTIFY_INSTRUMENT"
+TRACE_FILE_ENV_VAR = "CHARTIFY_TRACE_FILE"
+
+
+def is_enabled_by_env() -> bool:
+    """ Check if instrumentation is requested by environment variable. """
+    return os.environ.get(ENV_VAR, "").lower() not in ("", "0", "false", "no")
+
+
+class Histogram:
+    """ Duration statistics of a single span name.
+
+    Count, total and maximum are exact, percentiles are
+    calculated from a bounded reservoir of samples.
+
+    """
+
+    MAX_SAMPLES = 10000
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.self_total = 0.0
+        self.max = 0.0
+        self.samples = []
+
+    def add(self, duration: float, self_duration: float) -> None:
+        """ Record a single span duration. """
+        self.count += 1
+        self.total += duration
+        self.self_total += self_duration
+        self.max = max(self.max, duration)
+        if len(self.samples) < self.MAX_SAMPLES:
+            self.samples.append(duration)
+        else:
+            i = random.randrange(self.count)
+            if i < self.MAX_SAMPLES:
+                self.samples[i] = duration
+
+    def percentile(self, q: float) -> float:
+        """ Get duration percentile, 'q' is a fraction in range 0.0-1.0. """
+        if not self.samples:
+            return 0.0
+        samples = sorted(self.samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "self": self.self_total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": self.max,
+        }
+
+
+class NullSpan:
+    """ Span doing nothing, used when instrumentation is disabled. """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    """ Timed block of code, nested spans are subtracted from 'self' time. """
+
+    __slots__ = ("name", "args", "start", "children")
+
+    def __init__(self, name: str, args: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.args = args
+        self.start = 0.0
+        self.children = 0.0
+
+    def __enter__(self):
+        Instrumentation.get_stack().append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        end = time.perf_counter()
+        stack = Instrumentation.get_stack()
+        stack.pop()
+        duration = end - self.start
+        if stack:
+            stack[-1].children += duration
+        Instrumentation.record(self.name, self.start, duration, self.children, self.args)
+        return False
+
+
+class Instrumentation:
+    """ Collect timings of instrumented functions and code blocks.
+
+    Instrumentation is enabled by 'CHARTIFY_INSTRUMENT' environment
+    variable (or 'enable' class method), functions decorated by
+    'instrument' while disabled are left untouched so there is no
+    overhead at all.
+
+    When 'CHARTIFY_TRACE_FILE' is set, recorded spans are exported
+    as Chrome trace (chrome://tracing, Perfetto) on interpreter exit.
+
+    """
+
+    ENABLED = is_enabled_by_env()
+    START = time.perf_counter()
+    MAX_EVENTS = 1000000
+
+    _lock = threading.Lock()
+    _local = threading.local()
+    _histograms: Dict[str, Histogram] = {}
+    _events: List[Dict[str, Any]] = []
+
+    @classmethod
+    def enable(cls) -> None:
+        cls.ENABLED = True
+
+    @classmethod
+    def disable(cls) -> None:
+        cls.ENABLED = False
+
+    @classmethod
+    def reset(cls) -> None:
+        """ Drop all recorded data. """
+        with cls._lock:
+            cls._histograms = {}
+            cls._events = []
+            cls.START = time.perf_counter()
+
+    @classmethod
+    def get_stack(cls) -> List[Span]:
+        """ Get currently open spans of calling thread. """
+        try:
+            return cls._local.stack
+        except AttributeError:
+            cls._local.stack = []
+            return cls._local.stack
+
+    @classmethod
+    def span(cls, name: str, **kwargs) -> Union[Span, NullSpan]:
+        """ Time a block of code, extra kwargs are stored as trace event args. """
+        return Span(name, kwargs or None) if cls.ENABLED else NULL_SPAN
+
+    @classmethod
+    def record(
+        cls,
+        name: str,
+        start: float,
+        duration: float,
+        children: float = 0.0,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """ Store a finished span. """
+        with cls._lock:
+            try:
+                histogram = cls._histograms[name]
+            except KeyError:
+                histogram = cls._histograms[name] = Histogram()
+            histogram.add(duration, duration - children)
+            if len(cls._events) < cls.MAX_EVENTS:
+                event = {
+                    "name": name,
+                    "cat": "chartify",
+                    "ph": "X",
+                    "ts": (start - cls.START) * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                }
+                if args:
+                    event["args"] = args
+                cls._events.append(event)
+
+    @classmethod
+    def get_stats(cls) -> Dict[str, Dict[str, float]]:
+        """ Get duration statistics (in seconds) for all recorded names. """
+        with cls._lock:
+            return {name: h.as_dict() for name, h in cls._histograms.items()}
+
+    @classmethod
+    def format_stats(cls) -> str:
+        """ Get statistics as table sorted by total time. """
+        stats = sorted(cls.get_stats().items(), key=lambda x: x[1]["total"], reverse=True)
+        lines = [
+            f"{'name':<50} {'count':>8} {'total ms':>10} {'self ms':>10} "
+            f"{'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"
+        ]
+        for name, s in stats:
+            lines.append(
+                f"{name[-50:]:<50} {s['count']:>8} {s['total'] * 1000:>10.2f} "
+                f"{s['self'] * 1000:>10.2f} {s['p50'] * 1000:>9.3f} "
+                f"{s['p95'] * 1000:>9.3f} {s['max'] * 1000:>9.3f}"
+            )
+        return "\n".join(lines)
+
+    @classmethod
+    def export_stats(cls, path: Union[str, Path]) -> None:
+        """ Write statistics as JSON. """
+        with open(path, "w") as f:
+            json.dump(cls.get_stats(), f, indent=4)
+
+    @classmethod
+    def export_chrome_trace(cls, path: Union[str, Path]) -> None:
+        """ Write recorded spans in Chrome trace event format. """
+        with cls._lock:
+            events = list(cls._events)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    @classmethod
+    def report(cls) -> None:
+        """ Log statistics and export trace file if requested. """
+        if not cls._histograms:
+            return
+        logger.info("Instrumentation summary:\n%s", cls.format_stats())
+        path = os.environ.get(TRACE_FILE_ENV_VAR)
+        if path:
+            cls.export_chrome_trace(path)
+            logger.info("Trace written to '%s'.", path)
+
+
+def instrument(func: Optional[Callable] = None, *, name: Optional[str] = None) -> Callable:
+    """ Record duration of each call of decorated function.
+
+    Function is returned unchanged when instrumentation is
+    disabled at the time the decorator is applied.
+
+    """
+
+    def decorator(f: Callable) -> Callable:
+        if not Instrumentation.ENABLED:
+            return f
+        span_name = name or f"{f.__module__}.{f.__qualname__}"
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if not Instrumentation.ENABLED:
+                return f(*args, **kwargs)
+            with Span(span_name):
+                return f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+atexit.register(lambda: Instrumentation.report() if Instrumentation.ENABLED else None)
@@ -1,12 +1,44 @@
 import time
+from contextlib import contextmanager
+from typing import List, Tuple
 
 
-def profile(func):
-    def inner_func(*args, **kwargs):
-        s = time.perf_counter()
-        res = func(*args, **kwargs)
-        e = time.perf_counter()
-        print(f"Func: {func.__name__} - time: '{e - s}'s")
-        return res
+class Timeline:
+    """ Record durations of sequential phases (e.g. application startup).
 
-    return inner_func
+    Phases are only recorded when the timeline is enabled,
+    otherwise 'phase' context manager does nothing.
+
+    """
+
+    ENABLED = False
+    START = time.perf_counter()
+    PHASES: List[Tuple[str, float, float]] = []
+
+    @classmethod
+    def enable(cls) -> None:
+        cls.ENABLED = True
+
+    @classmethod
+    @contextmanager
+    def phase(cls, name: str) -> None:
+        if not cls.ENABLED:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls.PHASES.append((name, start - cls.START, time.perf_counter() - start))
+
+    @classmethod
+    def mark(cls, name: str) -> None:
+        """ Record a point in time. """
+        if cls.ENABLED:
+            cls.PHASES.append((name, time.perf_counter() - cls.START, 0))
+
+    @classmethod
+    def print_timeline(cls) -> None:
+        print("Startup timeline:")
+        for name, start, duration in cls.PHASES:
+            print(f"\t{start * 1000:8.1f} ms  +{duration * 1000:8.1f} ms  {name}")
@@ -1,9 +1,6 @@
 import os
 from random import randint
 
-import pandas as pd
-from esofile_reader.processing.totals import AVERAGED_UNITS
-
 
 def install_fonts(pth, database):
     files = os.listdir(pth)
@@ -34,6 +31,9 @@ def generate_ids(used_ids, n=1, max_id=99999):
 
 def calculate_totals(df):
     """ Calculate df sum or average (based on units). """
+    import pandas as pd
+    from esofile_reader.processing.totals import AVERAGED_UNITS
+
     units = df.columns.get_level_values("units")
     cnd = units.isin(AVERAGED_UNITS)
 
@@ -45,6 +45,14 @@ def calculate_totals(df):
     return sr
 
 
+def calculate_timestamps(df):
+    """ Get df index as an array of POSIX timestamps. """
+    import numpy as np
+
+    index = df.index.to_pydatetime()
+    return np.fromiter((dt.timestamp() for dt in index), dtype=np.float64, count=len(index))
+
+
 def generate_id(used_ids, max_id=99999):
     """ Create a single unique id. """
     return generate_ids(used_ids, n=1, max_id=max_id)[0]
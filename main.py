@@ -1,36 +1,83 @@
 import logging
+import shutil
 import sys
 from pathlib import Path
-import shutil
-from PySide2.QtGui import QFontDatabase
-from PySide2.QtWidgets import QApplication
 
-from chartify.controller.app_controller import AppController
-from chartify.controller.wv_controller import WVController
-from chartify.model.model import AppModel
-from chartify.settings import Settings
-from chartify.ui.main_window import MainWindow
-from chartify.utils.utils import install_fonts
+from chartify.utils.instrumentation import Instrumentation
+from chartify.utils.tiny_profiler import Timeline
+
+
+def main(argv):
+    if "--profile-startup" in argv:
+        Timeline.enable()
+    if "--instrument" in argv:
+        # needs to be enabled before application modules get imported
+        Instrumentation.enable()
+    if len(argv) > 1 and argv[1] == "export":
+        from chartify.controller.batch_export import main as export_main
+
+        # headless batch export, no widgets or web engine are created
+        return export_main(argv[2:])
+
+    with Timeline.phase("import Qt"):
+        from PySide2.QtCore import QCoreApplication, QTimer, Qt
+        from PySide2.QtGui import QFontDatabase
+        from PySide2.QtWidgets import QApplication
+
+    with Timeline.phase("import application"):
+        from chartify.controller.app_controller import AppController
+        from chartify.controller.wv_controller import WVController
+        from chartify.model.model import AppModel
+        from chartify.settings import Settings
+        from chartify.ui.main_window import MainWindow
+        from chartify.utils.utils import install_fonts
 
-if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
     shutil.rmtree(Settings.APP_TEMP_DIR, ignore_errors=True)
     Settings.APP_TEMP_DIR.mkdir()
 
     root = Path(__file__).parent
-    app = QApplication()
+    with Timeline.phase("create application"):
+        # web engine is imported after the application is created
+        QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+        app = QApplication()
+
+    with Timeline.phase("install fonts"):
+        db = QFontDatabase()
+        install_fonts(str(Path(root, "resources/fonts")), db)
+        db.addApplicationFont(str(Path(root, "resources/fonts/Roboto-Regular.ttf")))
+
+    with Timeline.phase("load settings"):
+        Settings.load_settings_from_json()
+
+    with Timeline.phase("create main window"):
+        view = MainWindow()
+    with Timeline.phase("create model"):
+        model = AppModel()
+    with Timeline.phase("create web view controller"):
+        wv_controller = WVController(model, view.create_web_view, view.fetch_results)
+    with Timeline.phase("create controller"):
+        controller = AppController(model, view, wv_controller)
+    with Timeline.phase("show main window"):
+        view.show()
 
-    db = QFontDatabase()
-    install_fonts(str(Path(root, "resources/fonts")), db)
-    db.addApplicationFont(str(Path(root, "resources/fonts/Roboto-Regular.ttf")))
+    # web view page is loaded once the main window is displayed
+    QTimer.singleShot(0, wv_controller.load_url)
+    # other color schemes are prepared in background for instant switching
+    QTimer.singleShot(0, view.prerender_palettes)
+    if Timeline.ENABLED:
+        QTimer.singleShot(0, lambda: Timeline.mark("event loop started"))
 
-    Settings.load_settings_from_json()
+        def connect_web_view():
+            # web view is created when the page starts loading
+            wv_controller.wv.loadFinished.connect(lambda _: Timeline.mark("web view loaded"))
+            wv_controller.wv.loadFinished.connect(lambda _: Timeline.print_timeline())
 
-    view = MainWindow()
-    model = AppModel()
-    wv_controller = WVController(model, view.web_view)
-    controller = AppController(model, view, wv_controller)
-    view.show()
+        QTimer.singleShot(0, connect_web_view)
 
-    sys.exit(app.exec_())
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,206 @@
+import json
+import os
+import re
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from tests.conftest import ROOT
+
+# benchmarks must be able to run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BENCHMARK_ENV_VAR = "CHARTIFY_BENCHMARK"
+SAVE_BASELINE_ENV_VAR = "CHARTIFY_BENCHMARK_SAVE_BASELINE"
+TOLERANCE_ENV_VAR = "CHARTIFY_BENCHMARK_TOLERANCE"
+BASELINE_NAME_ENV_VAR = "CHARTIFY_BENCHMARK_BASELINE"
+
+# results of each run are not tracked, baselines are committed
+BENCHMARK_DIR = Path(ROOT.parent, ".benchmarks")
+BASELINE_DIR = Path(Path(__file__).parent, "baselines")
+
+# one line summary of each benchmark, reported at the end of the session
+SUMMARY: List[str] = []
+
+
+def pytest_collection_modifyitems(config, items):
+    # benchmarks are slow, run them only when explicitly requested
+    if os.environ.get(BENCHMARK_ENV_VAR):
+        return
+    skip = pytest.mark.skip(reason=f"set '{BENCHMARK_ENV_VAR}=1' to run benchmarks")
+    for item in items:
+        if Path(__file__).parent in Path(item.fspath).parents:
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if SUMMARY:
+        terminalreporter.write_sep("-", "benchmarks")
+        for line in SUMMARY:
+            terminalreporter.write_line(line)
+
+
+def get_baseline_path(module: str) -> Path:
+    """ Get baseline file, named baselines (e.g. release versions) use a subdirectory. """
+    name = os.environ.get(BASELINE_NAME_ENV_VAR)
+    if not name:
+        return Path(BASELINE_DIR, f"{module}.json")
+    # named baselines need to stay in tracked baseline directory
+    if not re.fullmatch(r"\w[\w.-]*", name):
+        raise ValueError(
+            f"Invalid baseline name '{name}', use letters, digits, '_', '-' or '.'."
+        )
+    return Path(BASELINE_DIR, name, f"{module}.json")
+
+
+def read_results(path: Path) -> Dict[str, Dict[str, float]]:
+    """ Read stored benchmark results. """
+    if path.exists():
+        with open(path, "r") as f:
+            return json.load(f)
+    return {}
+
+
+def write_results(path: Path, results: Dict[str, Dict[str, float]]) -> None:
+    """ Merge given results into stored ones. """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stored = read_results(path)
+    stored.update(results)
+    with open(path, "w") as f:
+        json.dump(stored, f, indent=4, sort_keys=True)
+
+
+class Benchmark:
+    """ Time given function and compare it against stored baseline.
+
+    Results of all benchmarks in a module are written into
+    '.benchmarks/<module>.json', when 'CHARTIFY_BENCHMARK_SAVE_BASELINE'
+    is set, these are also stored as a baseline in
+    'tests/benchmarks/baselines/<module>.json'. Benchmarks slower
+    than baseline median by more than 'CHARTIFY_BENCHMARK_TOLERANCE'
+    (default 0.25) fail. 'CHARTIFY_BENCHMARK_BASELINE' can name
+    the baseline so results of each release can be kept, these
+    are stored in 'tests/benchmarks/baselines/<name>/<module>.json'.
+
+    Peak memory is measured by 'tracemalloc' in a separate round
+    as tracing slows down the execution considerably. Median
+    of each benchmark is reported in the terminal summary.
+
+    Attributes & Parameters
+    -----------------------
+    name : str
+        Benchmark name, test id is used by default.
+    results : dict
+        Results of current module.
+    baseline : dict
+        Baseline results of current module.
+    extra_info : dict
+        Additional measurements stored along timing statistics.
+
+    """
+
+    def __init__(self, name: str, results: Dict[str, Dict[str, float]], baseline: dict):
+        self.name = name
+        self.results = results
+        self.baseline = baseline
+        self.extra_info = {}
+
+    def check_regression(self, stats: Dict[str, float]) -> None:
+        """ Fail when benchmark is slower than baseline. """
+        if self.name not in self.baseline:
+            return
+        tolerance = float(os.environ.get(TOLERANCE_ENV_VAR, 0.25))
+        baseline_median = self.baseline[self.name]["median"]
+        if stats["median"] > baseline_median * (1 + tolerance):
+            pytest.fail(
+                f"Benchmark '{self.name}' regressed: median {stats['median'] * 1000:.3f} ms, "
+                f"baseline {baseline_median * 1000:.3f} ms."
+            )
+
+    @staticmethod
+    def measure_peak_memory(func: Callable, args: tuple, kwargs: dict) -> int:
+        """ Get peak size of memory blocks allocated by 'func' in bytes. """
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return peak
+
+    def __call__(
+        self,
+        func: Callable,
+        *args,
+        rounds: int = 5,
+        warmup: int = 1,
+        setup: Optional[Callable[[], Tuple[tuple, dict]]] = None,
+        trace_memory: bool = False,
+        n_items: Optional[int] = None,
+        **kwargs,
+    ) -> Any:
+        """ Run 'func' repeatedly, 'setup' can provide fresh arguments for each round.
+
+        When 'n_items' is given, throughput (items per second)
+        is calculated from the median duration.
+
+        """
+        durations = []
+        res = None
+        for i in range(warmup + rounds):
+            if setup:
+                args, kwargs = setup()
+            start = time.perf_counter()
+            res = func(*args, **kwargs)
+            duration = time.perf_counter() - start
+            if i >= warmup:
+                durations.append(duration)
+        stats = {
+            "rounds": rounds,
+            "min": min(durations),
+            "max": max(durations),
+            "mean": statistics.mean(durations),
+            "median": statistics.median(durations),
+            **self.extra_info,
+        }
+        message = f"{self.name}: median {stats['median'] * 1000:.3f} ms"
+        if n_items is not None:
+            stats["throughput"] = n_items / stats["median"]
+            message += f", {stats['throughput']:.1f} items/s"
+        if trace_memory:
+            if setup:
+                args, kwargs = setup()
+            stats["peak_memory"] = self.measure_peak_memory(func, args, kwargs)
+            message += f", peak memory {stats['peak_memory'] / 1024 ** 2:.2f} MB"
+        self.results[self.name] = stats
+        SUMMARY.append(message)
+        self.check_regression(stats)
+        return res
+
+
+@pytest.fixture(scope="module")
+def benchmark_results(request):
+    module = Path(request.node.fspath).stem
+    results = {}
+    yield results
+    if results:
+        write_results(Path(BENCHMARK_DIR, f"{module}.json"), results)
+        if os.environ.get(SAVE_BASELINE_ENV_VAR):
+            write_results(get_baseline_path(module), results)
+
+
+@pytest.fixture(scope="module")
+def benchmark_baseline(request):
+    module = Path(request.node.fspath).stem
+    if os.environ.get(SAVE_BASELINE_ENV_VAR):
+        return {}
+    return read_results(get_baseline_path(module))
+
+
+@pytest.fixture
+def chartify_benchmark(request, benchmark_results, benchmark_baseline):
+    return Benchmark(request.node.name, benchmark_results, benchmark_baseline)
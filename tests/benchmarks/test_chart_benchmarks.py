@@ -0,0 +1,154 @@
+import random
+from typing import List, Tuple
+
+import pytest
+from esofile_reader.constants import TS, H, D, M
+
+from chartify.charts.chart import Chart
+from chartify.charts.chart_functions import (
+    create_2d_axis_map,
+    set_axes_position,
+    gen_domains,
+    pie_chart,
+    transform_trace,
+)
+from chartify.charts.trace import Trace1D, Trace2D, TraceData
+
+N_TRACES = [10, 100, 1000, 5000]
+N_UNITS = [1, 8]
+INTERVALS = [(H,), (TS, H, D, M)]
+SHARED = [(False, True), (True, False)]
+CHART_TYPES = ["scatter", "bar", "histogram", "box", "pie"]
+
+UNITS = ["W", "kWh", "J", "kW", "%", "C", "Pa", "m3/s"] + [f"unit-{i}" for i in range(32)]
+N_VALUES = {TS: 2976, H: 744, D: 31, M: 12}
+INTERVAL_SECONDS = {TS: 900, H: 3600, D: 86400, M: 2678400}
+
+
+def create_trace_data(n_traces: int, n_units: int, intervals: Tuple[str]) -> List[TraceData]:
+    """ Create synthetic trace data, values are shared between traces of an interval. """
+    rnd = random.Random(0)
+    values = {i: [rnd.random() for _ in range(N_VALUES[i])] for i in intervals}
+    timestamps = {i: [n * INTERVAL_SECONDS[i] for n in range(N_VALUES[i])] for i in intervals}
+    trace_data = []
+    for n in range(n_traces):
+        interval = intervals[n % len(intervals)]
+        units = UNITS[n % n_units]
+        trace_data.append(
+            TraceData(
+                "item-0",
+                f"trace-data-{n}",
+                f"trace {n}",
+                values[interval],
+                rnd.random() * 1000,
+                units,
+                timestamps=timestamps[interval],
+                interval=interval,
+            )
+        )
+    return trace_data
+
+
+def create_1d_traces(trace_data: List[TraceData]) -> List[Trace1D]:
+    traces = []
+    for n, trace_dt in enumerate(trace_data):
+        trace = Trace1D(trace_dt.name, "item-0", f"trace-{n}", f"#{n:06x}", "pie")
+        trace.ref = trace_dt
+        trace.selected = n % 10 == 0
+        traces.append(trace)
+    return traces
+
+
+def create_2d_traces(trace_data: List[TraceData]) -> List[Trace2D]:
+    traces = []
+    for n, trace_dt in enumerate(trace_data):
+        trace = Trace2D(trace_dt.name, "item-0", f"trace-{n}", f"#{n:06x}", "scatter")
+        trace.x_ref = "datetime"
+        trace.y_ref = trace_dt
+        trace.selected = n % 10 == 0
+        traces.append(trace)
+    return traces
+
+
+def interval_id(intervals: Tuple[str]) -> str:
+    return "-".join(intervals)
+
+
+@pytest.mark.parametrize("n_traces", N_TRACES)
+@pytest.mark.parametrize("n_units", N_UNITS)
+@pytest.mark.parametrize("intervals", INTERVALS, ids=interval_id)
+@pytest.mark.parametrize("shared_x", [False, True])
+def test_create_2d_axis_map(chartify_benchmark, n_traces, n_units, intervals, shared_x):
+    traces = create_2d_traces(create_trace_data(n_traces, n_units, intervals))
+    axes_map = chartify_benchmark(
+        create_2d_axis_map, traces, group_datetime=True, shared_x=shared_x
+    )
+    assert axes_map
+
+
+@pytest.mark.parametrize("n_units", [1, 8, 32])
+@pytest.mark.parametrize("intervals", INTERVALS, ids=interval_id)
+@pytest.mark.parametrize("shared_x,shared_y", [(False, False), *SHARED, (True, True)])
+def test_set_axes_position(chartify_benchmark, n_units, intervals, shared_x, shared_y):
+    traces = create_2d_traces(create_trace_data(1000, n_units, intervals))
+
+    def setup():
+        axes_map = create_2d_axis_map(traces, group_datetime=True, shared_x=shared_x)
+        return (axes_map, shared_x, shared_y), {}
+
+    chartify_benchmark(set_axes_position, setup=setup, rounds=20)
+
+
+@pytest.mark.parametrize("n", [1, 10, 100, 1000])
+@pytest.mark.parametrize("square", [False, True])
+def test_gen_domains(chartify_benchmark, n, square):
+    x_domains, y_domains = chartify_benchmark(gen_domains, n, square=square, rounds=20)
+    assert len(x_domains) == len(y_domains) == n
+
+
+@pytest.mark.parametrize("n_traces", N_TRACES)
+@pytest.mark.parametrize("n_units", N_UNITS)
+@pytest.mark.parametrize("intervals", INTERVALS, ids=interval_id)
+@pytest.mark.parametrize("shared_x,shared_y", SHARED)
+def test_chart_as_plotly(chartify_benchmark, n_traces, n_units, intervals, shared_x, shared_y):
+    traces = create_2d_traces(create_trace_data(n_traces, n_units, intervals))
+    chart = Chart("item-0", "chart-0", "scatter")
+    chart.shared_x = shared_x
+    chart.shared_y = shared_y
+    chart.geometry = {"w": 800, "h": 600}
+    colors = ["rgb(0, 0, 0)"] * 5
+    plot = chartify_benchmark(chart.as_plotly, traces, *colors)
+    assert len(plot["data"]) == n_traces
+
+
+@pytest.mark.parametrize("n_traces", N_TRACES)
+@pytest.mark.parametrize("n_units", N_UNITS)
+def test_chart_as_plotly_pie(chartify_benchmark, n_traces, n_units):
+    traces = create_1d_traces(create_trace_data(n_traces, n_units, (H,)))
+    chart = Chart("item-0", "chart-0", "pie")
+    colors = ["rgb(0, 0, 0)"] * 5
+    plot = chartify_benchmark(chart.as_plotly, traces, *colors)
+    assert len(plot["data"]) == n_units
+
+
+@pytest.mark.parametrize("n_traces", N_TRACES)
+@pytest.mark.parametrize("n_units", N_UNITS)
+def test_pie_chart(chartify_benchmark, n_traces, n_units):
+    traces = create_1d_traces(create_trace_data(n_traces, n_units, (H,)))
+    data = chartify_benchmark(pie_chart, traces, "rgb(255, 255, 255)", max_columns=3)
+    assert len(data) == n_units
+
+
+@pytest.mark.parametrize("n_traces", N_TRACES)
+@pytest.mark.parametrize("type_", CHART_TYPES)
+def test_transform_trace(chartify_benchmark, n_traces, type_):
+    trace_data = create_trace_data(n_traces, 8, (TS, H, D, M))
+
+    def setup():
+        return (create_1d_traces(trace_data), type_), {}
+
+    def transform_all(traces, chart_type):
+        return [transform_trace(trace, chart_type) for trace in traces]
+
+    traces = chartify_benchmark(transform_all, setup=setup)
+    assert len(traces) == n_traces
@@ -0,0 +1,41 @@
+from typing import List
+
+import pytest
+
+from chartify.settings import Settings
+from chartify.ui.css_theme import CssTemplate, Palette
+from tests.utils.test_css_theme import legacy_parse_css
+
+PALETTES = Palette.parse_palettes(Settings.PALETTE_PATH)
+
+
+@pytest.fixture(scope="module")
+def css_lines() -> List[str]:
+    css_paths = sorted(p for p in Settings.CSS_DIR.iterdir() if p.suffix == ".css")
+    lines = []
+    for path in css_paths:
+        with open(path, "r") as f:
+            lines.extend(f.readlines())
+    return lines
+
+
+def test_compile_template(chartify_benchmark, css_lines):
+    template = chartify_benchmark(CssTemplate.compile, css_lines, Palette.COLORS, rounds=20)
+    assert template.segments
+
+
+@pytest.mark.parametrize("name", sorted(PALETTES))
+def test_legacy_parse(chartify_benchmark, qtbot, tmpdir, css_lines, name):
+    palette = PALETTES[name]
+    css, _ = chartify_benchmark(
+        legacy_parse_css, css_lines, palette, Settings.SOURCE_ICONS_DIR, tmpdir
+    )
+    assert css
+
+
+@pytest.mark.parametrize("name", sorted(PALETTES))
+def test_render_template(chartify_benchmark, qtbot, tmpdir, css_lines, name):
+    palette = PALETTES[name]
+    template = CssTemplate.compile(css_lines, Palette.COLORS)
+    css, _ = chartify_benchmark(template.render, palette, Settings.SOURCE_ICONS_DIR, tmpdir)
+    assert css
@@ -0,0 +1,305 @@
+import itertools
+import queue
+import random
+import tempfile
+import threading
+from copy import copy
+from pathlib import Path
+from typing import List
+
+import pytest
+from esofile_reader import GenericFile
+from esofile_reader.df.level_names import KEY_LEVEL, TYPE_LEVEL, UNITS_LEVEL
+from esofile_reader.pqt.parquet_storage import ParquetStorage
+
+from chartify.controller.file_processing import load_file, store_file
+from chartify.controller.progress_logging import UiLogger, ERROR
+from chartify.ui.widgets.treeview_model import ViewModel, FilterModel, VV
+from tests.conftest import (
+    ESO_FILE1_PATH,
+    ESO_FILE_ALL_INTERVALS_PATH,
+    EXCEL_FILE_PATH,
+    ESO_FILE_EXCEL_PATH,
+    wait_for_views,
+)
+
+FIXTURE_PATHS = [
+    EXCEL_FILE_PATH,
+    ESO_FILE_EXCEL_PATH,
+    ESO_FILE1_PATH,
+    ESO_FILE_ALL_INTERVALS_PATH,
+]
+
+# number of keys and number of simulated days of synthetic files
+SCALES = [(10, 31), (100, 31), (400, 31), (100, 365)]
+
+TYPES = [
+    ("Zone Mean Air Temperature", "C"),
+    ("Zone Air Relative Humidity", "%"),
+    ("Zone Lights Electric Power", "W"),
+    ("Zone Lights Electric Energy", "J"),
+    ("Zone Infiltration Volume Flow Rate", "m3/s"),
+]
+DAY_TYPES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MONTH_DAYS = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+ESO_HEADER = [
+    "Program Version,EnergyPlus, Version 8.9.0-40101eaafd, YMD=2020.01.06 08:24",
+    "1,5,Environment Title[],Latitude[deg],Longitude[deg],Time Zone[],Elevation[m]",
+    "2,8,Day of Simulation[],Month[],Day of Month[],DST Indicator[1=yes 0=no],Hour[],"
+    "StartMinute[],EndMinute[],DayType",
+    "3,5,Cumulative Day of Simulation[],Month[],Day of Month[],DST Indicator[1=yes 0=no],"
+    "DayType  ! When Daily Report Variables Requested",
+    "4,2,Cumulative Days of Simulation[],Month[]  ! When Monthly Report Variables Requested",
+    "5,1,Cumulative Days of Simulation[] ! When Run Period Report Variables Requested",
+    "6,1,Calendar Year of Simulation[] ! When Annual Report Variables Requested",
+]
+DAILY_FIELDS = "[Value,Min,Hour,Minute,Max,Hour,Minute]"
+
+
+def iter_days(n_days: int):
+    """ Generate (day of simulation, month, day of month, day type) tuples. """
+    day = 0
+    for month, month_days in itertools.cycle(enumerate(MONTH_DAYS, start=1)):
+        for day_of_month in range(1, month_days + 1):
+            if day == n_days:
+                return
+            yield day + 1, month, day_of_month, DAY_TYPES[day % 7]
+            day += 1
+
+
+def write_synthetic_eso(path: Path, n_keys: int, n_days: int) -> Path:
+    """ Write eso file reporting all types for each key both hourly and daily. """
+    rnd = random.Random(0)
+    hourly_ids = []
+    daily_ids = []
+    id_ = 7
+    with open(path, "w") as f:
+        f.writelines(f"{line}\n" for line in ESO_HEADER)
+        for i in range(n_keys):
+            for type_, units in TYPES:
+                f.write(f"{id_},1,ZONE {i},{type_} [{units}] !Hourly\n")
+                f.write(f"{id_ + 1},7,ZONE {i},{type_} [{units}] !Daily {DAILY_FIELDS}\n")
+                hourly_ids.append(id_)
+                daily_ids.append(id_ + 1)
+                id_ += 2
+        f.write("End of Data Dictionary\n")
+        f.write("1,RUN PERIOD 1,  50.10,  14.25,   1.00, 270.00\n")
+        n_records = 1
+        for day, month, day_of_month, day_type in iter_days(n_days):
+            date = f"{day},{month:>2},{day_of_month:>2}, 0"
+            for hour in range(1, 25):
+                f.write(f"2,{date},{hour:>2}, 0.00,60.00,{day_type}\n")
+                f.writelines(f"{i},{rnd.random() * 100:.4f}\n" for i in hourly_ids)
+                n_records += len(hourly_ids) + 1
+            f.write(f"3,{date},{day_type}\n")
+            f.writelines(
+                f"{i},{rnd.random() * 100:.4f},0.0, 1,60,100.0,24,60\n" for i in daily_ids
+            )
+            n_records += len(daily_ids) + 1
+        f.write("End of Data\n")
+        f.write(f" Number of Records Written={n_records:>12}\n")
+    return path
+
+
+def scale_id(scale):
+    return "keys{}-days{}".format(*scale)
+
+
+def count_variables(file: GenericFile) -> int:
+    return sum(len(file.get_header_df(table)) for table in file.table_names)
+
+
+def get_view_variables(model: ViewModel) -> List[VV]:
+    """ Get all variables included in the model table. """
+    header_df = model.header_df
+    types = [None] * len(header_df) if model.is_simple else header_df[TYPE_LEVEL]
+    return [VV(*v) for v in zip(header_df[KEY_LEVEL], types, header_df[UNITS_LEVEL])]
+
+
+def create_view_model(file: GenericFile, table: str, tree_node=None) -> ViewModel:
+    model = ViewModel(table, file)
+    model.rebuild_model(tree_node=tree_node)
+    return model
+
+
+@pytest.fixture(scope="module")
+def synthetic_eso_files(tmp_path_factory):
+    root = tmp_path_factory.mktemp("synthetic")
+    return {
+        scale: write_synthetic_eso(Path(root, f"{scale_id(scale)}.eso"), *scale)
+        for scale in SCALES
+    }
+
+
+@pytest.fixture(scope="module")
+def synthetic_files(synthetic_eso_files):
+    return {
+        scale: GenericFile.from_eplus_file(path) for scale, path in synthetic_eso_files.items()
+    }
+
+
+@pytest.fixture(params=SCALES[:3], ids=scale_id)
+def synthetic_file(request, synthetic_files):
+    copied_file = copy(synthetic_files[request.param])
+    copied_file.id_ = 0  # mock id attribute
+    return copied_file
+
+
+def run_load_file(path: Path, workdir: Path) -> list:
+    """ Process file in the current process, return stored files. """
+    progress_queue = queue.Queue()
+    file_queue = queue.Queue()
+    load_file(path, workdir, progress_queue, file_queue, [], threading.Lock())
+    errors = [msg for _, identifier, msg in progress_queue.queue if identifier == ERROR]
+    assert not errors, errors
+    return list(file_queue.queue)
+
+
+class TestIngestion:
+    @pytest.mark.parametrize("path", FIXTURE_PATHS, ids=lambda p: p.name)
+    def test_load_file(self, chartify_benchmark, tmp_path, path):
+        if not path.exists():
+            pytest.skip(f"Test file '{path.name}' is not available.")
+
+        def setup():
+            return (path, Path(tempfile.mkdtemp(dir=tmp_path))), {}
+
+        files = chartify_benchmark(run_load_file, setup=setup, trace_memory=True)
+        assert files
+
+    @pytest.mark.parametrize("scale", SCALES, ids=scale_id)
+    def test_load_synthetic_file(
+        self, chartify_benchmark, tmp_path, synthetic_eso_files, scale
+    ):
+        path = synthetic_eso_files[scale]
+        chartify_benchmark.extra_info["size"] = path.stat().st_size
+
+        def setup():
+            return (path, Path(tempfile.mkdtemp(dir=tmp_path))), {}
+
+        files = chartify_benchmark(run_load_file, setup=setup, rounds=3, trace_memory=True)
+        assert len(files) == 1
+
+    @pytest.mark.parametrize("scale", SCALES, ids=scale_id)
+    def test_store_file(self, chartify_benchmark, tmp_path, synthetic_files, scale):
+        file = synthetic_files[scale]
+        n_variables = count_variables(file)
+        chartify_benchmark.extra_info["n_variables"] = n_variables
+
+        def setup():
+            logger = UiLogger(file.file_name, file.file_path, queue.Queue())
+            workdir = Path(tempfile.mkdtemp(dir=tmp_path))
+            return (file, workdir, logger, [], threading.Lock()), {}
+
+        parquet_file = chartify_benchmark(
+            store_file, setup=setup, rounds=3, trace_memory=True, n_items=n_variables
+        )
+        assert parquet_file.table_names == file.table_names
+
+
+class TestViewModel:
+    @pytest.mark.parametrize("table", ["hourly", "daily"])
+    @pytest.mark.parametrize("tree_node", [None, KEY_LEVEL, TYPE_LEVEL, UNITS_LEVEL])
+    def test_rebuild_model(self, qtbot, chartify_benchmark, synthetic_file, table, tree_node):
+        model = ViewModel(table, synthetic_file)
+        chartify_benchmark.extra_info["n_rows"] = len(model.header_df)
+        chartify_benchmark(model.rebuild_model, tree_node=tree_node, trace_memory=True)
+        assert model.count_leaf_rows() == len(model.header_df)
+
+    @pytest.mark.parametrize("tree_node", [None, KEY_LEVEL])
+    def test_rebuild_model_excel(self, qtbot, chartify_benchmark, excel_file, tree_node):
+        excel_file.id_ = 0  # mock id attribute
+        model = ViewModel("daily", excel_file)
+        chartify_benchmark(model.rebuild_model, tree_node=tree_node, trace_memory=True)
+
+    @pytest.mark.parametrize("tree_node", [None, TYPE_LEVEL])
+    @pytest.mark.parametrize(
+        "filter_dict",
+        [
+            {KEY_LEVEL: "zone 1"},
+            {TYPE_LEVEL: "temperature"},
+            {KEY_LEVEL: "1", UNITS_LEVEL: "w"},
+        ],
+        ids=lambda d: "-".join(d),
+    )
+    def test_filter_model(
+        self, qtbot, chartify_benchmark, synthetic_file, tree_node, filter_dict
+    ):
+        model = create_view_model(synthetic_file, "hourly", tree_node=tree_node)
+        proxy_model = FilterModel()
+        proxy_model.setSourceModel(model)
+        indexes = model.get_logical_column_indexes()
+        filter_dict = {indexes[key]: text for key, text in filter_dict.items()}
+
+        def apply_filter():
+            proxy_model.filter_dict = {}
+            proxy_model.filter_dict = filter_dict
+            return proxy_model.count_all_rows()
+
+        n_rows = chartify_benchmark(apply_filter, rounds=10)
+        assert 0 < n_rows < model.count_leaf_rows()
+
+    @pytest.mark.parametrize("tree_node", [None, TYPE_LEVEL, "proxy_units"])
+    def test_update_proxy_units(self, qtbot, chartify_benchmark, synthetic_file, tree_node):
+        model = create_view_model(synthetic_file, "hourly", tree_node=tree_node)
+        units = itertools.cycle(
+            [
+                dict(units_system="IP", energy_units="MBtu", rate_units="kBtu/h"),
+                dict(units_system="SI", energy_units="kWh", rate_units="kW"),
+            ]
+        )
+
+        def setup():
+            return (), next(units)
+
+        chartify_benchmark(model.update_proxy_units, setup=setup, rounds=10)
+
+    @pytest.mark.parametrize("tree_node", [None, TYPE_LEVEL, "proxy_units"])
+    @pytest.mark.parametrize("n_variables", [1, 10, 100])
+    def test_get_matching_selection(
+        self, qtbot, chartify_benchmark, synthetic_file, tree_node, n_variables
+    ):
+        model = create_view_model(synthetic_file, "hourly", tree_node=tree_node)
+        view_variables = get_view_variables(model)
+        view_variables = random.Random(0).sample(
+            view_variables, min(n_variables, len(view_variables))
+        )
+        selection = chartify_benchmark(model.get_matching_selection, view_variables)
+        assert len(selection.indexes()) == len(view_variables)
+
+
+class TestFetchResults:
+    @pytest.fixture(params=SCALES[:3], ids=scale_id)
+    def mw_synthetic_file(self, request, qtbot, mw, controller, model, synthetic_files):
+        storage = ParquetStorage()
+        storage.store_file(copy(synthetic_files[request.param]))
+        for file in storage.files.values():
+            controller.on_file_loaded(file)
+            controller.ids.append(file.id_)
+        model.storage = storage
+        wait_for_views(qtbot, mw)
+        mw.on_table_change_requested("hourly")
+        yield mw
+        del storage
+
+    @pytest.mark.parametrize("n_variables", [1, 10, 100])
+    @pytest.mark.parametrize("source", ["parquet", "arrow", "memory"])
+    def test_fetch_results(self, chartify_benchmark, mw_synthetic_file, n_variables, source):
+        view_variables = get_view_variables(mw_synthetic_file.current_model)
+        view_variables = random.Random(0).sample(
+            view_variables, min(n_variables, len(view_variables))
+        )
+        mw_synthetic_file.current_view.select_variables(view_variables)
+
+        def setup():
+            # raw results are written into arrow store in background
+            ViewModel.get_arrow_store().wait()
+            if source != "memory":
+                ViewModel.RESULTS_CACHE.clear()
+            if source == "parquet":
+                ViewModel.get_arrow_store().clear()
+            return (), {}
+
+        df = chartify_benchmark(mw_synthetic_file.fetch_results, setup=setup, trace_memory=True)
+        assert df.shape[1] == len(view_variables)
@@ -0,0 +1,46 @@
+import itertools
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+from PySide2.QtGui import QImage, QPixmap
+
+from chartify.settings import Settings
+from chartify.ui.css_theme import CssParser, Palette
+from chartify.ui.icon_painter import Pixmap
+from tests.conftest import ROOT
+
+ICONS = sorted(Path(ROOT.parent, "resources", "icons").glob("*.png"))
+
+
+def repaint_images(images: List[QImage], *rgba) -> List[QImage]:
+    return [Pixmap.repaint_image(img, *rgba) for img in images]
+
+
+@pytest.mark.parametrize("rgba", [(255, 255, 255, 1), (110, 120, 110, 0.5)])
+def test_repaint_icons(chartify_benchmark, qtbot, rgba):
+    images = [QPixmap(str(path)).toImage() for path in ICONS]
+    repainted = chartify_benchmark(repaint_images, images, *rgba, n_items=len(images))
+    assert len(repainted) == len(images)
+
+
+def switch_palettes(palettes: Dict[str, Palette], cache_dir: Path) -> None:
+    for palette in palettes.values():
+        CssParser.parse_css_files(
+            Settings.CSS_DIR, palette, Settings.SOURCE_ICONS_DIR, cache_dir
+        )
+
+
+@pytest.mark.parametrize("warm", [False, True])
+def test_switch_palettes(chartify_benchmark, qtbot, tmp_path, warm):
+    palettes = Palette.parse_palettes(Settings.PALETTE_PATH)
+    cache_dirs = iter(Path(tmp_path, f"icons-{i}") for i in itertools.count())
+    warm_dir = next(cache_dirs)
+    switch_palettes(palettes, warm_dir)
+
+    def setup():
+        # cold switch renders all icons into an empty cache
+        return (palettes, warm_dir if warm else next(cache_dirs)), {}
+
+    chartify_benchmark(switch_palettes, setup=setup)
+    assert list(warm_dir.glob("*.png"))
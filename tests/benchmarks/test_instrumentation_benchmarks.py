@@ -0,0 +1,40 @@
+import pytest
+
+from chartify.utils.instrumentation import Instrumentation, instrument
+
+N_CALLS = 100000
+
+
+@pytest.fixture(params=[False, True], ids=["disabled", "enabled"])
+def instrumentation_enabled(request):
+    enabled = Instrumentation.ENABLED
+    Instrumentation.ENABLED = request.param
+    Instrumentation.reset()
+    yield request.param
+    Instrumentation.reset()
+    Instrumentation.ENABLED = enabled
+
+
+def foo():
+    pass
+
+
+def call_repeatedly(func, n):
+    for _ in range(n):
+        func()
+
+
+def enter_span_repeatedly(n):
+    for _ in range(n):
+        with Instrumentation.span("foo"):
+            pass
+
+
+def test_instrumented_call(chartify_benchmark, instrumentation_enabled):
+    instrumented = instrument(foo)
+    assert (instrumented is foo) is not instrumentation_enabled
+    chartify_benchmark(call_repeatedly, instrumented, N_CALLS, n_items=N_CALLS)
+
+
+def test_span(chartify_benchmark, instrumentation_enabled):
+    chartify_benchmark(enter_span_repeatedly, N_CALLS, n_items=N_CALLS)
@@ -8,7 +8,6 @@ from unittest import mock
 from unittest.mock import Mock
 
 import pytest
-from PySide2.QtWidgets import QWidget
 from esofile_reader import GenericFile
 from esofile_reader.pqt.parquet_storage import ParquetStorage
 
@@ -17,6 +16,7 @@ from chartify.controller.wv_controller import WVController
 from chartify.model.model import AppModel
 from chartify.settings import Settings
 from chartify.ui.main_window import MainWindow
+from chartify.ui.widgets.treeview_model import ViewModel
 
 ROOT = pathlib.Path(__file__).parent
 TEST_FILES = Path(ROOT, "eso_files")
@@ -29,6 +29,23 @@ EXCEL_FILE_PATH = Path(TEST_FILES, "various_table_types.xlsx")
 ESO_FILE_EXCEL_PATH = Path(TEST_FILES, "eplusout.xlsx")
 
 
+def wait_for_views(qtbot, main_window):
+    """ Wait until data of all views is prepared in background. """
+    models = main_window.get_view_models_by_name().values()
+    qtbot.wait_until(lambda: not any(model.preparing for model in models))
+
+
+@pytest.fixture(autouse=True)
+def clear_results_cache():
+    # file ids get reused by different test storages
+    ViewModel.RESULTS_CACHE.clear()
+    if ViewModel.ARROW_STORE is not None:
+        # store is created again in current temp dir
+        ViewModel.ARROW_STORE.clear()
+        ViewModel.ARROW_STORE = None
+    yield
+
+
 @pytest.fixture(scope="session")
 def test_tempdir():
     path = Path(ROOT, "temp")
@@ -139,16 +156,20 @@ def parquet_combined_file_storage(eso_file_excel):
 
 
 @pytest.fixture(scope="function")
-def pretty_mw(qtbot, test_tempdir):
+def pretty_mw(qtbot, monkeypatch, test_tempdir):
     with tempfile.TemporaryDirectory(prefix="chartify", dir=test_tempdir) as fix_dir:
-        Settings.APP_TEMP_DIR = Path(fix_dir)
+        monkeypatch.setattr(Settings, "APP_TEMP_DIR", Path(fix_dir))
+        monkeypatch.setattr(Settings, "ICONS_CACHE_DIR", Path(fix_dir, "icons"))
         Settings.load_settings_from_json()
         main_window = MainWindow()
         model = AppModel()
-        wv_controller = WVController(model, main_window.web_view)
+        wv_controller = WVController(
+            model, main_window.create_web_view, main_window.fetch_results
+        )
         AppController(model, main_window, wv_controller)
         qtbot.add_widget(main_window)
         main_window.show()
+        wv_controller.load_url()
         yield main_window
 
 
@@ -158,17 +179,15 @@ def app_setup(qtbot, test_tempdir):
         Settings.APP_TEMP_DIR = Path(fix_dir)
         Settings.load_settings_from_json()
         with mock.patch("chartify.ui.main_window.MainWindow.load_css_and_icons"):
-            with mock.patch("chartify.ui.main_window.QWebEngineView") as wgt:
-                wgt.return_value = QWidget()
-                main_window = MainWindow()
-                model = AppModel()
-                wv_controller = Mock()
-                # wv_controller = WVController(model, main_window.web_view)
-                controller = AppController(model, main_window, wv_controller)
-                controller.pool = ProcessPoolExecutor()  # reusable executor crashes
-                qtbot.add_widget(main_window)
-                main_window.show()
-                yield model, main_window, controller
+            # web view is not created as the web view controller is mocked
+            main_window = MainWindow()
+            model = AppModel()
+            wv_controller = Mock()
+            controller = AppController(model, main_window, wv_controller)
+            controller.pool = ProcessPoolExecutor()  # reusable executor crashes
+            qtbot.add_widget(main_window)
+            main_window.show()
+            yield model, main_window, controller
 
 
 @pytest.fixture(scope="function")
@@ -192,6 +211,7 @@ def mw_esofile(mw, controller, model, parquet_eso_file_storage, qtbot):
         controller.on_file_loaded(file)
         controller.ids.append(file.id_)
     model.storage = parquet_eso_file_storage
+    wait_for_views(qtbot, mw)
     return mw
 
 
@@ -200,6 +220,7 @@ def mw_excel_file(mw, controller, model, parquet_excel_file_storage, qtbot):
     for file in parquet_excel_file_storage.files.values():
         controller.on_file_loaded(file)
         controller.ids.append(file.id_)
+    wait_for_views(qtbot, mw)
     mw.on_table_change_requested("daily")
     model.storage = parquet_excel_file_storage
     return mw
@@ -211,4 +232,5 @@ def mw_combined_file(mw, controller, parquet_combined_file_storage, qtbot):
         controller.on_file_loaded(file)
         controller.ids.append(file.id_)
     model.storage = parquet_combined_file_storage
+    wait_for_views(qtbot, mw)
     return mw
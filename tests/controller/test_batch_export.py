@@ -0,0 +1,148 @@
+import json
+from pathlib import Path
+
+import pyarrow.parquet as pq
+import pytest
+from esofile_reader.df.level_names import KEY_LEVEL
+
+from chartify.controller.batch_export import (
+    ExportOptions,
+    collect_paths,
+    create_output_names,
+    export_file,
+    main,
+    match_pattern,
+    match_view_variables,
+    run_batch_export,
+    sanitize_name,
+)
+from chartify.model.arrow_store import arrow_to_table
+from chartify.ui.widgets.treeview_model import ViewModel, VV
+from tests.conftest import EXCEL_FILE_PATH
+
+
+@pytest.fixture
+def options():
+    return ExportOptions(
+        patterns=["block1:zone1 | *"],
+        tables=["daily"],
+        formats=["csv", "parquet", "json", "html"],
+        chart_type="scatter",
+        units_system="SI",
+        energy_units="J",
+        rate_units="W",
+        rate_to_energy=False,
+        palette_name="default",
+    )
+
+
+def test_sanitize_name():
+    assert sanitize_name('a/b\\c:d*e?f"g<h>i|j ') == "a_b_c_d_e_f_g_h_i_j"
+
+
+def test_create_output_names():
+    paths = [Path("a", "foo.eso"), Path("b", "foo.eso"), Path("a", "bar.eso")]
+    assert create_output_names(paths) == ["foo", "foo (1)", "bar"]
+
+
+@pytest.mark.parametrize(
+    "text, patterns, expected",
+    [
+        ("BLOCK1:ZONE1 | Zone Temperature | C", ["block1*"], True),
+        ("BLOCK1:ZONE1 | Zone Temperature | C", ["*temperature | c"], True),
+        ("BLOCK1:ZONE1 | Zone Temperature | C", ["*temperature"], False),
+        ("BLOCK1:ZONE1 | Zone Temperature | C", ["foo", "* | c"], True),
+        ("daily", ["hourly", "d*"], True),
+    ],
+)
+def test_match_pattern(text, patterns, expected):
+    assert match_pattern(text, patterns) is expected
+
+
+def test_collect_paths(tmp_path):
+    for name in ["b.eso", "a.xlsx", "c.txt", "d.cfs"]:
+        Path(tmp_path, name).touch()
+    file_path = Path("foo", "bar.eso")
+    assert collect_paths([tmp_path, file_path]) == [
+        Path(tmp_path, "a.xlsx"),
+        Path(tmp_path, "b.eso"),
+        file_path,
+    ]
+
+
+def test_match_view_variables(excel_file):
+    model = ViewModel("daily", excel_file)
+    view_variables = match_view_variables(model, ["block1:zone1 | *"])
+    assert view_variables
+    assert all(v.key == "BLOCK1:ZONE1" for v in view_variables)
+    assert VV("BLOCK1:ZONE1", None, "W") in view_variables
+    assert len(match_view_variables(model, [])) == len(model.header_df)
+
+
+def test_export_file(tmp_path, options):
+    result = export_file(EXCEL_FILE_PATH, tmp_path, options)
+    assert result.error is None
+    assert result.n_variables > 0
+    assert sorted(Path(p).name for p in result.outputs) == [
+        "daily.csv",
+        "daily.html",
+        "daily.json",
+        "daily.parquet",
+    ]
+
+    df = arrow_to_table(pq.read_table(str(Path(tmp_path, "daily.parquet"))))
+    assert df.shape[1] == result.n_variables
+    assert df.columns.get_level_values(KEY_LEVEL).unique().tolist() == ["BLOCK1:ZONE1"]
+
+    with open(Path(tmp_path, "daily.csv")) as f:
+        assert "BLOCK1:ZONE1" in f.read()
+
+    with open(Path(tmp_path, "daily.json")) as f:
+        plot = json.load(f)
+    assert len(plot["data"]) == result.n_variables
+    assert all(len(trace["y"]) == len(df) for trace in plot["data"])
+
+    with open(Path(tmp_path, "daily.html")) as f:
+        assert "Plotly.newPlot" in f.read()
+
+
+def test_export_file_no_match(tmp_path, options):
+    result = export_file(EXCEL_FILE_PATH, tmp_path, options._replace(patterns=["foo"]))
+    assert result.error is None
+    assert result.outputs == []
+    assert result.n_variables == 0
+
+
+@pytest.mark.parametrize("failed", [False, True], ids=["exported", "failed"])
+def test_export_file_restores_arrow_store(tmp_path, options, failed):
+    path = Path(tmp_path, "foo.txt") if failed else EXCEL_FILE_PATH
+    store = ViewModel.ARROW_STORE
+    export_file(path, Path(tmp_path, "out"), options)
+    assert ViewModel.ARROW_STORE is store
+
+
+def test_export_file_failed(tmp_path, options):
+    result = export_file(Path(tmp_path, "foo.txt"), tmp_path, options)
+    assert "Unexpected file type" in result.error
+    assert result.outputs == []
+
+
+def test_run_batch_export(tmp_path, options):
+    paths = [EXCEL_FILE_PATH, EXCEL_FILE_PATH, Path(tmp_path, "foo.txt")]
+    results = run_batch_export(paths, Path(tmp_path, "out"), options, max_workers=2)
+    assert len(results) == 3
+    assert sum(1 for r in results if r.error) == 1
+    assert Path(tmp_path, "out", "various_table_types", "daily.csv").exists()
+    assert Path(tmp_path, "out", "various_table_types (1)", "daily.csv").exists()
+    with open(Path(tmp_path, "out", "manifest.jsonl")) as f:
+        manifest = [json.loads(line) for line in f]
+    assert sorted(r["path"] for r in manifest) == sorted(str(p) for p in paths)
+
+
+def test_main(tmp_path):
+    exit_code = main(
+        [str(EXCEL_FILE_PATH), "-o", str(tmp_path), "-t", "daily", "-p", "block1*", "-w", "1"]
+    )
+    assert exit_code == 0
+    assert Path(tmp_path, "various_table_types", "daily.csv").exists()
+    assert not Path(tmp_path, "various_table_types", "daily.json").exists()
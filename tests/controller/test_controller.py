@@ -1,7 +1,13 @@
+import subprocess
+import sys
+import threading
 from pathlib import Path
 
 import pytest
 
+from chartify.controller.batch_processing import BatchJob, group_models_by_file
+from chartify.controller.progress_logging import UiLogger
+from chartify.ui.widgets.treeview_model import VV
 from tests.conftest import ESO_FILE_INCOMPLETE, ESO_FILE1_PATH, ESO_FILE2_PATH, EXCEL_FILE_PATH
 
 
@@ -42,3 +48,123 @@ class TestLoadFiles:
     def test_load_unsupported_file(self, qtbot, mw, controller):
         with qtbot.wait_signal(controller.progress_thread.failed, timeout=10000):
             mw.load_files_from_paths([Path("foo.bar")])
+
+
+class TestBatchJob:
+    @pytest.fixture(scope="function")
+    def models(self, mw_esofile):
+        return [
+            model
+            for file_widget in mw_esofile.standard_tab_wgt.get_all_children()
+            for model in file_widget.all_view_models
+        ]
+
+    def test_group_models_by_file(self, models):
+        groups = group_models_by_file(models)
+        assert len(groups) == len({model.file_id for model in models})
+        assert sum(len(group) for group in groups.values()) == len(models)
+
+    def test_remove_variables(self, qtbot, controller, models):
+        view_variable = VV("Environment", "Site Outdoor Air Drybulb Temperature", "C")
+        logger = UiLogger("remove variables", Path("remove"), controller.progress_queue)
+        job = BatchJob(
+            "remove variables",
+            models,
+            lambda m: m.delete_variables_from_file([view_variable]),
+            lambda m, _: m.delete_rows_from_model_if_initialized([view_variable]),
+            logger,
+        )
+        with qtbot.wait_signal(job.signals.finished, timeout=10000) as blocker:
+            controller.thread_pool.start(job)
+        assert blocker.args == [[]]
+        assert not any(model.variable_exists(view_variable) for model in models)
+
+    def test_failure_does_not_block_other_files(self, qtbot, controller, models):
+        failing_id = models[0].file_id
+
+        def file_func(model):
+            if model.file_id == failing_id:
+                raise ValueError("Failure!")
+            return model.file_id
+
+        processed = []
+        logger = UiLogger("failing", Path("failing"), controller.progress_queue)
+        job = BatchJob(
+            "failing", models, file_func, lambda m, res: processed.append(res), logger
+        )
+        with qtbot.wait_signal(job.signals.finished, timeout=10000) as blocker:
+            controller.thread_pool.start(job)
+        assert blocker.args == [[failing_id]]
+        assert failing_id not in processed
+        assert len(processed) == len([m for m in models if m.file_id != failing_id])
+
+    def test_models_updated_on_gui_thread(self, qtbot, controller, models):
+        versions = {id(model): model._version for model in models}
+        file_threads = []
+        model_threads = []
+
+        def file_func(model):
+            # derived data is not touched from worker threads
+            assert model._version == versions[id(model)]
+            file_threads.append(threading.current_thread())
+
+        logger = UiLogger("threads", Path("threads"), controller.progress_queue)
+        job = BatchJob(
+            "threads",
+            models,
+            file_func,
+            lambda m, _: model_threads.append(threading.current_thread()),
+            logger,
+        )
+        with qtbot.wait_signal(job.signals.finished, timeout=10000):
+            controller.thread_pool.start(job)
+        qtbot.wait_until(lambda: len(model_threads) == len(models))
+        assert threading.main_thread() not in file_threads
+        assert all(thread is threading.main_thread() for thread in model_threads)
+        assert all(model._version == versions[id(model)] + 1 for model in models)
+
+    def test_current_model_modified_under_file_lock(self, controller, mw_esofile, monkeypatch):
+        model = mw_esofile.current_model
+        lock = controller.m.get_file_lock(model.file_id)
+        locked = []
+        selected = [VV("BLOCK1:ZONE1", "Zone Mean Air Temperature", "C")]
+        view = mw_esofile.current_view
+        monkeypatch.setattr(view, "get_selected_view_variable", lambda: selected)
+        monkeypatch.setattr(mw_esofile, "confirm_remove_variables", lambda _: True)
+        monkeypatch.setattr(model, "delete_variables", lambda _: locked.append(lock.locked()))
+        mw_esofile.on_remove_variables_triggered()
+        assert locked == [True]
+        assert not lock.locked()
+
+
+class TestLazyServices:
+    def test_services_not_started(self, controller):
+        assert controller._manager is None
+        assert controller._watcher is None
+        assert controller._progress_thread is None
+
+    def test_watcher_started_on_first_use(self, qtbot, controller):
+        controller.file_queue
+        assert controller._manager is not None
+        assert controller.watcher.isRunning()
+        assert controller._progress_thread is None
+
+    def test_progress_thread_started_on_first_use(self, qtbot, controller):
+        controller.progress_queue
+        assert controller.progress_thread.isRunning()
+
+    def test_heavy_modules_not_imported_on_startup(self):
+        code = (
+            "import sys\n"
+            "from chartify.controller.app_controller import AppController\n"
+            "from chartify.controller.wv_controller import WVController\n"
+            "from chartify.model.model import AppModel\n"
+            "from chartify.ui.main_window import MainWindow\n"
+            "heavy = ['pandas', 'esofile_reader', 'PySide2.QtWebEngineWidgets']\n"
+            "print(','.join(m for m in heavy if m in sys.modules))\n"
+        )
+        root = Path(__file__).parents[2]
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == ""
@@ -0,0 +1,275 @@
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import Mock, MagicMock
+from zipfile import ZipFile, ZIP_STORED
+
+import pandas as pd
+import pytest
+
+from chartify.controller.project_saving import (
+    ProjectSaver,
+    get_file_fingerprint,
+    read_manifest,
+    get_chunk_name,
+)
+from chartify.model.lazy_file import read_project_files
+from chartify.model.project_archive import get_pending_path
+
+
+class FakeFile:
+    def __init__(self, id_, file_name):
+        self.id_ = id_
+        self.file_type = "eso"
+        self.file_name = file_name
+        self.file_path = Path(f"{file_name}.eso")
+        self.file_created = "2020-01-01 00:00:00"
+        self.header_df = pd.DataFrame({"key": ["a", "b"], "units": ["W", "C"]})
+        self.n_saved = 0
+
+    @property
+    def table_names(self):
+        return ["hourly"]
+
+    def get_header_df(self, table):
+        return self.header_df
+
+    def is_header_simple(self, table):
+        return False
+
+    def get_content(self, table):
+        if table == "hourly":
+            return f"{self.file_path}{self.header_df.to_csv()}".encode() * 100
+        return str(self.file_path).encode() * 100
+
+    def save_file_to_zip(self, zf, relative_to, logger):
+        self.n_saved += 1
+        zf.writestr(f"file-{self.id_}/hourly.parquet", self.get_content("hourly"))
+        zf.writestr(f"file-{self.id_}/daily.parquet", self.get_content("daily"))
+
+
+@pytest.fixture(autouse=True)
+def rate_to_energy(monkeypatch):
+    monkeypatch.setattr(
+        "chartify.controller.project_saving.can_convert_rate_to_energy", lambda f, t: True
+    )
+
+
+@pytest.fixture
+def saver():
+    return ProjectSaver()
+
+
+@pytest.fixture
+def files():
+    return [FakeFile(i, f"file{i}") for i in range(3)]
+
+
+def test_fingerprint_changes_with_header(files):
+    fingerprint = get_file_fingerprint(files[0])
+    files[0].header_df.loc[0, "key"] = "c"
+    assert get_file_fingerprint(files[0]) != fingerprint
+
+
+def test_fingerprint_ignores_id_and_name(files):
+    fingerprint = get_file_fingerprint(files[0])
+    files[0].id_ = 10
+    files[0].file_name = "foo"
+    assert get_file_fingerprint(files[0]) == fingerprint
+
+
+def test_save(saver, files, tmp_path):
+    path = Path(tmp_path, "project.cfs")
+    logger = MagicMock()
+    saver.save(files, path, tmp_path, logger)
+    logger.done.assert_called_once()
+    with ZipFile(path) as zf:
+        manifest = read_manifest(zf)
+        assert sorted(manifest["files"].keys()) == ["0", "1", "2"]
+        assert len([n for n in zf.namelist() if n.startswith("chunks/")]) == 6
+        assert all(info.compress_type == ZIP_STORED for info in zf.infolist())
+        members = manifest["files"]["1"]["members"]
+        chunk = zf.read(get_chunk_name(members["file-1/hourly.parquet"]))
+        assert chunk == files[1].get_content("hourly")
+
+
+def test_save_skips_unchanged_files(saver, files, tmp_path):
+    path = Path(tmp_path, "project.cfs")
+    saver.save(files, path, tmp_path, MagicMock())
+    files[1].file_name = "renamed"
+    files[2].header_df.loc[0, "key"] = "c"
+    saver.save(files, path, tmp_path, MagicMock())
+    assert [f.n_saved for f in files] == [1, 1, 2]
+    with ZipFile(path) as zf:
+        # only modified file chunk and a new manifest are appended
+        assert len(zf.namelist()) == 6 + 1 + 2
+        assert read_manifest(zf)["files"]["1"]["file_name"] == "renamed"
+
+
+def test_unchanged_manifest_not_written(saver, files, tmp_path):
+    path = Path(tmp_path, "project.cfs")
+    saver.save(files, path, tmp_path, MagicMock())
+    saver.save(files, path, tmp_path, MagicMock())
+    with ZipFile(path) as zf:
+        assert len(zf.namelist()) == 6 + 1
+
+
+def test_saved_files_not_written_after_reopen(saver, files, tmp_path):
+    path = Path(tmp_path, "project.cfs")
+    saver.save(files, path, tmp_path, MagicMock())
+    lazy_files = read_project_files(path, tmp_path)
+    new_saver = ProjectSaver()
+    new_saver.add_saved_files(lazy_files)
+    for file in files:
+        file.id_ += 10
+    new_saver.save(files, path, tmp_path, MagicMock())
+    assert [f.n_saved for f in files] == [1, 1, 1]
+
+
+def test_compact(saver, files, tmp_path):
+    path = Path(tmp_path, "project.cfs")
+    saver.save(files, path, tmp_path, MagicMock())
+    files[1].header_df.loc[0, "key"] = "c"
+    saver.save(files, path, tmp_path, MagicMock())
+    assert saver.get_garbage_ratio(path) > 0
+    saver.compact(path, MagicMock())
+    assert saver.get_garbage_ratio(path) == 0
+    with ZipFile(path) as zf:
+        assert len(zf.namelist()) == 6 + 1
+        members = read_manifest(zf)["files"]["1"]["members"]
+        chunk = zf.read(get_chunk_name(members["file-1/hourly.parquet"]))
+        assert chunk == files[1].get_content("hourly")
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"max_manifests": 1}, {"max_garbage_ratio": 0.1}], ids=["manifests", "garbage"]
+)
+def test_compacted_on_save(files, tmp_path, kwargs):
+    saver = ProjectSaver(**kwargs)
+    path = Path(tmp_path, "project.cfs")
+    saver.save(files, path, tmp_path, MagicMock())
+    for file in files:
+        file.header_df.loc[0, "key"] = "c"
+    saver.save(files, path, tmp_path, MagicMock())
+    assert saver.get_garbage_ratio(path) == 0
+    with ZipFile(path) as zf:
+        assert len(zf.namelist()) == 6 + 1
+
+
+def test_legacy_archive_overwritten(saver, files, tmp_path):
+    path = Path(tmp_path, "project.cfs")
+    with ZipFile(path, "w") as zf:
+        zf.writestr("foo", b"bar")
+    saver.save(files, path, tmp_path, MagicMock())
+    with ZipFile(path) as zf:
+        assert "foo" not in zf.namelist()
+
+
+def test_save_as_writes_all_chunks(saver, files, tmp_path):
+    saver.save(files, Path(tmp_path, "project.cfs"), tmp_path, MagicMock())
+    path = Path(tmp_path, "copy.cfs")
+    saver.save(files, path, tmp_path, MagicMock())
+    with ZipFile(path) as zf:
+        assert len([n for n in zf.namelist() if n.startswith("chunks/")]) == 6
+
+
+def test_save_waits_for_file_lock(saver, files, tmp_path):
+    lock = saver.get_file_lock(1)
+    lock.acquire()
+    logger = MagicMock()
+    thread = threading.Thread(
+        target=saver.save, args=(files, Path(tmp_path, "project.cfs"), tmp_path, logger)
+    )
+    thread.start()
+    thread.join(timeout=0.2)
+    # file being modified is not saved until the modification finishes
+    assert thread.is_alive()
+    assert files[1].n_saved == 0
+    lock.release()
+    thread.join(timeout=5)
+    assert files[1].n_saved == 1
+    logger.done.assert_called_once()
+
+
+def test_save_stored_files(saver, parquet_eso_file_storage, tmp_path):
+    files = list(parquet_eso_file_storage.files.values())
+    workdir = parquet_eso_file_storage.workdir
+    path = Path(tmp_path, "project.cfs")
+    saver.save(files, path, workdir, MagicMock())
+    with ZipFile(path) as zf:
+        manifest = read_manifest(zf)
+        for file in files:
+            reference_path = Path(tmp_path, f"reference-{file.id_}.zip")
+            with ZipFile(reference_path, "w") as reference:
+                file.save_file_to_zip(reference, workdir, MagicMock())
+            with ZipFile(reference_path) as reference:
+                names = [n for n in reference.namelist() if not n.endswith("/")]
+                members = manifest["files"][str(file.id_)]["members"]
+                assert sorted(members) == sorted(names)
+                for name in names:
+                    assert zf.read(get_chunk_name(members[name])) == reference.read(name)
+        n_members = len(zf.namelist())
+    # unchanged files are not written again
+    saver.save(files, path, workdir, MagicMock())
+    with ZipFile(path) as zf:
+        assert len(zf.namelist()) == n_members + 1
+
+
+def test_save_failure_logged(saver, files, tmp_path):
+    files[0].save_file_to_zip = Mock(side_effect=OSError("foo"))
+    logger = MagicMock()
+    saver.save(files, Path(tmp_path, "project.cfs"), tmp_path, logger)
+    logger.log_task_failed.assert_called_once()
+    logger.done.assert_not_called()
+
+
+def test_failed_save_restores_archive(saver, files, tmp_path):
+    path = Path(tmp_path, "project.cfs")
+    saver.save(files, path, tmp_path, MagicMock())
+    content = path.read_bytes()
+
+    def save_file_to_zip(zf, relative_to, logger):
+        zf.writestr("file-0/hourly.parquet", b"foo" * 100000)
+        raise OSError("foo")
+
+    files[0].save_file_to_zip = save_file_to_zip
+    saver.save(files, path, tmp_path, MagicMock())
+    assert path.read_bytes() == content
+    assert not get_pending_path(path).exists()
+
+
+def test_interrupted_save_recovered(saver, files, tmp_path):
+    path = Path(tmp_path, "project.cfs")
+    saver.save(files, path, tmp_path, MagicMock())
+    with ZipFile(path) as zf:
+        manifest = read_manifest(zf)
+    code = (
+        "import os, sys\n"
+        "from pathlib import Path\n"
+        "from unittest.mock import MagicMock\n"
+        "from chartify.controller import project_saving\n"
+        "from tests.controller.test_project_saving import FakeFile\n"
+        "project_saving.can_convert_rate_to_energy = lambda f, t: True\n"
+        "def save_file_to_zip(zf, relative_to, logger):\n"
+        "    zf.writestr('file-0/hourly.parquet', os.urandom(1024 ** 2))\n"
+        "    os._exit(1)\n"
+        "files = [FakeFile(i, f'file{i}') for i in range(3)]\n"
+        "files[0].save_file_to_zip = save_file_to_zip\n"
+        "path = Path(sys.argv[1])\n"
+        "project_saving.ProjectSaver().save(files, path, path.parent, MagicMock())\n"
+    )
+    root = Path(__file__).parents[2]
+    result = subprocess.run([sys.executable, "-c", code, str(path)], cwd=root)
+    assert result.returncode == 1
+    assert get_pending_path(path).exists()
+    lazy_files = read_project_files(path, tmp_path)
+    assert [f.file_name for f in lazy_files] == ["file0", "file1", "file2"]
+    assert not get_pending_path(path).exists()
+    with ZipFile(path) as zf:
+        assert read_manifest(zf) == manifest
+        assert zf.testzip() is None
+    # archive can be appended again
+    saver.save(files, path, tmp_path, MagicMock())
+    with ZipFile(path) as zf:
+        assert read_manifest(zf) == manifest
@@ -0,0 +1,241 @@
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+from urllib.request import urlopen
+
+import numpy as np
+import pandas as pd
+
+import pytest
+from PySide2.QtWebEngineWidgets import QWebEngineView
+
+from chartify.charts.chart import Chart
+from chartify.charts.trace import Trace2D, TraceData
+from chartify.controller.wv_controller import WVController
+from chartify.model.data_server import DataServer
+from chartify.model.values_store import ValuesStore
+from chartify.settings import Settings
+
+
+@pytest.fixture
+def wv_database(tmp_path):
+    store = ValuesStore(Path(tmp_path, "trace_data"))
+    store.put("td-0", [1, 2, 3])
+    trace_dt = TraceData(
+        "item-0",
+        "td-0",
+        "trace 0",
+        None,
+        6,
+        "W",
+        timestamps=[0, 3600, 7200],
+        interval="hourly",
+        store=store,
+    )
+    trace = Trace2D("trace 0", "item-0", "trace-0", "#000", "scatter")
+    trace.x_ref = "datetime"
+    trace.y_ref = trace_dt
+    chart = Chart("item-0", "chart-0", "scatter")
+    return {
+        "trace_data": [trace_dt],
+        "traces": [trace],
+        "components": [chart],
+        "items": {"item-0": {"i": "frame-0", "x": 0, "y": 0, "w": 6, "h": 2}},
+    }
+
+
+@pytest.fixture
+def wv_controller(qtbot, wv_database):
+    Settings.load_settings_from_json()
+    model = MagicMock()
+    model.fetch_all_components.return_value = wv_database["components"]
+    model.fetch_all_items.return_value = wv_database["items"]
+    model.fetch_component.side_effect = lambda item_id: wv_database["components"][0]
+    model.fetch_traces.side_effect = lambda item_id: [
+        t for t in wv_database["traces"] if t.item_id == item_id
+    ]
+    model.fetch_trace_data.side_effect = lambda trace_data_id: next(
+        (t for t in wv_database["trace_data"] if t.trace_data_id == trace_data_id), None
+    )
+    web_view = QWebEngineView()
+    qtbot.add_widget(web_view)
+    return WVController(model, lambda: web_view)
+
+
+def get_trace(plot):
+    return plot["data"][0]
+
+
+class TestTraceCaching:
+    def test_values_sent_once(self, qtbot, wv_controller):
+        with qtbot.wait_signal(wv_controller.componentUpdated) as blocker:
+            wv_controller.update_component("item-0")
+        assert get_trace(blocker.args[1])["y"] == [1, 2, 3]
+        assert get_trace(blocker.args[1])["x"] == [0, 3600000, 7200000]
+
+        with qtbot.wait_signal(wv_controller.componentUpdated) as blocker:
+            wv_controller.update_component("item-0")
+        assert "x" not in get_trace(blocker.args[1])
+        assert "y" not in get_trace(blocker.args[1])
+        assert get_trace(blocker.args[1])["traceId"] == "trace-0"
+
+    def test_refresh_layout_uses_cache(self, qtbot, wv_controller):
+        wv_controller.update_component("item-0")
+        with qtbot.wait_signal(wv_controller.fullLayoutUpdated) as blocker:
+            wv_controller.refresh_layout()
+        assert "y" not in get_trace(blocker.args[1]["item-0"])
+
+    def test_refresh_layout_resend_data(self, qtbot, wv_controller):
+        wv_controller.update_component("item-0")
+        with qtbot.wait_signal(wv_controller.fullLayoutUpdated) as blocker:
+            wv_controller.refresh_layout(resend_data=True)
+        assert get_trace(blocker.args[1]["item-0"])["y"] == [1, 2, 3]
+
+    def test_changed_values_are_resent(self, qtbot, wv_controller, wv_database):
+        wv_controller.update_component("item-0")
+        trace_dt = TraceData(
+            "item-0",
+            "td-1",
+            "trace 1",
+            [4, 5, 6],
+            15,
+            "W",
+            timestamps=[0, 3600, 7200],
+            interval="hourly",
+        )
+        wv_database["traces"][0].y_ref = trace_dt
+        with qtbot.wait_signal(wv_controller.componentUpdated) as blocker:
+            wv_controller.update_component("item-0")
+        assert get_trace(blocker.args[1])["y"] == [4, 5, 6]
+
+    def test_restyle_layout(self, qtbot, wv_controller):
+        with qtbot.wait_signal(wv_controller.layoutRestyled) as blocker:
+            wv_controller.restyle_layout()
+        assert "data" not in blocker.args[0]["item-0"]
+        assert "layout" in blocker.args[0]["item-0"]
+        assert wv_controller.sent_traces == {}
+
+    def test_item_removed(self, wv_controller):
+        wv_controller.update_component("item-0")
+        assert "trace-0" in wv_controller.sent_traces
+        wv_controller.onItemRemoved("item-0")
+        assert "trace-0" not in wv_controller.sent_traces
+        wv_controller.m.remove_trace_data.assert_called_once()
+
+    def test_trace_dropped_fetches_results(self, qtbot):
+        fetch_results = MagicMock(return_value=None)
+        web_view = QWebEngineView()
+        qtbot.add_widget(web_view)
+        wv_controller = WVController(MagicMock(), lambda: web_view, fetch_results)
+        wv_controller.onTraceDropped("item-0", "scatter")
+        fetch_results.assert_called_once()
+
+
+class TestHydration:
+    def test_values_applied_on_gui_thread(
+        self, qtbot, monkeypatch, wv_controller, wv_database
+    ):
+        store = wv_database["trace_data"][0].store
+        trace_dt = TraceData(
+            "item-0",
+            "td-1",
+            "trace 1",
+            None,
+            15,
+            "W",
+            timestamps=[0, 3600, 7200],
+            interval="hourly",
+            ref={"column": ["file", "hourly", "key", "W"], "units": {}},
+            store=store,
+        )
+        trace_dt.n_values = 3
+        wv_database["trace_data"].append(trace_dt)
+        wv_database["traces"][0].y_ref = trace_dt
+        wv_controller.m.wv_database = wv_database
+        wv_controller.m.values_store = store
+        wv_controller.m.fetch_traces_data.side_effect = lambda item_id: [
+            t for t in wv_database["trace_data"] if t.item_id == item_id
+        ]
+        fetch_threads = []
+        put_threads = []
+
+        def fetch_ref_values(ref, models):
+            fetch_threads.append(threading.current_thread())
+            return pd.Series([4.0, 5.0, 6.0])
+
+        def put(id_, values, put=store.put):
+            put_threads.append(threading.current_thread())
+            put(id_, values)
+
+        monkeypatch.setattr("chartify.model.dashboard.fetch_ref_values", fetch_ref_values)
+        monkeypatch.setattr(store, "put", put)
+        with qtbot.wait_signal(wv_controller.componentUpdated) as blocker:
+            wv_controller.hydrate_traces({})
+        assert get_trace(blocker.args[1])["y"] == [4, 5, 6]
+        assert len(fetch_threads) == 1
+        assert fetch_threads[0] is not threading.main_thread()
+        assert put_threads == [threading.main_thread()]
+
+    def test_removed_trace_data_not_stored(self, wv_controller, wv_database):
+        store = wv_database["trace_data"][0].store
+        wv_controller.m.values_store = store
+        wv_controller.on_item_values_fetched("item-0", {"td-1": np.array([4.0, 5.0, 6.0])})
+        assert "td-1" not in store
+
+
+@pytest.fixture
+def served_wv_controller(wv_controller):
+    wv_controller.data_server = DataServer(wv_controller.get_array)
+    wv_controller.data_server.start()
+    yield wv_controller
+    wv_controller.stop_data_server()
+
+
+class TestDataServer:
+    def test_get_array(self, served_wv_controller):
+        # only trace data with published address are served
+        assert served_wv_controller.get_array("values", "td-0") is None
+        served_wv_controller.plot_component(served_wv_controller.m.fetch_component(""))
+        assert served_wv_controller.get_array("values", "td-0").tolist() == [1, 2, 3]
+        timestamps = served_wv_controller.get_array("timestamps", "td-0")
+        assert timestamps.tolist() == [0, 3600000, 7200000]
+        assert served_wv_controller.get_array("values", "foo") is None
+
+    def test_stored_array_served(self, served_wv_controller, wv_database, monkeypatch):
+        store = wv_database["trace_data"][0].store
+        monkeypatch.setattr(store, "get_values", MagicMock(side_effect=AssertionError))
+        served_wv_controller.plot_component(served_wv_controller.m.fetch_component(""))
+        assert served_wv_controller.get_array("values", "td-0") is store.get_array("td-0")
+
+    def test_removed_trace_data_not_served(self, served_wv_controller):
+        plot = served_wv_controller.plot_component(served_wv_controller.m.fetch_component(""))
+        url = get_trace(plot)["ySource"]
+        with urlopen(url) as response:
+            assert response.status == 200
+        served_wv_controller.on_trace_data_removed(["td-0"])
+        assert served_wv_controller.get_array("values", "td-0") is None
+        assert served_wv_controller.data_server.get_buffer("values", "td-0") is None
+
+    def test_sources_sent_instead_of_values(self, qtbot, served_wv_controller):
+        url = served_wv_controller.data_server.url
+        with qtbot.wait_signal(served_wv_controller.componentUpdated) as blocker:
+            served_wv_controller.update_component("item-0")
+        trace = get_trace(blocker.args[1])
+        assert "x" not in trace
+        assert "y" not in trace
+        assert trace["xSource"] == f"{url}/timestamps/td-0"
+        assert trace["ySource"] == f"{url}/values/td-0"
+        assert served_wv_controller.sent_traces == {}
+
+    def test_fetch_source(self, qtbot, served_wv_controller):
+        plot = served_wv_controller.plot_component(served_wv_controller.m.fetch_component(""))
+        with urlopen(get_trace(plot)["ySource"]) as response:
+            values = np.frombuffer(response.read(), dtype="<f8")
+        assert values.tolist() == [1, 2, 3]
+
+    def test_stopped_server_sends_values(self, qtbot, served_wv_controller):
+        served_wv_controller.stop_data_server()
+        with qtbot.wait_signal(served_wv_controller.componentUpdated) as blocker:
+            served_wv_controller.update_component("item-0")
+        assert get_trace(blocker.args[1])["y"] == [1, 2, 3]
+        assert "ySource" not in get_trace(blocker.args[1])
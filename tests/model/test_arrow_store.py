@@ -0,0 +1,103 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from chartify.model.arrow_store import ArrowStore
+
+N_ROWS = 8760
+
+
+def create_df(n_columns=1, file_name="file"):
+    columns = pd.MultiIndex.from_tuples(
+        [(file_name, "hourly", f"key{i}", "type", "W") for i in range(n_columns)],
+        names=["file", "table", "key", "type", "units"],
+    )
+    index = pd.date_range("2002-01-01", periods=N_ROWS, freq="h", name="timestamp")
+    return pd.DataFrame(np.random.rand(N_ROWS, n_columns), index=index, columns=columns)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArrowStore(Path(tmp_path, "arrow"))
+    yield store
+    store.clear()
+
+
+KEY = (0, "hourly")
+
+
+def test_put_get(store):
+    df = create_df(3)
+    store.put(KEY, df)
+    pd.testing.assert_frame_equal(store.get(KEY), df, check_freq=False)
+
+
+def test_simple_columns(store):
+    df = create_df(2)
+    df.columns = df.columns.droplevel([0, 1, 3, 4])
+    store.put(KEY, df)
+    pd.testing.assert_frame_equal(store.get(KEY), df, check_freq=False)
+
+
+def test_get_missing(store):
+    assert store.get(KEY) is None
+
+
+def test_get_columns(store):
+    df = create_df(4)
+    store.put(KEY, df, ids=["a", "b", "c", "d"])
+    expected = df.iloc[:, [1, 3]]
+    pd.testing.assert_frame_equal(store.get(KEY, ["d", "b"]), expected, check_freq=False)
+    assert store.get(KEY, ["foo"]) is None
+
+
+def test_columns_added_as_chunks(store):
+    df = create_df(3)
+    store.put(KEY, df.iloc[:, :2])
+    store.put(KEY, df)
+    assert len(store.get_paths(KEY)) == 2
+    assert store.get_ids(KEY) == df.columns.tolist()
+    pd.testing.assert_frame_equal(store.get(KEY), df, check_freq=False)
+
+
+def test_stored_columns_not_written_again(store):
+    store.put(KEY, create_df(2))
+    assert store.put_async(KEY, create_df(2)) is None
+    assert len(store.get_paths(KEY)) == 1
+
+
+def test_put_async(store):
+    store.put_async(KEY, create_df())
+    store.wait()
+    assert KEY in store
+
+
+def test_evict_least_recently_used(store):
+    for i in range(3):
+        store.put((i, "hourly"), create_df())
+    store.max_size = store.size
+    store.get((0, "hourly"))
+    store.put((3, "hourly"), create_df())
+    assert (1, "hourly") not in store
+    assert (0, "hourly") in store
+    assert store.size <= store.max_size
+
+
+def test_invalidate_file(store):
+    store.put(KEY, create_df())
+    store.put((1, "hourly"), create_df())
+    paths = store.get_paths(KEY)
+    store.invalidate_file(0)
+    assert KEY not in store
+    assert (1, "hourly") in store
+    assert not any(path.exists() for path in paths)
+
+
+def test_invalidated_while_pending(store):
+    store.put_async(KEY, create_df())
+    store.invalidate_file(0)
+    store.wait()
+    assert KEY not in store
+    assert not list(store.workdir.glob("*.arrow"))
@@ -0,0 +1,90 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from chartify.charts.chart import Chart
+from chartify.charts.trace import Trace1D, Trace2D, TraceData
+from chartify.model.dashboard import dump_dashboard, load_dashboard, get_hydration_order
+from chartify.model.values_store import ValuesStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ValuesStore(Path(tmp_path, "trace_data"))
+
+
+@pytest.fixture
+def wv_database(store):
+    timestamps = [0, 3600, 7200]
+    trace_data = []
+    for i in range(2):
+        store.put(f"td-{i}", [i, i + 1, i + 2])
+        trace_data.append(
+            TraceData(
+                "item-0",
+                f"td-{i}",
+                f"trace {i}",
+                None,
+                3 * i + 3,
+                "W",
+                timestamps=timestamps,
+                interval="hourly",
+                ref={"column": ["file", "hourly", f"key{i}", "type", "W"], "units": {}},
+                store=store,
+            )
+        )
+    trace_1d = Trace1D("trace 0", "item-0", "trace-0", "#fff", "bar")
+    trace_1d.ref = trace_data[0]
+    trace_2d = Trace2D("trace 1", "item-0", "trace-1", "#000", "scatter", True)
+    trace_2d.x_ref = "datetime"
+    trace_2d.y_ref = trace_data[1]
+    chart = Chart("item-0", "chart-0", "scatter")
+    chart.geometry = {"w": 100, "h": 200}
+    return {
+        "trace_data": trace_data,
+        "traces": [trace_1d, trace_2d],
+        "components": [chart],
+        "items": {"item-0": {"i": "frame-0", "x": 0, "y": 0, "w": 6, "h": 2}},
+    }
+
+
+def test_dump_is_compact(wv_database):
+    state = json.loads(json.dumps(dump_dashboard(wv_database)))
+    assert len(state["timestamps"]) == 1
+    assert all("values" not in trace_dt for trace_dt in state["trace_data"])
+
+
+def test_load_dashboard(wv_database, tmp_path):
+    state = json.loads(json.dumps(dump_dashboard(wv_database)))
+    store = ValuesStore(Path(tmp_path, "restored"))
+    restored = load_dashboard(state, store)
+
+    trace_data = restored["trace_data"]
+    assert not any(trace_dt.hydrated for trace_dt in trace_data)
+    assert trace_data[0].n_values == 3
+    assert trace_data[0].timestamps is trace_data[1].timestamps
+    assert trace_data[1].ref["column"] == ["file", "hourly", "key1", "type", "W"]
+
+    trace_1d, trace_2d = restored["traces"]
+    assert trace_1d.ref is trace_data[0]
+    assert trace_2d.x_ref == "datetime"
+    assert trace_2d.y_ref is trace_data[1]
+    assert trace_2d.selected
+    assert trace_2d.interval == "hourly"
+
+    chart = restored["components"][0]
+    assert chart.geometry == {"w": 100, "h": 200}
+    assert restored["items"] == wv_database["items"]
+
+    store.put("td-1", [1, 2, 3])
+    assert trace_2d.y_values == [1.0, 2.0, 3.0]
+
+
+def test_hydration_order(wv_database):
+    wv_database["components"].append(Chart("item-1", "chart-1"))
+    wv_database["items"] = {
+        "item-0": {"x": 0, "y": 5},
+        "item-1": {"x": 0, "y": 0},
+    }
+    assert get_hydration_order(wv_database) == ["item-1", "item-0"]
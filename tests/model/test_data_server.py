@@ -0,0 +1,201 @@
+import http.client
+
+import numpy as np
+import pytest
+
+from chartify.model.data_server import (
+    DataServer,
+    TIMESTAMPS,
+    VALUES,
+    create_buffer,
+    create_response,
+    get_cors_headers,
+    get_origin,
+    parse_range,
+)
+
+ARRAYS = {(VALUES, "foo"): np.arange(10, dtype=float), (TIMESTAMPS, "foo"): np.zeros(3)}
+
+
+def resolve(kind, id_):
+    return ARRAYS.get((kind, id_))
+
+
+def get_buffer(kind, id_):
+    array = resolve(kind, id_)
+    return None if array is None else create_buffer(array)
+
+
+def get(path, **headers):
+    return create_response("GET", path, headers, get_buffer)
+
+
+@pytest.fixture
+def server():
+    server = DataServer(resolve)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-7", (0, 8)),
+        ("bytes=8-", (8, 80)),
+        ("bytes=-16", (64, 80)),
+        ("bytes=72-1000", (72, 80)),
+        ("bytes=-1000", (0, 80)),
+        ("bytes=80-", None),
+        ("bytes=10-5", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header, 80) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=-", "bytes=0-7,16-23", "items=0-7"])
+def test_parse_range_unsupported(header):
+    with pytest.raises(ValueError):
+        parse_range(header, 80)
+
+
+def test_get_values():
+    response = get("/values/foo")
+    assert response.status == 200
+    assert np.frombuffer(response.body, dtype="<f8").tolist() == list(range(10))
+    assert response.headers["ETag"]
+
+
+def test_not_found():
+    assert get("/values/bar").status == 404
+    assert get("/foo/foo").status == 404
+
+
+def test_not_modified():
+    etag = get("/values/foo").headers["ETag"]
+    assert get("/values/foo", **{"if-none-match": etag}).status == 304
+    assert get("/timestamps/foo", **{"if-none-match": etag}).status == 200
+
+
+def test_range():
+    response = get("/values/foo", range="bytes=16-31")
+    assert response.status == 206
+    assert response.headers["Content-Range"] == "bytes 16-31/80"
+    assert np.frombuffer(response.body, dtype="<f8").tolist() == [2, 3]
+
+
+def test_range_not_satisfiable():
+    response = get("/values/foo", range="bytes=100-")
+    assert response.status == 416
+    assert response.headers["Content-Range"] == "bytes */80"
+
+
+def test_if_range_mismatch_sends_whole_array():
+    response = get("/values/foo", range="bytes=16-31", **{"if-range": '"bar"'})
+    assert response.status == 200
+    assert len(response.body) == 80
+
+
+def test_head():
+    response = create_response("HEAD", "/values/foo", {}, get_buffer)
+    assert response.status == 200
+    assert response.headers["Content-Length"] == "80"
+    assert response.body == b""
+
+
+def test_method_not_allowed():
+    assert create_response("POST", "/values/foo", {}, get_buffer).status == 405
+    assert create_response("OPTIONS", "/values/foo", {}, get_buffer).status == 204
+
+
+def test_get_origin():
+    assert get_origin("http://127.0.0.1:8080/") == "http://127.0.0.1:8080"
+    assert get_origin("http://localhost:8080/index.html?foo=1") == "http://localhost:8080"
+
+
+def test_cross_origin_not_allowed_by_default():
+    assert "Access-Control-Allow-Origin" not in get("/values/foo").headers
+
+
+def test_allowed_origin():
+    cors_headers = get_cors_headers("http://127.0.0.1:8080")
+    for method in ["GET", "OPTIONS"]:
+        response = create_response(method, "/values/foo", {}, get_buffer, cors_headers)
+        assert response.headers["Access-Control-Allow-Origin"] == "http://127.0.0.1:8080"
+
+
+def test_buffer_cached():
+    calls = []
+
+    def counting_resolve(kind, id_):
+        calls.append((kind, id_))
+        return resolve(kind, id_)
+
+    server = DataServer(counting_resolve)
+    buffer = server.get_buffer(VALUES, "foo")
+    assert server.get_buffer(VALUES, "foo") is buffer
+    assert server.get_buffer(TIMESTAMPS, "foo").etag != buffer.etag
+    assert len(calls) == 2
+
+    server.invalidate(["foo"])
+    assert server.get_buffer(VALUES, "foo") is not buffer
+    assert len(calls) == 3
+
+
+def test_cache_size_limit():
+    arrays = {"foo": np.arange(10, dtype=float), "bar": np.ones(10)}
+    server = DataServer(lambda kind, id_: arrays.get(id_), max_cache_size=100)
+    foo = server.get_buffer(VALUES, "foo")
+    server.get_buffer(VALUES, "bar")
+    # least recently used array is dropped
+    assert server.get_buffer(VALUES, "foo") is not foo
+
+
+def test_buffer_invalidated_while_resolving_not_cached():
+    def invalidating_resolve(kind, id_):
+        server.invalidate([id_])
+        return resolve(kind, id_)
+
+    server = DataServer(invalidating_resolve)
+    buffer = server.get_buffer(VALUES, "foo")
+    assert buffer is not None
+    assert server.get_buffer(VALUES, "foo") is not buffer
+
+
+def test_server_keep_alive(server):
+    connection = http.client.HTTPConnection(server.host, server.port)
+    connection.request("GET", "/values/foo")
+    response = connection.getresponse()
+    etag = response.getheader("ETag")
+    assert np.frombuffer(response.read(), dtype="<f8").tolist() == list(range(10))
+
+    connection.request("GET", "/values/foo", headers={"Range": "bytes=-8"})
+    response = connection.getresponse()
+    assert response.status == 206
+    assert np.frombuffer(response.read(), dtype="<f8").tolist() == [9]
+
+    connection.request("GET", "/values/foo", headers={"If-None-Match": etag})
+    response = connection.getresponse()
+    assert response.status == 304
+    assert response.read() == b""
+    connection.close()
+
+
+def test_server_failure(server, monkeypatch):
+    def fail(kind, id_):
+        raise RuntimeError
+
+    monkeypatch.setattr(server, "resolve", fail)
+    connection = http.client.HTTPConnection(server.host, server.port)
+    connection.request("GET", "/values/foo")
+    assert connection.getresponse().status == 500
+    connection.close()
+
+
+def test_server_restart(server):
+    port = server.port
+    server.stop()
+    assert not server.running
+    assert server.start() == port
+    assert server.get_url(VALUES, "foo") == f"http://127.0.0.1:{port}/values/foo"
@@ -0,0 +1,166 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+from zipfile import ZipFile
+
+import pandas as pd
+import pytest
+from esofile_reader.df.level_names import KEY_LEVEL, TYPE_LEVEL, UNITS_LEVEL
+from esofile_reader.pqt.parquet_file import ParquetFile
+from esofile_reader.typehints import Variable
+
+from chartify.controller.project_saving import ProjectSaver
+from chartify.model.lazy_file import read_project_files
+from chartify.model.project_archive import read_manifest
+from chartify.ui.widgets.treeview_model import ViewModel, VV, RAW_UNITS
+
+N_FILES = 50
+
+
+class FakeFile:
+    def __init__(self, id_):
+        self.id_ = id_
+        self.file_type = "eso"
+        self.file_name = f"file{id_}"
+        self.file_path = Path(f"file{id_}.eso")
+        self.file_created = "2020-01-01 00:00:00"
+        self.header_df = pd.DataFrame(
+            {
+                "id": range(1000),
+                "key": [f"key{i}" for i in range(1000)],
+                "type": "type",
+                "units": "W",
+            }
+        ).set_index("id")
+
+    @property
+    def table_names(self):
+        return ["hourly", "daily"]
+
+    def get_header_df(self, table):
+        return self.header_df
+
+    def is_header_simple(self, table):
+        return table == "daily"
+
+    def save_file_to_zip(self, zf, relative_to, logger):
+        zf.writestr(f"file-{self.id_}/hourly/0.parquet", b"0" * 100000 + bytes(self.id_))
+        zf.writestr(f"file-{self.id_}/daily/0.parquet", b"1" * 100000 + bytes(self.id_))
+
+
+@pytest.fixture(scope="module")
+def saved_project(tmp_path_factory):
+    """ Benchmark project with many files. """
+    import chartify.controller.project_saving as project_saving
+
+    tmp_path = tmp_path_factory.mktemp("project")
+    can_convert = project_saving.can_convert_rate_to_energy
+    project_saving.can_convert_rate_to_energy = lambda f, t: t == "hourly"
+    try:
+        path = Path(tmp_path, "project.cfs")
+        saver = ProjectSaver()
+        saver.save([FakeFile(i) for i in range(N_FILES)], path, tmp_path, MagicMock())
+    finally:
+        project_saving.can_convert_rate_to_energy = can_convert
+    return path
+
+
+def test_read_project_files(saved_project, tmp_path):
+    files = read_project_files(saved_project, tmp_path)
+    headers = [file.get_header_df("hourly") for file in files]
+    assert len(files) == N_FILES
+    assert not any(file.loaded for file in files)
+    pd.testing.assert_frame_equal(headers[0], FakeFile(0).header_df)
+
+
+def test_metadata(saved_project, tmp_path):
+    file = read_project_files(saved_project, tmp_path)[1]
+    assert file.id_ == 1
+    assert file.file_name == "file1"
+    assert file.table_names == ["hourly", "daily"]
+    assert file.is_header_simple("daily")
+    assert file.can_convert_rate_to_energy("hourly")
+    assert not file.can_convert_rate_to_energy("daily")
+
+
+def test_rename_does_not_load(saved_project, tmp_path):
+    file = read_project_files(saved_project, tmp_path)[0]
+    file.rename("foo")
+    assert file.file_name == "foo"
+    assert not file.loaded
+
+
+def test_extract(saved_project, tmp_path):
+    file = read_project_files(saved_project, tmp_path)[2]
+    path = file.extract()
+    assert path == Path(file.workdir, "file-2")
+    assert Path(path, "hourly", "0.parquet").read_bytes() == b"0" * 100000 + bytes(2)
+
+
+def test_invalid_project(tmp_path):
+    path = Path(tmp_path, "foo.cfs")
+    with ZipFile(path, "w") as zf:
+        zf.writestr("foo", b"bar")
+    with pytest.raises(ValueError):
+        read_project_files(path, tmp_path)
+
+
+def test_unknown_attribute_not_delegated(saved_project, tmp_path):
+    file = read_project_files(saved_project, tmp_path)[0]
+    with pytest.raises(AttributeError):
+        file.search_tree
+    assert not file.loaded
+    assert isinstance(file, ParquetFile)
+
+
+@pytest.mark.parametrize(
+    "variable, exists",
+    [
+        (Variable("hourly", "key1", "type", "W"), True),
+        (Variable("hourly", "key1", "type", "C"), False),
+        (Variable("hourly", "foo", "type", "W"), False),
+        (Variable("monthly", "key1", "type", "W"), False),
+    ],
+)
+def test_variable_exists(saved_project, tmp_path, variable, exists):
+    file = read_project_files(saved_project, tmp_path)[0]
+    assert file.variable_exists(variable) is exists
+    assert not file.loaded
+
+
+def test_save_unloaded_file(saved_project, tmp_path):
+    files = read_project_files(saved_project, tmp_path)[:2]
+    path = Path(tmp_path, "copy.cfs")
+    ProjectSaver().save(files, path, tmp_path, MagicMock())
+    assert not any(file.loaded for file in files)
+    with ZipFile(path) as zf:
+        manifest = read_manifest(zf)
+    for file in files:
+        assert manifest["files"][str(file.id_)]["members"] == file.members
+    assert read_project_files(path, tmp_path)[0].extract().exists()
+
+
+@pytest.mark.parametrize("storage", ["parquet_eso_file_storage", "parquet_excel_file_storage"])
+def test_round_trip(qtbot, request, tmp_path, storage):
+    storage = request.getfixturevalue(storage)
+    files = list(storage.files.values())
+    path = Path(tmp_path, "project.cfs")
+    logger = MagicMock()
+    ProjectSaver().save(files, path, storage.workdir, logger)
+    logger.done.assert_called_once()
+    lazy_files = read_project_files(path, tmp_path)
+    for file, lazy_file in zip(files, lazy_files):
+        assert lazy_file.file_name == file.file_name
+        assert lazy_file.table_names == file.table_names
+        for table in file.table_names:
+            header_df = file.get_header_df(table)
+            pd.testing.assert_frame_equal(lazy_file.get_header_df(table), header_df)
+            view_variables = [
+                VV(row[KEY_LEVEL], row.get(TYPE_LEVEL), row[UNITS_LEVEL])
+                for _, row in header_df.head(3).iterrows()
+            ]
+            expected = ViewModel(table, file).read_results(view_variables, *RAW_UNITS)
+            results = ViewModel(table, lazy_file).read_results(view_variables, *RAW_UNITS)
+            pd.testing.assert_frame_equal(results, expected)
+        assert lazy_file.loaded
+        lazy_file.clean_up()
+        assert not lazy_file.workdir.exists()
@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from chartify.charts.chart import Chart
+from chartify.charts.trace import Trace1D, Trace2D, TraceData
+from chartify.model.model import AppModel
+from chartify.settings import Settings
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "APP_TEMP_DIR", tmp_path)
+    model = AppModel()
+    store = model.values_store
+    trace_data = []
+    for i in range(3):
+        trace_dt = TraceData(
+            "item-0",
+            f"td-{i}",
+            f"trace {i}",
+            None,
+            0,
+            "W",
+            ref={"column": ["file", "hourly", f"key{i}", "type", "W"], "units": {}},
+            store=store,
+        )
+        trace_dt.n_values = 3
+        if i < 2:
+            store.put(trace_dt.trace_data_id, [i, i + 1, i + 2])
+        trace_data.append(trace_dt)
+    trace_1d = Trace1D("trace 0", "item-0", "trace-0", "#fff", "bar")
+    trace_1d.ref = trace_data[0]
+    trace_2d = Trace2D("trace 1", "item-0", "trace-1", "#000", "scatter", True)
+    trace_2d.x_ref = trace_data[1]
+    trace_2d.y_ref = trace_data[2]
+    model.wv_database = {
+        "trace_data": trace_data,
+        "traces": [trace_1d, trace_2d],
+        "components": [Chart("item-0", "chart-0", "scatter")],
+        "items": {},
+    }
+    return model
+
+
+def test_fetch_traces_referencing(model):
+    trace_data = model.fetch_traces_data("item-0")
+    assert model.fetch_traces_referencing(trace_data[2:]) == [model.fetch_trace("trace-1")]
+
+
+def test_remove_trace_data(model):
+    model.remove_trace_data(model.fetch_traces_data("item-0")[:1])
+    assert model.fetch_trace_data("td-0") is None
+    assert "td-0" not in model.values_store
+    assert "td-1" in model.values_store
+
+
+def test_remove_trace_data_emits_ids(qtbot, model):
+    with qtbot.wait_signal(model.traceDataRemoved) as blocker:
+        model.remove_trace_data(model.fetch_traces_data("item-0")[1:])
+    assert blocker.args == [["td-1", "td-2"]]
+
+
+def test_remove_unused_trace_data(model):
+    model.remove_trace("trace-0")
+    model.remove_unused_trace_data("item-0")
+    assert [t.trace_data_id for t in model.wv_database["trace_data"]] == ["td-1", "td-2"]
+    assert "td-0" not in model.values_store
+
+
+def test_delete_file_drops_pending_trace_data(model):
+    model.storage = MagicMock()
+    model.storage.files = {0: MagicMock(file_name="file")}
+    assert model.delete_file(0)
+    # 'td-2' values can no longer be fetched
+    assert [t.trace_data_id for t in model.wv_database["trace_data"]] == ["td-0", "td-1"]
+    assert [t.trace_id for t in model.wv_database["traces"]] == ["trace-0"]
+
+
+def test_delete_file_keeps_fetched_trace_data(model):
+    model.storage = MagicMock()
+    model.storage.files = {0: MagicMock(file_name="other")}
+    assert not model.delete_file(0)
+    assert len(model.wv_database["trace_data"]) == 3
+
+
+def test_rename_file_holds_file_lock(model):
+    lock = model.get_file_lock(0)
+    locked = []
+    model.storage = MagicMock()
+    model.storage.files = {0: MagicMock()}
+    model.storage.files[0].rename.side_effect = lambda _: locked.append(lock.locked())
+    model.rename_file(0, "new")
+    assert locked == [True]
+    assert not lock.locked()
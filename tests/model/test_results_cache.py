@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+
+from chartify.model.results_cache import ResultsCache
+
+
+def create_df(n_rows):
+    return pd.DataFrame({"a": range(n_rows), "b": [float(i) for i in range(n_rows)]})
+
+
+@pytest.fixture
+def cache():
+    return ResultsCache(max_size=ResultsCache.get_table_size(create_df(100)) * 3)
+
+
+def create_key(file_id=0, variables=("a",), units_system="SI"):
+    return ResultsCache.create_key(
+        file_id, "hourly", frozenset(variables), units_system, "W", "J", False
+    )
+
+
+def test_get_miss(cache):
+    assert cache.get(create_key()) is None
+    assert cache.misses == 1
+
+
+def test_put_get(cache):
+    df = create_df(100)
+    cache.put(create_key(), df)
+    cached = cache.get(create_key())
+    pd.testing.assert_frame_equal(df, cached)
+    assert cached is not df
+    assert cache.hits == 1
+
+
+def test_key_ignores_variable_order(cache):
+    cache.put(create_key(variables=("a", "b")), create_df(100))
+    assert cache.get(create_key(variables=("b", "a"))) is not None
+
+
+def test_units_are_part_of_key(cache):
+    cache.put(create_key(), create_df(100))
+    assert cache.get(create_key(units_system="IP")) is None
+
+
+def test_evict_least_recently_used(cache):
+    for i in range(3):
+        cache.put(create_key(file_id=i), create_df(100))
+    cache.get(create_key(file_id=0))
+    cache.put(create_key(file_id=3), create_df(100))
+    assert create_key(file_id=1) not in cache
+    assert create_key(file_id=0) in cache
+    assert cache.evictions == 1
+    assert cache.size <= cache.max_size
+
+
+def test_too_large_table_not_stored(cache):
+    cache.put(create_key(), create_df(1000))
+    assert len(cache) == 0
+
+
+def test_invalidate_file(cache):
+    cache.put(create_key(file_id=0, variables=("a",)), create_df(10))
+    cache.put(create_key(file_id=0, variables=("b",)), create_df(10))
+    cache.put(create_key(file_id=1), create_df(10))
+    cache.invalidate_file(0)
+    assert len(cache) == 1
+    assert cache.size == ResultsCache.get_table_size(create_df(10))
+
+
+def test_stats(cache):
+    cache.put(create_key(), create_df(10))
+    cache.get(create_key())
+    cache.get(create_key(file_id=1))
+    stats = cache.get_stats()
+    assert stats["tables"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
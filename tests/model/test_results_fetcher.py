@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from chartify.model.results_fetcher import ResultsFetcher
+
+DELAY = 0.05
+
+
+class FakeModel:
+    """ Model reading results with a constant delay. """
+
+    def __init__(self, name, delay=DELAY, empty=False):
+        self.name = name
+        self.delay = delay
+        self.empty = empty
+
+    def get_results(self, view_variables, **kwargs):
+        time.sleep(self.delay)
+        if not self.empty:
+            return pd.DataFrame({(self.name, v): [1, 2, 3] for v in view_variables})
+
+
+class ConcurrentModel(FakeModel):
+    """ Model recording the peak number of simultaneous fetches.
+
+    Each fetch blocks until 'expected' fetches run at the same time,
+    the timeout only prevents the test from hanging when they don't.
+
+    """
+
+    lock = threading.Lock()
+
+    def __init__(self, name, counter, expected):
+        super().__init__(name)
+        self.counter = counter
+        self.expected = expected
+
+    def get_results(self, view_variables, **kwargs):
+        with self.lock:
+            self.counter["running"] += 1
+            self.counter["peak"] = max(self.counter["peak"], self.counter["running"])
+            if self.counter["running"] >= self.expected:
+                self.counter["ready"].set()
+        self.counter["ready"].wait(timeout=5)
+        try:
+            return super().get_results(view_variables, **kwargs)
+        finally:
+            with self.lock:
+                self.counter["running"] -= 1
+
+
+@pytest.fixture
+def fetcher():
+    fetcher = ResultsFetcher(max_workers=8)
+    yield fetcher
+    fetcher.shutdown()
+
+
+def test_fetch_keeps_model_order(fetcher):
+    models = [FakeModel(f"file{i}", delay=0.01 * (5 - i)) for i in range(5)]
+    df = fetcher.fetch(models, ["a", "b"])
+    assert [c[0] for c in df.columns] == [f"file{i}" for i in range(5) for _ in range(2)]
+
+
+def test_fetch_skips_empty_results(fetcher):
+    models = [FakeModel("file0"), FakeModel("file1", empty=True), FakeModel("file2")]
+    df = fetcher.fetch(models, ["a"])
+    assert df.columns.tolist() == [("file0", "a"), ("file2", "a")]
+
+
+def test_fetch_no_results(fetcher):
+    assert fetcher.fetch([FakeModel("file0", empty=True)], ["a"]) is None
+
+
+def test_fetch_propagates_exception(fetcher):
+    class FailingModel(FakeModel):
+        def get_results(self, view_variables, **kwargs):
+            raise KeyError("foo")
+
+    with pytest.raises(KeyError):
+        fetcher.fetch([FakeModel("file0"), FailingModel("file1")], ["a"])
+
+
+@pytest.mark.parametrize("n_files", [1, 10, 50])
+def test_fetch_concurrently(fetcher, caplog, n_files):
+    expected = min(n_files, fetcher.max_workers)
+    counter = {"running": 0, "peak": 0, "ready": threading.Event()}
+    models = [ConcurrentModel(f"file{i}", counter, expected) for i in range(n_files)]
+    with caplog.at_level(logging.INFO, logger="chartify.model.results_fetcher"):
+        df = fetcher.fetch(models, ["a"])
+    assert df.shape == (3, n_files)
+    assert f"Fetched results from {n_files} models" in caplog.text
+    # requests are distributed among workers
+    assert counter["peak"] == expected
@@ -0,0 +1,86 @@
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from chartify.charts.trace import TraceData
+from chartify.model.values_store import ValuesStore
+
+N_VALUES = 8760
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ValuesStore(Path(tmp_path, "trace_data"), max_hot=4)
+
+
+def create_trace_data(i, store=None):
+    values = np.arange(N_VALUES, dtype=float) + i
+    if store:
+        store.put(str(i), values)
+        values = None
+    else:
+        values = values.tolist()
+    return TraceData("item-0", str(i), f"trace {i}", values, 0, "W", store=store)
+
+
+def test_put_get(store):
+    store.put("foo", [1, 2, 3])
+    assert "foo" in store
+    assert store.get_values("foo") == [1.0, 2.0, 3.0]
+
+
+def test_hot_arrays_limited(store):
+    for i in range(10):
+        store.put(str(i), [i])
+        store.get_array(str(i))
+    assert list(store._hot.keys()) == ["6", "7", "8", "9"]
+
+
+def test_remove(store):
+    store.put("foo", [1, 2, 3])
+    store.get_array("foo")
+    store.remove("foo")
+    assert "foo" not in store
+
+
+def test_contains_does_not_stat_files(store, monkeypatch):
+    store.put("foo", [1, 2, 3])
+
+    def exists(_):
+        raise AssertionError("file system accessed")
+
+    monkeypatch.setattr(Path, "exists", exists)
+    assert "foo" in store
+    assert "bar" not in store
+
+
+def test_put_replaces_hot_array(store):
+    store.put("foo", [1, 2, 3])
+    store.get_array("foo")
+    store.put("foo", [4, 5])
+    assert store.get_values("foo") == [4.0, 5.0]
+
+
+def test_trace_data_values_from_store(store):
+    trace_data = create_trace_data(1, store=store)
+    assert trace_data.values == (np.arange(N_VALUES, dtype=float) + 1).tolist()
+
+
+def test_trace_data_values_in_memory():
+    trace_data = create_trace_data(1)
+    assert trace_data.values[:2] == [1.0, 2.0]
+
+
+def test_store_keeps_values_out_of_memory(store):
+    def measure(store_):
+        tracemalloc.start()
+        trace_data = [create_trace_data(i, store_) for i in range(500)]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(trace_data[-1].values) == N_VALUES
+        return size
+
+    # python lists take ~32 bytes per value, stored arrays are not held
+    assert measure(store) < measure(None) / 10
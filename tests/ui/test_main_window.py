@@ -8,6 +8,7 @@ from PySide2.QtGui import QKeySequence
 from PySide2.QtWidgets import QSizePolicy
 
 from chartify.settings import Settings
+from chartify.ui.icon_cache import IconCache
 from chartify.ui.main_window import MainWindow
 
 
@@ -80,7 +81,9 @@ class TestMainWindowInit:
         assert mw.central_splitter.widget(1) == mw.right_main_wgt
         assert mw.main_chart_widget.parent() == mw.right_main_wgt
         assert mw.main_chart_widget.parent() == mw.right_main_wgt
-        assert mw.web_view.parent() == mw.main_chart_widget
+        assert mw.web_view is None
+        assert mw.create_web_view().parent() == mw.main_chart_widget
+        assert mw.create_web_view() is mw.web_view
 
         assert mw.statusBar() == mw.status_bar
         assert mw.statusBar().height() == 20
@@ -167,8 +170,8 @@ class TestMainWindowInit:
     color: rgb(112, 112, 112);
 }"""
         )
-        assert Path(Settings.APP_TEMP_DIR, "icons").exists()
-        assert [p for p in Path(Settings.APP_TEMP_DIR, "icons").iterdir() if p.suffix == ".png"]
+        assert Settings.ICONS_CACHE_DIR.exists()
+        assert [p for p in Settings.ICONS_CACHE_DIR.iterdir() if p.suffix == ".png"]
 
 
 class TestMWLayout:
@@ -211,6 +214,43 @@ class TestMWLayout:
         assert mw.tab_widgets == [mw.standard_tab_wgt, mw.totals_tab_wgt, mw.diff_tab_wgt]
 
 
+class TestPaletteBundles:
+    def test_initial_bundle(self, pretty_mw):
+        bundle = pretty_mw.palette_bundles[Settings.PALETTE_NAME]
+        assert bundle.name == Settings.PALETTE_NAME
+        assert pretty_mw.styleSheet() == bundle.css
+        assert all(Path(p).exists() for p in bundle.icon_paths)
+
+    def test_render_palette(self, pretty_mw):
+        bundle = pretty_mw.render_palette(pretty_mw.palettes["dark"])
+        assert bundle.name == "dark"
+        assert "rgb(180, 180, 180)" in bundle.css
+        assert bundle.icon_paths
+
+        icon_cache = IconCache.for_dir(Settings.ICONS_CACHE_DIR)
+        icon_cache.reset_stats()
+        rgb = pretty_mw.palettes["dark"].get_color_tuple("PRIMARY_TEXT_COLOR")
+        for name in pretty_mw.PRIMARY_ICONS:
+            icon_cache.get_path(Path(Settings.SOURCE_ICONS_DIR, name), *rgb)
+            icon_cache.get_path(
+                Path(Settings.SOURCE_ICONS_DIR, name), *rgb, a=pretty_mw.DISABLED_ICON_OPACITY
+            )
+        assert icon_cache.get_stats()["misses"] == 0
+
+    def test_prerender_palettes(self, qtbot, pretty_mw):
+        pretty_mw.prerender_palettes()
+        qtbot.wait_until(lambda: pretty_mw.palette_bundles.keys() == pretty_mw.palettes.keys())
+
+    def test_color_scheme_switch_prerendered(self, qtbot, pretty_mw):
+        pretty_mw.prerender_palettes()
+        qtbot.wait_until(lambda: pretty_mw.palette_bundles.keys() == pretty_mw.palettes.keys())
+        name = next(n for n in pretty_mw.palettes if n != Settings.PALETTE_NAME)
+        with qtbot.wait_signal(pretty_mw.paletteUpdated):
+            pretty_mw.on_color_scheme_changed(name)
+        assert pretty_mw.styleSheet() == pretty_mw.palette_bundles[name].css
+        assert IconCache.for_dir(Settings.ICONS_CACHE_DIR).get_stats()["misses"] == 0
+
+
 class TestSaveLoad:
     @pytest.fixture(scope="class")
     def save_path(self, test_tempdir):
@@ -291,7 +331,7 @@ class TestKeyEvents:
             qtbot.keyClick(mw_esofile, Qt.Key_Delete)
 
     def test_escape_key_event_empty(self, qtbot, mw):
-        with patch("chartify.ui.main_window.TreeView.deselect_all_variables") as mock:
+        with patch("chartify.ui.widgets.treeview.TreeView.deselect_all_variables") as mock:
             qtbot.keyClick(mw, Qt.Key_Escape)
             mock.assert_not_called()
 
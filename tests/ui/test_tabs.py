@@ -1,17 +1,71 @@
+import threading
+
 import pytest
 from PySide2.QtCore import Qt
 
 from chartify.settings import Settings
+from chartify.ui.widgets.treeview_model import ViewModel
+from tests.conftest import wait_for_views
 
 
 def test_on_tab_changed_first_tab(qtbot, mw, eso_file1):
     eso_file1.id_ = 1
     mw.add_file_widget(eso_file1)
+    wait_for_views(qtbot, mw)
     buttons = [btn.text() for btn in mw.toolbar.table_buttons_group.buttons()]
     assert buttons == ["hourly", "daily", "monthly", "runperiod"]
     assert mw.current_model.tree_node == "type"
 
 
+def test_placeholder_view(qtbot, mw, eso_file1):
+    eso_file1.id_ = 1
+    mw.add_file_widget(eso_file1)
+    assert mw.current_model.preparing
+    assert not mw.current_model.initialized
+    wait_for_views(qtbot, mw)
+    assert mw.current_model.initialized
+    assert mw.current_model.tree_node == "type"
+    # prepared data of other views is attached on activation
+    assert all(
+        model._prepared is not None
+        for model in mw.current_file_widget.all_view_models
+        if model is not mw.current_model
+    )
+
+
+def test_prepared_models_attached_on_gui_thread(qtbot, mw, eso_file1, monkeypatch):
+    set_prepared_model = ViewModel.set_prepared_model
+    threads = []
+
+    def set_and_record_thread(self, prepared):
+        threads.append(threading.current_thread())
+        set_prepared_model(self, prepared)
+
+    monkeypatch.setattr(ViewModel, "set_prepared_model", set_and_record_thread)
+    eso_file1.id_ = 1
+    mw.add_file_widget(eso_file1)
+    wait_for_views(qtbot, mw)
+    assert threads
+    assert all(thread is threading.main_thread() for thread in threads)
+    assert mw._preparing_views == {}
+
+
+def test_placeholder_view_preparation_failed(qtbot, mw, eso_file1, monkeypatch):
+    create_prepared_model = ViewModel.create_prepared_model
+
+    def create_on_main_thread(*args):
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("foo")
+        return create_prepared_model(*args)
+
+    monkeypatch.setattr(ViewModel, "create_prepared_model", staticmethod(create_on_main_thread))
+    eso_file1.id_ = 1
+    mw.add_file_widget(eso_file1)
+    wait_for_views(qtbot, mw)
+    assert mw.current_model.initialized
+    assert mw.current_model.tree_node == "type"
+
+
 def test_on_tab_changed_same_table_available(qtbot, mw_esofile):
     qtbot.mouseClick(mw_esofile.toolbar.get_table_button_by_name("daily"), Qt.LeftButton)
     mw_esofile.standard_tab_wgt.setCurrentIndex(2)
@@ -47,7 +47,8 @@ def test_on_text_edited(qtbot, mw_esofile):
     assert mw_esofile.key_line_edit.text() == "foo"
     assert mw_esofile.type_line_edit.text() == "bar"
     assert mw_esofile.units_line_edit.text() == "baz"
-    assert mw_esofile.get_filter_dict() == {"key": "foo", "type": "bar", "proxy_units": "baz"}
+    filter_dict = mw_esofile.get_filter_dict(mw_esofile.current_view)
+    assert filter_dict == {"key": "foo", "type": "bar", "proxy_units": "baz"}
 
 
 def test_on_filter_timeout_empty(qtbot, mw):
@@ -8,11 +8,15 @@ from chartify.ui.css_theme import (
     parse_color,
     Palette,
     CssParser,
+    CssTemplate,
+    ColorPlaceholder,
+    IconPlaceholder,
     InvalidRangeError,
     perc_to_float,
     string_rgb,
     InvalidUrlLine,
 )
+from chartify.settings import Settings
 from tests.conftest import ROOT
 
 
@@ -286,3 +290,84 @@ TitledButton:checked {{
     color: rgb(0, 0, 0);
 }}"""
         )
+
+
+def legacy_parse_css(source_css, palette, source_icons_dir, dest_icons_dir):
+    """ Reference line by line implementation. """
+    css = ""
+    icon_paths = []
+    for line in source_css:
+        if any(map(lambda x: x in line, palette.COLORS)):
+            color_key = next(k for k in palette.COLORS if k in line)
+            rgb = palette.get_color_tuple(color_key)
+            if "URL" in line or "url" in line:
+                line, icon_path = CssParser.parse_url_line(
+                    line, color_key, rgb, source_icons_dir, dest_icons_dir
+                )
+                icon_paths.append(icon_path)
+            else:
+                line = CssParser.parse_line(line, color_key, rgb)
+        css += line
+    return css, icon_paths
+
+
+class TestCssTemplate:
+    SOURCE = [
+        "QToolButton {\n",
+        "    border: 1px solid PRIMARY_COLOR;\n",
+        "    background-color: SECONDARY_COLOR #70;\n",
+        "    image: URL(./resources/icons/test.png) #PRIMARY_COLOR#20;\n",
+        "}\n",
+        "\n",
+    ]
+
+    def test_compile(self, palette: Palette):
+        template = CssTemplate.compile(self.SOURCE, palette.COLORS)
+        assert template.segments == [
+            "QToolButton {\n",
+            ColorPlaceholder("    border: 1px solid ", "PRIMARY_COLOR", ""),
+            ColorPlaceholder("    background-color: ", "SECONDARY_COLOR", "70"),
+            IconPlaceholder("    image: ", "./resources/icons/test.png", "PRIMARY_COLOR", 0.2),
+            "}\n\n",
+        ]
+        assert repr(template) == "CssTemplate(segments=5, placeholders=3)"
+
+    def test_compile_invalid_url(self, palette: Palette):
+        with pytest.raises(InvalidUrlLine):
+            CssTemplate.compile(["image: URL #PRIMARY_COLOR"], palette.COLORS)
+
+    def test_render(self, palette: Palette, qtbot, tmpdir):
+        template = CssTemplate.compile(self.SOURCE, palette.COLORS)
+        css, icon_paths = template.render(palette, ROOT, tmpdir)
+        assert css == (
+            "QToolButton {\n"
+            "    border: 1px solid rgb(255, 255, 255);\n"
+            "    background-color: rgba(100, 100, 100, 0.7);\n"
+            f"    image: url({icon_paths[0]});\n"
+            "}\n\n"
+        )
+        assert (css, icon_paths) == legacy_parse_css(self.SOURCE, palette, ROOT, tmpdir)
+
+    def test_render_invalid_path(self, palette: Palette, tmpdir):
+        line = "image: URL(./invalid/test.png) #PRIMARY_COLOR#70;"
+        template = CssTemplate.compile([line], palette.COLORS)
+        with pytest.raises(FileNotFoundError):
+            template.render(palette, ROOT, tmpdir)
+
+    def test_get_template_cached(self):
+        template = CssParser.get_template(Settings.CSS_DIR, Palette.COLORS)
+        assert CssParser.get_template(Settings.CSS_DIR, Palette.COLORS) is template
+
+    def test_application_css_matches_legacy(self, qtbot, tmpdir):
+        palettes = Palette.parse_palettes(Settings.PALETTE_PATH)
+        css_paths = sorted(p for p in Settings.CSS_DIR.iterdir() if p.suffix == ".css")
+        lines = []
+        for path in css_paths:
+            with open(path, "r") as f:
+                lines.extend(f.readlines())
+
+        template = CssTemplate.compile(lines, Palette.COLORS)
+        for palette in palettes.values():
+            # render legacy first so both implementations share warm icon cache
+            expected = legacy_parse_css(lines, palette, Settings.SOURCE_ICONS_DIR, tmpdir)
+            assert template.render(palette, Settings.SOURCE_ICONS_DIR, tmpdir) == expected
@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import pytest
+from PySide2.QtGui import QColor, QImage
+
+from chartify.settings import Settings
+from chartify.ui.css_theme import CssParser, Palette
+from chartify.ui.icon_cache import IconCache
+from tests.conftest import ROOT
+
+ICON = Path(ROOT, "resources", "icons", "test.png")
+
+
+@pytest.fixture(scope="function")
+def icon_cache(tmpdir):
+    return IconCache(Path(tmpdir, "icons"))
+
+
+class TestIconCache:
+    def test_for_dir(self, tmpdir):
+        cache = IconCache.for_dir(tmpdir)
+        assert cache is IconCache.for_dir(str(tmpdir))
+        assert cache is not IconCache.for_dir(Path(tmpdir, "other"))
+
+    def test_create_key(self, icon_cache):
+        key = icon_cache.create_key(ICON, 110, 120, 110, 0.5)
+        assert len(key[0]) == 40
+        assert key[1:] == (110, 120, 110, 0.5)
+        assert icon_cache.create_name(key) == f"{key[0]}-110-120-110-0.5.png"
+
+    def test_create_key_invalid_path(self, icon_cache):
+        with pytest.raises(FileNotFoundError):
+            icon_cache.create_key(Path(ROOT, "foo.png"))
+
+    def test_get_path(self, icon_cache):
+        path = icon_cache.get_path(ICON, 110, 120, 110, 0.5)
+        assert Path(path).exists()
+        assert Path(path).parent == icon_cache.cache_dir
+        img = QImage(path)
+        assert img.pixelColor(10, 10).getRgb() == QColor(110, 120, 110, 127).getRgb()
+        assert icon_cache.get_stats()["misses"] == 1
+
+    def test_get_path_cached(self, icon_cache):
+        path1 = icon_cache.get_path(ICON, 110, 120, 110, 0.5)
+        mtime = Path(path1).stat().st_mtime_ns
+        path2 = icon_cache.get_path(ICON, 110, 120, 110, 0.5)
+        assert path1 == path2
+        assert Path(path2).stat().st_mtime_ns == mtime
+        assert icon_cache.get_stats()["hits"] == 1
+
+    def test_cache_persists_across_instances(self, icon_cache):
+        path = icon_cache.get_path(ICON, 1, 2, 3)
+        other_cache = IconCache(icon_cache.cache_dir)
+        assert other_cache.get_path(ICON, 1, 2, 3) == path
+        assert other_cache.get_stats() == {
+            "hits": 1,
+            "misses": 0,
+            "hit_rate": 1.0,
+            "n_pixmaps": 0,
+        }
+
+    def test_get_pixmap(self, qtbot, icon_cache):
+        pixmap1 = icon_cache.get_pixmap(ICON, 110, 120, 110, 0.5)
+        pixmap2 = icon_cache.get_pixmap(ICON, 110, 120, 110, 0.5)
+        assert pixmap1 is pixmap2
+        color = pixmap1.toImage().pixelColor(10, 10)
+        assert color.getRgb() == QColor(110, 120, 110, 127).getRgb()
+        assert icon_cache.get_stats() == {
+            "hits": 1,
+            "misses": 1,
+            "hit_rate": 0.5,
+            "n_pixmaps": 1,
+        }
+
+    def test_different_colors(self, icon_cache):
+        path1 = icon_cache.get_path(ICON, 110, 120, 110)
+        path2 = icon_cache.get_path(ICON, 110, 120, 110, 0.5)
+        assert path1 != path2
+        assert len(list(icon_cache.cache_dir.glob("*.png"))) == 2
+
+    def test_clear(self, icon_cache):
+        icon_cache.get_path(ICON, 1, 2, 3)
+        icon_cache.clear()
+        assert not list(icon_cache.cache_dir.iterdir())
+        assert icon_cache.get_stats()["hits"] == 0
+        assert icon_cache.get_stats()["misses"] == 0
+
+    def test_palette_switch(self, qtbot, tmpdir):
+        palettes = Palette.parse_palettes(Settings.PALETTE_PATH)
+        cache_dir = Path(tmpdir, "palette_icons")
+        icon_cache = IconCache.for_dir(cache_dir)
+
+        def switch_all():
+            for palette in palettes.values():
+                CssParser.parse_css_files(
+                    Settings.CSS_DIR, palette, Settings.SOURCE_ICONS_DIR, cache_dir
+                )
+
+        switch_all()
+        cold_stats = icon_cache.get_stats()
+        icon_cache.reset_stats()
+        switch_all()
+        warm_stats = icon_cache.get_stats()
+
+        assert cold_stats["misses"] > 0
+        assert warm_stats["misses"] == 0
+        assert warm_stats["hit_rate"] == 1.0
@@ -1,7 +1,8 @@
 from pathlib import Path
 
+import pytest
 from PySide2.QtCore import QSize, Qt
-from PySide2.QtGui import QColor, QFont
+from PySide2.QtGui import QColor, QFont, QImage, QPixmap
 
 from chartify.ui.icon_painter import (
     Pixmap,
@@ -12,12 +13,49 @@ from chartify.ui.icon_painter import (
 from tests.conftest import ROOT
 
 
+ICONS = sorted(Path(ROOT.parent, "resources", "icons").glob("*.png"))
+
+
+def legacy_repaint(img: QImage, r: int, g: int, b: int, a: float) -> QImage:
+    """ Reference pixel by pixel implementation. """
+    img = QImage(img)
+    for x in range(img.width()):
+        for y in range(img.height()):
+            col = img.pixelColor(x, y)
+            r1, g1, b1, f = col.getRgbF()
+            new_col = QColor(r, g, b, f * 255 * a)
+            if f > 0:
+                img.setPixelColor(x, y, new_col)
+    return img
+
+
+def image_bytes(img: QImage) -> bytes:
+    img = img.convertToFormat(QImage.Format_ARGB32)
+    return bytes(img.constBits())[: img.sizeInBytes()]
+
+
 class TestPixmap:
     def test_repaint(self, qtbot):
         p = Pixmap(Path(ROOT, "./resources/icons/test.png"), r=110, g=120, b=110, a=0.5)
         img = p.toImage()
         assert img.pixelColor(10, 10).getRgb() == QColor(110, 120, 110, 127).getRgb()
 
+    @pytest.mark.parametrize("path", ICONS, ids=[p.stem for p in ICONS])
+    @pytest.mark.parametrize("rgba", [(255, 255, 255, 1), (110, 120, 110, 0.5), (3, 7, 9, 0.7)])
+    def test_repaint_matches_legacy(self, qtbot, path, rgba):
+        img = QPixmap(str(path)).toImage()
+        expected = legacy_repaint(img, *rgba)
+        repainted = Pixmap.repaint_image(img, *rgba)
+        assert repainted.format() == img.format()
+        assert image_bytes(repainted) == image_bytes(expected)
+
+    def test_repaint_without_alpha_channel(self, qtbot):
+        img = QImage(10, 10, QImage.Format_RGB32)
+        img.fill(QColor(0, 0, 0))
+        repainted = Pixmap.repaint_image(img, 10, 20, 30, 0.5)
+        assert repainted.format() == QImage.Format_RGB32
+        assert image_bytes(repainted) == image_bytes(legacy_repaint(img, 10, 20, 30, 0.5))
+
 
 def test_text_to_pixmap(qtbot):
     f = QFont("Times", 20, QFont.Bold)
@@ -0,0 +1,132 @@
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from chartify.utils.instrumentation import (
+    Instrumentation,
+    Histogram,
+    NULL_SPAN,
+    instrument,
+)
+
+
+@pytest.fixture
+def enabled():
+    enabled = Instrumentation.ENABLED
+    Instrumentation.enable()
+    Instrumentation.reset()
+    yield
+    Instrumentation.reset()
+    Instrumentation.ENABLED = enabled
+
+
+@pytest.fixture
+def disabled():
+    enabled = Instrumentation.ENABLED
+    Instrumentation.disable()
+    Instrumentation.reset()
+    yield
+    Instrumentation.ENABLED = enabled
+
+
+def test_histogram():
+    histogram = Histogram()
+    for i in range(1, 101):
+        histogram.add(i, i / 2)
+    stats = histogram.as_dict()
+    assert stats["count"] == 100
+    assert stats["total"] == 5050
+    assert stats["self"] == 2525
+    assert stats["mean"] == 50.5
+    assert stats["p50"] == 51
+    assert stats["p95"] == 96
+    assert stats["max"] == 100
+
+
+def test_histogram_bounded_samples(monkeypatch):
+    monkeypatch.setattr(Histogram, "MAX_SAMPLES", 10)
+    histogram = Histogram()
+    for i in range(100):
+        histogram.add(i, i)
+    assert len(histogram.samples) == 10
+    assert histogram.count == 100
+    assert histogram.max == 99
+
+
+def test_disabled_decorator_returns_function(disabled):
+    def foo():
+        return 1
+
+    assert instrument(foo) is foo
+    assert instrument(name="bar")(foo) is foo
+
+
+def test_disabled_span(disabled):
+    assert Instrumentation.span("foo") is NULL_SPAN
+    with Instrumentation.span("foo"):
+        pass
+    assert Instrumentation.get_stats() == {}
+
+
+def test_instrument(enabled):
+    @instrument
+    def foo(a, b=1):
+        return a + b
+
+    assert foo(1, b=2) == 3
+    assert foo.__name__ == "foo"
+    stats = Instrumentation.get_stats()
+    assert stats[f"{__name__}.test_instrument.<locals>.foo"]["count"] == 1
+
+
+def test_nested_spans(enabled):
+    @instrument(name="outer")
+    def outer():
+        with Instrumentation.span("inner", n=1):
+            time.sleep(0.02)
+        time.sleep(0.01)
+
+    outer()
+    stats = Instrumentation.get_stats()
+    assert stats["outer"]["total"] >= stats["inner"]["total"] + 0.01
+    assert stats["outer"]["self"] == pytest.approx(
+        stats["outer"]["total"] - stats["inner"]["total"]
+    )
+    assert stats["inner"]["self"] == stats["inner"]["total"]
+
+
+def test_span_records_exception(enabled):
+    with pytest.raises(ValueError):
+        with Instrumentation.span("failing"):
+            raise ValueError
+    assert Instrumentation.get_stats()["failing"]["count"] == 1
+    assert Instrumentation.get_stack() == []
+
+
+def test_export_chrome_trace(enabled, tmp_path):
+    with Instrumentation.span("outer"):
+        with Instrumentation.span("inner", n=10):
+            pass
+    path = Path(tmp_path, "trace.json")
+    Instrumentation.export_chrome_trace(path)
+    with open(path) as f:
+        trace = json.load(f)
+    events = trace["traceEvents"]
+    assert [e["name"] for e in events] == ["inner", "outer"]
+    assert all(e["ph"] == "X" for e in events)
+    inner, outer = events
+    assert inner["args"] == {"n": 10}
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+
+def test_export_stats(enabled, tmp_path):
+    with Instrumentation.span("foo"):
+        pass
+    path = Path(tmp_path, "stats.json")
+    Instrumentation.export_stats(path)
+    with open(path) as f:
+        assert json.load(f)["foo"]["count"] == 1
+    assert "foo" in Instrumentation.format_stats()
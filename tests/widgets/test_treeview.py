@@ -1,5 +1,6 @@
 from copy import copy
 
+import pandas as pd
 import pytest
 from PySide2.QtCore import QModelIndex, Qt
 from PySide2.QtWidgets import QHeaderView
@@ -8,7 +9,13 @@ from esofile_reader.df.level_names import UNITS_LEVEL
 
 from chartify.settings import OutputType
 from chartify.ui.widgets.treeview import TreeView, ViewType, ViewMask
-from chartify.ui.widgets.treeview_model import FilterModel, ViewModel, VV
+from chartify.ui.widgets.treeview_model import (
+    FilterModel,
+    ViewModel,
+    VV,
+    ConversionLookUp,
+    RAW_UNITS,
+)
 from tests.conftest import ESO_FILE_EXCEL_PATH, EXCEL_FILE_PATH
 from tests.ui.test_view_mask import reset_cached
 
@@ -612,6 +619,26 @@ def test_filter_simple_view(qtbot, daily_simple: TreeView, filter_dict, n_rows):
     assert daily_simple.model().count_all_rows() == n_rows
 
 
+@pytest.mark.parametrize(
+    "texts, filter_dict",
+    [
+        (("", " ", ""), {}),
+        (("Boiler", "", ""), {"key": "boiler"}),
+        (("", "Gas Rate", "W"), {"type": "gas rate", "proxy_units": "w"}),
+    ],
+)
+def test_create_filter_dict(texts, filter_dict):
+    assert TreeView.create_filter_dict(*texts) == filter_dict
+
+
+def test_get_rename_blockers(daily: TreeView):
+    keys, types = daily.get_rename_blockers(VV("BOILER", "Boiler Gas Rate", "W"))
+    assert "BOILER" not in keys
+    assert "BLOCK1:ZONEA" in keys
+    assert "Boiler Gas Rate" not in types
+    assert "Zone Mean Air Temperature" in types
+
+
 @pytest.mark.parametrize(
     "tree_view, tree_node, rebuild",
     [
@@ -656,6 +683,64 @@ def test_proxy_units_tree_column_update(qtbot, proxy_units_tree):
     assert expected == proxy_units_tree.source_model.get_column_data_from_model("proxy_units")
 
 
+def test_proxy_units_column_update_single_notification(qtbot, daily_simple):
+    emitted = []
+    daily_simple.source_model.dataChanged.connect(lambda *args: emitted.append(args))
+    daily_simple.update_units(
+        energy_units="kWh", rate_units="kW", units_system="IP", rate_to_energy=False
+    )
+    assert len(emitted) == 1
+
+
+def test_proxy_units_tree_update_single_notification(qtbot, hourly):
+    units = dict(energy_units="kWh", rate_units="kW", units_system="IP", rate_to_energy=False)
+    model = hourly.source_model
+    emitted = []
+    model.dataChanged.connect(lambda *args: emitted.append(args))
+    model.layoutChanged.connect(lambda *args: emitted.append(args))
+    hourly.update_units(**units)
+    assert len(emitted) == 1
+    expected = [
+        ConversionLookUp.get_proxy_units(u, **units)
+        for u in model.get_column_data_from_model(UNITS_LEVEL)
+    ]
+    assert model.get_column_data_from_model("proxy_units") == expected
+
+
+def test_conversion_look_up_shared_between_models(qtbot, hourly, daily):
+    ConversionLookUp.clear()
+    units = dict(energy_units="kWh", rate_units="kW", units_system="IP", rate_to_energy=True)
+    table = hourly.source_model.create_conversion_look_up_table(**units)
+    assert daily.source_model.create_conversion_look_up_table(**units) is table
+    assert ConversionLookUp.get_proxy_units("", **units) == "-"
+
+
+def test_conversion_look_up_drops_least_recent_settings():
+    ConversionLookUp.clear()
+    for i in range(ConversionLookUp.MAX_SETTINGS + 1):
+        ConversionLookUp.activate(energy_units=str(i))
+    assert len(ConversionLookUp.TABLES) == ConversionLookUp.MAX_SETTINGS
+    assert (False, "SI", "0", "W") not in ConversionLookUp.TABLES
+
+
+def test_attach_prepared_model(qtbot, daily_not_initialized):
+    model = daily_not_initialized.source_model
+    prepared = model.prepare_model(tree_node="type", **default_units)
+    model.set_prepared_model(prepared)
+    daily_not_initialized.update_model(tree_node="type", **default_units)
+    assert model._prepared is None
+    assert model.count_rows() == 105
+    assert model.count_leaf_rows() == 77
+
+
+def test_outdated_prepared_model_ignored(qtbot, daily_not_initialized):
+    model = daily_not_initialized.source_model
+    prepared = model.prepare_model(tree_node="type", **default_units)
+    model.mark_file_modified()
+    model.set_prepared_model(prepared)
+    assert model._prepared is None
+
+
 class TestModelUpdates:
     @pytest.fixture(scope="function")
     def model(self, daily):
@@ -717,6 +802,33 @@ class TestModelUpdates:
         model.aggregate_variables(variables, "mean", new_variable.key, new_variable.type)
         assert model.variable_exists(new_variable) is exists
 
+    def test_maintained_row_counters(self, qtbot, model):
+        def count_rows():
+            n_rows = model.rowCount()
+            n_parents = 0
+            for i in range(model.rowCount()):
+                if model.item(i, 0).hasChildren():
+                    n_rows += model.item(i, 0).rowCount()
+                    n_parents += 1
+            return n_rows, n_parents
+
+        model.delete_variables([VV("BOILER", "Boiler Gas Rate", "W")])
+        model.update_variable_if_exists(
+            VV("BLOCK1:ZONEA", "Zone Mean Air Temperature", "C"), VV("foo", "bar", "C")
+        )
+        model.aggregate_variables(
+            [
+                VV("BLOCK1:ZONEB", "Zone Mean Air Temperature", "C"),
+                VV("BLOCK1:ZONEC", "Zone Mean Air Temperature", "C"),
+            ],
+            "mean",
+            "foo",
+            "baz",
+        )
+        n_rows, n_parents = count_rows()
+        assert model.count_rows() == n_rows
+        assert model.count_leaf_rows() == n_rows - n_parents
+
     @pytest.mark.parametrize(
         "variables, exist",
         [
@@ -729,6 +841,50 @@ class TestModelUpdates:
         results = model.get_results(variables, "SI", "W", "J", False)
         assert (results is not None) is exist
 
+    @pytest.mark.parametrize(
+        "units",
+        [("IP", "W", "J"), ("SI", "kW", "kWh"), ("SI", "MW", "MWh"), ("IP", "Btu/h", "kBtu")],
+    )
+    def test_get_converted_results(self, qtbot, model, units):
+        variables = [
+            VV("BOILER", "Boiler Gas Rate", "W"),
+            VV("BLOCK1:ZONEA", "Zone Mean Air Temperature", "C"),
+        ]
+        model.get_results(variables, "SI", "W", "J", False)
+        converted = model.get_results(variables, *units, False)
+        expected = model.read_results(variables, *units, False)
+        pd.testing.assert_frame_equal(converted, expected, check_dtype=False)
+
+    def test_raw_results_cached_per_variable(self, qtbot, model, monkeypatch):
+        a = VV("BOILER", "Boiler Gas Rate", "W")
+        b = VV("BLOCK1:ZONEA", "Zone Mean Air Temperature", "C")
+        c = VV("BLOCK1:ZONEB", "Zone Mean Air Temperature", "C")
+        expected = model.read_results([a, b, c], *RAW_UNITS)
+        requests = []
+        read_results = model.read_results
+
+        def read(view_variables, *args):
+            requests.append(view_variables)
+            return read_results(view_variables, *args)
+
+        monkeypatch.setattr(model, "read_results", read)
+        model.get_raw_results([a, b])
+        assert len(model.get_raw_results([a]).columns) == 1
+        results = model.get_raw_results([a, b, c])
+        pd.testing.assert_frame_equal(results, expected.loc[:, results.columns])
+        assert requests == [[a, b], [c]]
+
+    def test_raw_results_sliced_from_arrow_store(self, qtbot, model, monkeypatch):
+        a = VV("BOILER", "Boiler Gas Rate", "W")
+        b = VV("BLOCK1:ZONEA", "Zone Mean Air Temperature", "C")
+        expected = model.get_raw_results([a, b])
+        ViewModel.get_arrow_store().wait()
+        ViewModel.RESULTS_CACHE.clear()
+        monkeypatch.setattr(model, "read_results", None)
+        results = model.get_raw_results([b])
+        expected = expected.loc[:, results.columns]
+        pd.testing.assert_frame_equal(results, expected, check_freq=False)
+
     @pytest.mark.parametrize(
         "variable, exists",
         [